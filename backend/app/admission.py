@@ -0,0 +1,332 @@
+"""
+admission.py
+============
+Admission control and scheduling of engine runs.
+
+Nothing used to stop ten concurrent /clean calls on 40 MB files from
+running at once and OOM-killing the worker. Every engine run now asks
+ADMISSION for its estimated peak memory and CPU first:
+
+  memory  estimate_run_bytes(): memory_usage(deep=True) of the input frame
+          times the largest STAGE_MEMORY_MULTIPLIERS entry, plus the deep
+          copies of lean_memory=False and the Arrow hand-off of a pool run.
+          Admitted runs may hold at most ENGINE_MEMORY_BUDGET_MB together.
+  cpu     column_workers of the run; at most ENGINE_CPU_SLOTS together.
+
+Runs wait in one of two lanes, picked by frame size (lane_for):
+
+  fast    frames of at most FAST_LANE_MAX_ROWS rows — free-tier demos and
+          other small cleans. FAST_LANE_RESERVED_SLOTS extra CPU slots
+          belong to this lane alone, so a 500k-row run holding every shared
+          slot doesn't make a 200-row clean wait behind it.
+  bulk    everything larger, and streamed cleans (/clean/stream).
+
+The shared slots go to the lanes in weighted fair share (LANE_WEIGHTS):
+each admission advances its lane's virtual time by 1 / weight, and the
+lane furthest behind goes next. Within a lane runs are FIFO, and a run
+that doesn't fit holds back the shared slots until it does, so a big run
+is not starved by small ones behind it. A user (or anonymous client) has
+at most ADMISSION_USER_MAX_RUNS runs admitted at once; their further runs
+wait without holding up anybody else's, and at most
+ADMISSION_USER_MAX_QUEUED of them wait — beyond that the user is
+rejected, so one user can't fill a lane's queue for everybody.
+
+A request that finds ADMISSION_QUEUE_DEPTH runs already waiting in its
+lane, or still waits after ADMISSION_WAIT_SECONDS, gets AdmissionRejected
+(routers answer 429 with Retry-After). Background jobs are queued with
+admit_later() when they are submitted — the same queue-depth check, so a
+full queue answers 429 there — and take a job thread only once admitted;
+they don't time out. A run estimated above the whole budget is admitted
+alone. Time spent waiting is exported per lane
+(engine_admission_wait_seconds).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+
+from app.metrics import Counter, Gauge, Histogram
+from app.session import frame_bytes
+
+# ── Config ──
+ENGINE_MEMORY_BUDGET_MB    = int(os.getenv("ENGINE_MEMORY_BUDGET_MB", "2048"))
+ENGINE_MEMORY_BUDGET_BYTES = ENGINE_MEMORY_BUDGET_MB * 1024 * 1024
+ENGINE_CPU_SLOTS           = int(os.getenv("ENGINE_CPU_SLOTS", str(os.cpu_count() or 1)))
+ADMISSION_QUEUE_DEPTH      = int(os.getenv("ADMISSION_QUEUE_DEPTH", "8"))      # runs waiting per lane
+ADMISSION_WAIT_SECONDS     = float(os.getenv("ADMISSION_WAIT_SECONDS", "20"))
+ADMISSION_RETRY_AFTER      = 15      # seconds, sent with 429
+ADMISSION_USER_MAX_RUNS    = int(os.getenv("ADMISSION_USER_MAX_RUNS", "2"))    # 0 = no cap
+ADMISSION_USER_MAX_QUEUED  = int(os.getenv("ADMISSION_USER_MAX_QUEUED", "3"))  # waiting, all lanes; 0 = no cap
+
+FAST_LANE_MAX_ROWS       = int(os.getenv("FAST_LANE_MAX_ROWS", "5000"))
+FAST_LANE_RESERVED_SLOTS = int(os.getenv("FAST_LANE_RESERVED_SLOTS", "1"))
+LANE_WEIGHTS = {             # share of the shared slots, in scheduling order on ties
+    "fast": int(os.getenv("FAST_LANE_WEIGHT", "3")),
+    "bulk": int(os.getenv("BULK_LANE_WEIGHT", "1")),
+}
+
+# Peak memory on top of the input frame, per input byte (memory_usage(deep=True)),
+# by engine stage — measured with tracemalloc on mixed text/numeric uploads, rounded up
+STAGE_MEMORY_MULTIPLIERS = {
+    "headers":      0.1,
+    "strings":      0.6,
+    "units":        0.9,
+    "categories":   0.9,
+    "dedupe":       1.0,     # duplicate mask + the de-duplicated frame
+    "columns":      0.9,     # converted candidates next to the working frame
+    "low_variance": 0.6,
+    "eda_overview": 0.7,
+}
+NON_LEAN_MULTIPLIER      = 0.4    # original_df + working frame deep copies (lean_memory=False)
+POOL_TRANSFER_MULTIPLIER = 1.5    # Arrow copy of the input, its decode in the worker, the result back
+
+ADMISSION_DECISIONS = Counter(
+    "engine_admission_decisions_total", "Engine run admission decisions", ("lane", "outcome"),
+)
+ADMISSION_QUEUED = Gauge(
+    "engine_admission_queued", "Engine runs waiting for admission", ("lane",),
+)
+ADMISSION_WAIT = Histogram(
+    "engine_admission_wait_seconds", "Time engine runs waited for admission", ("lane",),
+)
+
+
+class AdmissionRejected(Exception):
+    """The admission queue is full, or the run waited too long."""
+
+    def __init__(self, message: str, retry_after: int = ADMISSION_RETRY_AFTER):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_run_bytes(df: pd.DataFrame, config, pooled: bool = False) -> int:
+    """Estimated peak memory an engine run on `df` adds to the host."""
+    multiplier = max(STAGE_MEMORY_MULTIPLIERS.values())
+    if not getattr(config, "lean_memory", True):
+        multiplier += NON_LEAN_MULTIPLIER
+    if pooled:
+        multiplier += POOL_TRANSFER_MULTIPLIER
+    return int(frame_bytes(df) * multiplier)
+
+
+def run_cpu_slots(config) -> int:
+    return max(1, int(getattr(config, "column_workers", 1) or 1))
+
+
+def lane_for(rows: int) -> str:
+    return "fast" if rows <= FAST_LANE_MAX_ROWS else "bulk"
+
+
+@dataclass(eq=False)
+class _Ticket:
+    lane:     str
+    owner:    str
+    memory:   int
+    cpu:      int
+    enqueued: float = field(default_factory=time.monotonic)
+    reserved: bool = False           # admitted on a fast-lane reserved slot
+    admitted: bool = False
+    start:    Optional[Callable[[Callable[[], None]], None]] = None   # admit_later's callback
+
+
+class AdmissionController:
+    """Weighted fair admission of runs, in lanes, against a memory and a CPU budget."""
+
+    def __init__(self, memory_budget: int = ENGINE_MEMORY_BUDGET_BYTES, cpu_slots: int = ENGINE_CPU_SLOTS,
+                 queue_depth: int = ADMISSION_QUEUE_DEPTH, wait_seconds: float = ADMISSION_WAIT_SECONDS,
+                 weights: dict[str, int] | None = None, reserved_slots: int = FAST_LANE_RESERVED_SLOTS,
+                 user_max_runs: int = ADMISSION_USER_MAX_RUNS, user_max_queued: int = ADMISSION_USER_MAX_QUEUED):
+        self.memory_budget  = memory_budget
+        self.cpu_slots      = max(1, cpu_slots)
+        self.reserved_slots = max(0, reserved_slots)
+        self._queue_depth   = queue_depth
+        self._wait          = wait_seconds
+        self._user_max      = user_max_runs
+        self._user_queued   = user_max_queued
+        self._weights       = dict(weights or LANE_WEIGHTS)
+        self._cond          = threading.Condition()
+        self._lanes: dict[str, deque[_Ticket]] = {lane: deque() for lane in self._weights}
+        self._vtime         = dict.fromkeys(self._weights, 0.0)   # admissions / weight, per lane
+        self._clock         = 0.0      # virtual time of the last shared-slot admission
+        self._owners: dict[str, int] = {}                          # owner → runs admitted
+        self._lane_running  = dict.fromkeys(self._weights, 0)
+        self.memory_in_use  = 0
+        self.cpu_in_use     = 0        # shared slots only
+        self.running        = 0
+        self.reserved_in_use = 0
+
+    @contextmanager
+    def admit(self, memory: int, cpu: int = 1, lane: str = "bulk", owner: str = "") -> Iterator[None]:
+        """
+        Hold `memory` bytes and `cpu` slots while the block runs, once `lane`
+        gets its turn and `owner` is under its cap. Raises AdmissionRejected
+        if the lane's queue is full or the wait exceeds ADMISSION_WAIT_SECONDS.
+        """
+        ticket = _Ticket(lane, owner, min(memory, self.memory_budget), min(cpu, self.cpu_slots))
+        with self._cond:
+            self._enqueue(ticket)
+            deadline = ticket.enqueued + self._wait
+            while not ticket.admitted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._lanes[lane].remove(ticket)
+                    ADMISSION_QUEUED.dec(lane)
+                    self._dispatch()
+                    ADMISSION_DECISIONS.inc(lane, "rejected_timeout")
+                    raise AdmissionRejected("The server is busy with other cleaning runs.")
+                self._cond.wait(remaining)
+        try:
+            yield
+        finally:
+            self._finish(ticket)
+
+    def admit_later(self, start: Callable[[Callable[[], None]], None], memory: int, cpu: int = 1,
+                    lane: str = "bulk", owner: str = "") -> None:
+        """
+        Queue a run without waiting for it. Once admitted, `start(release)` is
+        called — on whichever thread frees the room, holding the controller's
+        lock — and must only hand the run to another thread; the run calls
+        release() when it ends. Raises AdmissionRejected if the lane's queue
+        is full; a queued run never times out.
+        """
+        ticket = _Ticket(lane, owner, min(memory, self.memory_budget), min(cpu, self.cpu_slots),
+                         start=start)
+        with self._cond:
+            self._enqueue(ticket)
+
+    def _finish(self, ticket: _Ticket) -> None:
+        with self._cond:
+            self._release(ticket)
+            self._dispatch()
+
+    # ── Internals (call while holding the condition) ──
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        queue = self._lanes[ticket.lane]
+        if queue and len(queue) >= self._queue_depth:
+            ADMISSION_DECISIONS.inc(ticket.lane, "rejected_queue_full")
+            raise AdmissionRejected(f"{len(queue)} cleaning runs are already queued.")
+        if ticket.owner and self._user_queued:
+            waiting = sum(t.owner == ticket.owner for lane in self._lanes.values() for t in lane)
+            if waiting >= self._user_queued:
+                ADMISSION_DECISIONS.inc(ticket.lane, "rejected_user_queue_full")
+                raise AdmissionRejected(f"You already have {waiting} cleaning runs queued.")
+        if not queue:     # an idle lane rejoins at the current virtual time, not with saved credit
+            self._vtime[ticket.lane] = max(self._vtime[ticket.lane], self._clock)
+        queue.append(ticket)
+        ADMISSION_QUEUED.inc(ticket.lane)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit every waiting ticket that may go now, and wake their threads."""
+        admitted = False
+        while True:
+            ticket = self._next_reserved() or self._next_shared()
+            if ticket is None:
+                break
+            self._lanes[ticket.lane].remove(ticket)
+            ADMISSION_QUEUED.dec(ticket.lane)
+            self._grant(ticket)
+            ADMISSION_WAIT.observe(time.monotonic() - ticket.enqueued, ticket.lane)
+            ADMISSION_DECISIONS.inc(ticket.lane, "admitted")
+            if ticket.start is not None:
+                ticket.start(lambda ticket=ticket: self._finish(ticket))
+            admitted = True
+        if admitted:
+            self._cond.notify_all()
+
+    def _next_reserved(self) -> _Ticket | None:
+        """The fast lane's head, if a reserved slot and the memory are free for it."""
+        if self.reserved_in_use >= self.reserved_slots or "fast" not in self._lanes:
+            return None
+        ticket = self._head("fast")
+        if ticket is None or not self._fits_memory(ticket):
+            return None
+        ticket.reserved = True
+        return ticket
+
+    def _next_shared(self) -> _Ticket | None:
+        """The head of the lane furthest behind its share, if it fits the shared slots."""
+        heads = [(self._vtime[lane], order, lane) for order, lane in enumerate(self._lanes)
+                 if self._head(lane) is not None]
+        if not heads:
+            return None
+        _, _, lane = min(heads)
+        ticket = self._head(lane)
+        if self.running and not (self._fits_memory(ticket)
+                                 and self.cpu_in_use + ticket.cpu <= self.cpu_slots):
+            return None     # even a run above the budget gets to go alone
+        self._vtime[lane] += 1 / max(1, self._weights[lane])
+        self._clock = self._vtime[lane]
+        return ticket
+
+    def _head(self, lane: str) -> _Ticket | None:
+        """First ticket in `lane` whose owner is under the per-user cap."""
+        for ticket in self._lanes[lane]:
+            if not ticket.owner or not self._user_max or self._owners.get(ticket.owner, 0) < self._user_max:
+                return ticket
+        return None
+
+    def _fits_memory(self, ticket: _Ticket) -> bool:
+        return self.running == 0 or self.memory_in_use + ticket.memory <= self.memory_budget
+
+    def _grant(self, ticket: _Ticket) -> None:
+        ticket.admitted = True
+        self.memory_in_use += ticket.memory
+        if ticket.reserved:
+            self.reserved_in_use += 1
+        else:
+            self.cpu_in_use += ticket.cpu
+        self.running += 1
+        self._lane_running[ticket.lane] += 1
+        if ticket.owner:
+            self._owners[ticket.owner] = self._owners.get(ticket.owner, 0) + 1
+
+    def _release(self, ticket: _Ticket) -> None:
+        self.memory_in_use -= ticket.memory
+        if ticket.reserved:
+            self.reserved_in_use -= 1
+        else:
+            self.cpu_in_use -= ticket.cpu
+        self.running -= 1
+        self._lane_running[ticket.lane] -= 1
+        if ticket.owner:
+            self._owners[ticket.owner] -= 1
+            if not self._owners[ticket.owner]:
+                del self._owners[ticket.owner]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "running":         self.running,
+                "queued":          sum(len(q) for q in self._lanes.values()),
+                "memory_in_use":   self.memory_in_use,
+                "memory_budget":   self.memory_budget,
+                "cpu_in_use":      self.cpu_in_use,
+                "cpu_slots":       self.cpu_slots,
+                "reserved_in_use": self.reserved_in_use,
+                "reserved_slots":  self.reserved_slots,
+                "lanes": {
+                    lane: {
+                        "weight":  self._weights[lane],
+                        "queued":  len(self._lanes[lane]),
+                        "running": self._lane_running[lane],
+                    }
+                    for lane in self._lanes
+                },
+            }
+
+
+# Process-wide controller — every engine run goes through it (engine_pool.run_engine)
+ADMISSION = AdmissionController()
+
+Gauge("engine_admission_memory_bytes", "Estimated peak memory held by admitted engine runs",
+      callback=lambda: ADMISSION.stats()["memory_in_use"])
+Gauge("engine_admission_cpu_slots", "CPU slots held by admitted engine runs",
+      callback=lambda: ADMISSION.cpu_in_use + ADMISSION.reserved_in_use)
@@ -0,0 +1,98 @@
+"""
+checkpoints.py
+==============
+Per-session memo of intermediate engine state for re-cleans.
+
+Users re-run /clean on the same upload while tweaking outlier or
+imputation options, and every run used to redo header, string, unit and
+category normalisation, dedupe and type inference from scratch.
+
+Each stage declares the CleaningConfig fields it reads (STAGE_FIELDS).
+State captured after a stage is keyed by the fields of that stage and of
+every stage before it, so a change upstream misses while changes that only
+affect later work (imputation, outliers, fuzzy matching, low variance)
+resume from the deepest matching checkpoint. Two kinds of state are kept:
+
+  - frame checkpoints — working frame (a shallow copy: unchanged columns
+    share arrays), audit entries and profiles after a preparation stage
+  - the "typing" checkpoint — per-column inference results (ID / free
+    text / inferred type, converted values, date plan)
+
+A StageCheckpoints instance belongs to one input frame (one session);
+binding it to a different frame clears it.
+"""
+
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Optional
+
+import pandas as pd
+
+# ── Config ──
+CHECKPOINT_MAX_ENTRIES = 6    # checkpoints kept per session before LRU eviction
+
+# Stages in pipeline order → CleaningConfig fields each one reads
+STAGE_FIELDS: dict[str, tuple[str, ...]] = {
+    "headers":    (),
+    "strings":    (),
+    "units":      (),
+    "categories": ("category_maps",),
+    "dedupe":     (),
+    "typing":     ("numeric_confidence_weak", "datetime_confidence", "inference_sample_size",
+                   "inference_confidence_z", "date_detect_sample", "date_formats"),
+}
+
+
+def stage_key(config, stage: str) -> str:
+    """Key of the state after `stage`: its fields and those of every earlier stage."""
+    names = list(STAGE_FIELDS)
+    fields = {
+        name: getattr(config, name, None)
+        for s in names[:names.index(stage) + 1]
+        for name in STAGE_FIELDS[s]
+    }
+    blob = json.dumps(fields, sort_keys=True, default=str)
+    return f"{stage}:{hashlib.sha256(blob.encode()).hexdigest()[:16]}"
+
+
+class StageCheckpoints:
+    """Thread-safe LRU of stage key → captured engine state, for one input frame."""
+
+    def __init__(self, max_entries: int = CHECKPOINT_MAX_ENTRIES):
+        self._lock    = threading.Lock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._max     = max_entries
+        self._source: Optional[weakref.ref] = None
+        self.hits     = 0
+        self.misses   = 0
+
+    def bind(self, df: pd.DataFrame) -> None:
+        """Tie the checkpoints to `df`; state captured from another frame is dropped."""
+        with self._lock:
+            if self._source is None or self._source() is not df:
+                self._entries.clear()
+                self._source = weakref.ref(df)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            state = self._entries.get(key)
+            if state is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return state
+
+    def put(self, key: str, state: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = state
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": list(self._entries)}
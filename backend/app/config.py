@@ -27,6 +27,23 @@ class CleaningConfig:
     # Minimum ratio for datetime inference
     datetime_confidence: float = 0.85
 
+    # Columns with more than twice this many non-null values are first
+    # screened on a stratified sample of this size; only the surviving
+    # candidate types are converted on the full column. 0 disables sampling.
+    inference_sample_size: int = 2000
+
+    # z-score of the Wilson interval used to accept/reject a type on the
+    # sample (2.576 ≈ 99%). Ambiguous samples fall back to full evaluation.
+    inference_confidence_z: float = 2.576
+
+    # Distinct values sampled per column to detect its date format(s)
+    date_detect_sample: int = 500
+
+    # Per-column date formats that skip detection, e.g. copied from the
+    # "datetime_format_detected" entry of a previous run's audit log.
+    # Format: {"column_name": ["%d/%m/%Y", ...]}
+    date_formats: dict = field(default_factory=dict)
+
     # ── Missing value handling ───────────────────────────────────
     # Columns with a missing ratio above this threshold are dropped entirely
     missing_drop_threshold: float = 0.60
@@ -64,6 +81,15 @@ class CleaningConfig:
     # Higher = stricter (fewer merges), Lower = more aggressive (more merges)
     fuzzy_threshold: float = 0.88
 
+    # Categorical columns with more distinct values than this skip fuzzy
+    # matching. Candidate pairs come from a trigram index and a character
+    # count bound, so most value pairs are never scored — but structured
+    # values ("acme foods 012", "acme foods 013") are genuinely similar,
+    # so columns with more than fuzzy_max_pairs candidate pairs (~50µs of
+    # SequenceMatcher each, ~1s at the default) are skipped as well.
+    fuzzy_max_unique: int = 1000
+    fuzzy_max_pairs:  int = 20000
+
     # ── Low variance ─────────────────────────────────────────────
     # Columns where one value appears in >= this fraction of rows
     # are logged as near-constant (not auto-dropped)
@@ -74,3 +100,22 @@ class CleaningConfig:
     # Format: {"column_name": {"abbreviation": "canonical_form", ...}}
     # E.g.: {"house_type": {"det.": "detached", "terr": "terraced"}}
     category_maps: dict = field(default_factory=dict)
+
+    # ── Memory ───────────────────────────────────────────────────
+    # True: the engine works on a shallow view of the input and keeps only
+    # its shape/columns — columns are copied when a stage rewrites them
+    # (copy-on-mutate), never up front. False: keep full deep copies of
+    # the input as original_df and the working frame (legacy behaviour).
+    lean_memory: bool = True
+
+    # ── Parallelism ──────────────────────────────────────────────
+    # Workers used for per-column processing (type inference, imputation,
+    # outliers). 1 = serial (default). Results are merged back in column
+    # order, so the output matches a serial run. outlier_action="remove"
+    # always runs serially because row removal couples the columns.
+    column_workers: int = 1
+
+    # Worker pool type: "thread" | "process"
+    # Processes sidestep the GIL for regex/apply-heavy columns at the cost
+    # of pickling each column to the worker.
+    column_parallel_backend: str = "thread"
@@ -0,0 +1,191 @@
+"""
+dates.py
+========
+Date format detection and cached parsing for the engine's datetime stage.
+
+Instead of running every candidate format over every row, the engine:
+  1. Detects the dominant format(s) once per column from a sample of its
+     distinct values (or reuses a remembered / configured plan)
+  2. Parses each distinct string once with that plan, memoising the result
+  3. Maps the parsed values back to rows through dictionary codes
+
+Detected plans are written to the audit log and remembered in
+DATE_FORMAT_MEMO per feed and column — a feed is identified by its raw
+header row (feed_signature) — so repeat uploads of the same feed skip
+detection, while another feed with an equally named column starts afresh.
+Extend DATE_FORMATS here — order is priority when formats overlap.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# ─────────────────────────────────────────────────────────────
+# Candidate formats, in priority order
+# ─────────────────────────────────────────────────────────────
+DATE_FORMATS: list[str] = [
+    "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y",
+    "%Y/%m/%d", "%d %m %Y", "%m %d %Y", "%Y %m %d",
+    "%d-%b-%y", "%d-%b-%Y", "%b %d, %Y", "%B %d, %Y",
+    "%d/%m/%y", "%m/%d/%y", "%y-%m-%d",
+    "%d %b %Y", "%d %B %Y", "%b %d %Y", "%B %d %Y",
+]
+
+MEMO_MAX_COLUMNS = 1024   # remembered (feed, column) plans before LRU eviction
+
+
+@dataclass
+class DatePlan:
+    """Formats to try in order, then a final pandas inference pass for leftovers."""
+    formats: list[str]
+    source:  str            # "detected" | "memo" | "config"
+
+
+def _parse_format(values: pd.Series, fmt: str) -> pd.Series:
+    try:
+        return pd.to_datetime(values, format=fmt, errors="coerce")
+    except Exception:
+        return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+
+def _coverage(values: pd.Series, formats: list[str]) -> float:
+    """Fraction of values parsed by any of `formats`."""
+    if values.empty:
+        return 0.0
+    hit = pd.Series(False, index=values.index)
+    for fmt in formats:
+        hit |= _parse_format(values, fmt).notna()
+    return float(hit.mean())
+
+
+def detect_formats(sample: pd.Series) -> list[str]:
+    """
+    Detect the format plan from a sample of distinct date strings.
+
+    Formats are taken greedily in DATE_FORMATS order, keeping each one that
+    parses values the earlier ones did not. If a single format covers as
+    much of the sample as that union, it alone is returned. This avoids
+    mixing day-first and month-first readings of the same column.
+    """
+    per_format = {fmt: _parse_format(sample, fmt).notna() for fmt in DATE_FORMATS}
+
+    chosen: list[str] = []
+    covered = pd.Series(False, index=sample.index)
+    for fmt, hit in per_format.items():
+        if (hit & ~covered).any():
+            chosen.append(fmt)
+            covered |= hit
+    if not chosen:
+        return []
+
+    best = max(per_format, key=lambda f: int(per_format[f].sum()))   # first wins ties
+    if int(per_format[best].sum()) >= int(covered.sum()):
+        return [best]
+    return chosen
+
+
+def parse_with_plan(values: pd.Series, plan: DatePlan) -> pd.Series:
+    """
+    Parse distinct date strings: each value takes the first plan format that
+    parses it, then one pandas inference pass covers anything left over.
+    Returns a datetime64[ns] Series aligned with `values`.
+    """
+    best      = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    remaining = values.copy()
+
+    for fmt in plan.formats:
+        if remaining.empty:
+            break
+        parsed = _parse_format(remaining, fmt)
+        filled = parsed.notna()
+        best[parsed.index[filled]] = parsed[filled]
+        remaining = remaining[~filled]
+
+    if not remaining.empty:
+        try:
+            parsed = pd.to_datetime(remaining, errors="coerce")
+            if getattr(parsed.dt, "tz", None) is not None:
+                parsed = parsed.dt.tz_localize(None)
+            filled = parsed.notna()
+            best[parsed.index[filled]] = parsed[filled]
+        except Exception:
+            pass
+
+    return best
+
+
+class DateParseCache:
+    """
+    Per-column memo of parsed distinct strings under a given plan, so a
+    sample screen and the later full-column conversion never parse the
+    same string twice.
+    """
+
+    def __init__(self):
+        self._parsed: dict[tuple, dict[str, pd.Timestamp]] = {}
+
+    def parse(self, key: str, uniques: pd.Series, plan: DatePlan) -> np.ndarray:
+        """Return datetime64[ns] values for `uniques` (strings), parsing only unseen ones."""
+        memo = self._parsed.setdefault((key, tuple(plan.formats)), {})
+        unseen = uniques[~uniques.isin(memo.keys())] if memo else uniques
+        if not unseen.empty:
+            parsed = parse_with_plan(unseen.reset_index(drop=True), plan)
+            memo.update(zip(unseen.tolist(), parsed.tolist()))
+        return pd.DatetimeIndex([memo[v] for v in uniques]).to_numpy(dtype="datetime64[ns]")
+
+
+def feed_signature(columns: list) -> str:
+    """Identity of a feed for DATE_FORMAT_MEMO: a digest of its raw header row, in order."""
+    header = "\x1f".join(str(col) for col in columns)
+    return hashlib.blake2b(header.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
+
+class FormatMemo:
+    """Thread-safe LRU of (feed signature, column name) → format plan remembered across runs."""
+
+    def __init__(self, max_columns: int = MEMO_MAX_COLUMNS):
+        self._lock  = threading.Lock()
+        self._plans: OrderedDict[tuple[str, str], list[str]] = OrderedDict()
+        self._max   = max_columns
+
+    def get(self, feed: str, column: str) -> list[str] | None:
+        with self._lock:
+            formats = self._plans.get((feed, column))
+            if formats is not None:
+                self._plans.move_to_end((feed, column))
+            return formats
+
+    def remember(self, feed: str, column: str, formats: list[str]) -> None:
+        with self._lock:
+            self._plans[(feed, column)] = list(formats)
+            self._plans.move_to_end((feed, column))
+            while len(self._plans) > self._max:
+                self._plans.popitem(last=False)
+
+
+# Singleton — shared by every engine in the process
+DATE_FORMAT_MEMO = FormatMemo()
+
+
+def choose_plan(
+    feed: str,
+    column: str,
+    sample: pd.Series,
+    configured: list[str] | None,
+    min_coverage: float,
+) -> DatePlan:
+    """
+    Pick the format plan for a column of the feed with signature `feed`.
+    A configured or remembered plan is reused without detection as long as
+    it still parses at least `min_coverage` of the sample; otherwise
+    formats are detected afresh.
+    """
+    for formats, source in ((configured, "config"), (DATE_FORMAT_MEMO.get(feed, column), "memo")):
+        if formats and _coverage(sample, formats) >= min_coverage:
+            return DatePlan(formats=list(formats), source=source)
+    return DatePlan(formats=detect_formats(sample), source="detected")
@@ -10,15 +10,33 @@ Pipeline order (intentional):
   4. Category harmonisation (abbreviation/variant mapping)
   5. Duplicate removal
   6. Per-column type inference → imputation → outlier handling
+     (optionally fanned out over a worker pool — config.column_workers)
   7. Constant & near-constant column flagging
-  8. EDA report generation
+  8. EDA report — overview now, heavy sections on demand (LazyEDA)
 
 Design principles:
   - Every mutation is logged with before/after counts where meaningful
   - No silent data loss — dropped columns are recorded with reason
   - Quality score appended AFTER drop decision (no phantom scores)
   - All config-driven — zero hardcoded thresholds
-  - Thread-safe: no global state, all state lives on the instance
+  - Thread-safe: run state lives on the instance; the only process-wide
+    state is lock-guarded caches and metrics — DATE_FORMAT_MEMO (dates.py,
+    keyed by feed signature), FUZZY_CLUSTER_CACHE (fuzzy_cache.py, keyed
+    by the distinct values), the UNIT_STRIPPER totals (utils.py) and
+    RECENT_TIMINGS (timings.py) — none of which changes a run's output
+    beyond skipping repeated detection work
+  - Columns are profiled once (profiling.ColumnProfile) and re-profiled
+    only after a stage writes them — always go through _set_column
+  - The input frame is never mutated: in lean_memory mode the working
+    frame shares the input's column arrays, and _set_column replaces a
+    column instead of writing into it (copy-on-mutate)
+  - Re-cleans resume from memoised stage state when given a
+    StageCheckpoints (see checkpoints.py): steps 1-5 and the type
+    inference half of step 6 are skipped while their options are unchanged
+  - Every stage and every process_column call is timed (wall, CPU,
+    rows/cells — see timings.py) into the result's "timings" section
+  - An optional progress callback receives one event per stage and per
+    processed column (stage, percent; column, done/total) — see _emit
 """
 
 from __future__ import annotations
@@ -27,21 +45,29 @@ import re
 import unicodedata
 import logging
 import math
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
 from scipy import stats as scipy_stats
 
+from .checkpoints import STAGE_FIELDS, StageCheckpoints, stage_key
 from .config import CleaningConfig
+from .dates import DATE_FORMAT_MEMO, DateParseCache, DatePlan, choose_plan, feed_signature
+from .fuzzy_cache import FUZZY_CLUSTER_CACHE
+from .metrics import observe_engine_run
+from .profiling import ColumnProfile, NumericStats, numeric_stats
+from .timings import RECENT_TIMINGS, RunTimings
 from .utils import (
     PLACEHOLDER_VALUES,
-    UNIT_PATTERNS,
+    UNIT_STRIPPER,
     ABBREVIATION_MAPS,
     normalise_phone,
     normalise_percentage,
-    is_free_text_column,
     fuzzy_cluster_series,
     sanitize_numeric,
     strip_control_chars,
@@ -94,6 +120,98 @@ def _pct(n: int, total: int) -> str:
     return f"{n / total * 100:.1f}%" if total else "0%"
 
 
+def _wilson_interval(ratio: float, n: int, z: float) -> tuple[float, float]:
+    """Wilson score interval for a proportion observed on n trials."""
+    if n == 0:
+        return 0.0, 1.0
+    denom  = 1 + z * z / n
+    centre = (ratio + z * z / (2 * n)) / denom
+    spread = z * math.sqrt(ratio * (1 - ratio) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+def _stratified_sample(non_null: pd.Series, size: int) -> pd.Series:
+    """
+    One seeded random row from each of `size` equal-width position strata,
+    so feeds whose format drifts along the file are still represented.
+    """
+    edges = np.linspace(0, len(non_null), size + 1).astype(int)
+    rng   = np.random.default_rng(42)
+    picks = edges[:-1] + (rng.random(size) * np.diff(edges)).astype(int)
+    return non_null.iloc[picks]
+
+
+def _changed(before: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """Element-wise 'value changed' mask that treats NaN == NaN."""
+    both_null = pd.isna(before) & pd.isna(after)
+    return ~((before == after) | both_null)
+
+
+def _has_raw_nulls(series: pd.Series, codes: np.ndarray) -> bool:
+    """Whether a null cell holds None, pd.NA or NaT rather than NaN (decode() normalises them)."""
+    nulls = series.to_numpy(dtype=object)[codes < 0]
+    return any(not isinstance(v, float) for v in nulls)
+
+
+class _DictEncoded:
+    """
+    Dictionary-encoded view of a column: integer codes into an array of
+    distinct values. String stages transform `uniques` only and decode
+    through the codes, so cost scales with cardinality instead of rows.
+
+    Nulls keep code -1 and always decode back to NaN. Audit counts are
+    derived from per-code frequencies, so they are exact cell counts.
+    """
+
+    __slots__ = ("codes", "uniques", "counts", "index")
+
+    def __init__(self, series: pd.Series):
+        if pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            uniques = np.asarray(uniques, dtype=object)
+        else:
+            # Mixed types: 1, 1.0 and True hash equal, so key on type + str()
+            # and keep the first original object of each group as the unique.
+            keys = series.map(lambda v: f"{type(v).__name__}:{v}").where(series.notna())
+            codes, _ = pd.factorize(keys, use_na_sentinel=True)
+            _, first = np.unique(codes[codes >= 0], return_index=True)
+            uniques = series.to_numpy(dtype=object)[codes >= 0][first]
+        self.codes:   np.ndarray = codes
+        self.uniques: np.ndarray = uniques
+        self.counts:  np.ndarray = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.index:   pd.Index   = series.index
+
+    def map(self, fn) -> np.ndarray:
+        """Apply fn (Series -> Series) to the uniques. Returns the previous uniques."""
+        before = self.uniques
+        self.uniques = np.asarray(fn(pd.Series(before, dtype=object)), dtype=object)
+        return before
+
+    def cells(self, mask: np.ndarray) -> int:
+        """Number of rows whose code is selected by a boolean mask over uniques."""
+        return int(self.counts[mask].sum())
+
+    def decode(self) -> pd.Series:
+        values = np.append(self.uniques, np.nan).take(self.codes)  # -1 → trailing NaN
+        return pd.Series(values, index=self.index, dtype=object)
+
+
+@dataclass
+class _ColumnTyping:
+    """
+    Outcome of the inference half of process_column, replayable on a
+    re-clean: the column's kind, its values after phone/percentage
+    normalisation, the converted values and the audit entries logged.
+    """
+    kind:       str                       # id | free_text | numeric | datetime | boolean | categorical
+    n_rows:     int                       # rows of the frame it was inferred on
+    series:     pd.Series | None = None
+    converted:  pd.Series | None = None
+    confidence: float | None = None
+    date_plan:  DatePlan | None = None
+    audit:      list[dict] = field(default_factory=list)
+
+
 # ─────────────────────────────────────────────
 # Engine
 # ─────────────────────────────────────────────
@@ -104,11 +222,24 @@ class EnterpriseDataEngine:
 
     Parameters
     ----------
-    df     : Raw input DataFrame
-    config : CleaningConfig instance (all thresholds live here)
+    df          : Raw input DataFrame
+    config      : CleaningConfig instance (all thresholds live here)
+    checkpoints : Optional StageCheckpoints shared by runs over the same df
+    progress    : Optional callable receiving progress event dicts
     """
 
-    def __init__(self, df: pd.DataFrame, config: CleaningConfig = None):
+    # Preparation stages (steps 1-5) in order, as (checkpoint stage, method, progress event)
+    _PREP_STAGES = (
+        ("headers",    "_prepare_headers",     "normalise_column_headers"),
+        ("strings",    "normalise_strings",    "normalise_strings"),
+        ("units",      "strip_units",          "strip_units"),
+        ("categories", "harmonise_categories", "harmonise_categories"),
+        ("dedupe",     "remove_duplicates",    "remove_duplicates"),
+    )
+
+    def __init__(self, df: pd.DataFrame, config: CleaningConfig = None,
+                 checkpoints: StageCheckpoints | None = None,
+                 progress: Callable[[dict], None] | None = None):
         if config is None:
             config = CleaningConfig()
 
@@ -117,13 +248,40 @@ class EnterpriseDataEngine:
         if df.empty:
             raise ValueError("Input DataFrame is empty")
 
-        self.original_df: pd.DataFrame = df.copy(deep=True)
-        self.df: pd.DataFrame = df.copy(deep=True)
         self.config: CleaningConfig = config
+        self.original_shape: tuple[int, int] = df.shape
+        self.original_columns: list = list(df.columns)
+        # Identity of this feed for the cross-run DATE_FORMAT_MEMO
+        self._feed: str = feed_signature(self.original_columns)
+        if getattr(config, "lean_memory", True):
+            # Shallow copy — own axes, shared column arrays until a stage replaces them
+            self.original_df: pd.DataFrame | None = None
+            self.df: pd.DataFrame = df.copy(deep=False)
+            self._bytes_not_copied: int = 2 * int(df.memory_usage(index=True, deep=False).sum())
+        else:
+            self.original_df = df.copy(deep=True)
+            self.df = df.copy(deep=True)
+            self._bytes_not_copied = 0
         self.audit_log: list[dict] = []
         self.column_quality: list[dict] = []
         self._total_rows: int = len(df)
         self._started_at: datetime = datetime.utcnow()
+        # Dictionary encodings shared by the string stages (steps 2-4)
+        self._encodings: dict[str, _DictEncoded] = {}
+        # Datetime format plans and parsed distinct strings, per column
+        self._date_plans: dict[str, DatePlan] = {}
+        self._date_cache: DateParseCache = DateParseCache()
+        # Lazily computed column statistics, dropped when a column is written
+        self._profiles: dict[str, ColumnProfile] = {}
+        # Memoised stage state for re-cleans, and this run's column typings
+        self._checkpoints = checkpoints
+        if checkpoints is not None:
+            checkpoints.bind(df)
+        self._typings: dict[str, _ColumnTyping] = {}
+        self._prepared_rows: int | None = None
+        # Wall/CPU time per stage and per column
+        self._timings: RunTimings = RunTimings()
+        self._progress = progress
 
     # ──────────────────────────────────────────
     # Internal logging
@@ -134,6 +292,50 @@ class EnterpriseDataEngine:
         self.audit_log.append(entry)
         logger.debug(entry)
 
+    def _emit(self, stage: str, percent: float, **fields) -> None:
+        """
+        Report progress: preparation stages cover 0-25%, columns 25-90%,
+        low variance and EDA the rest. A failing callback never fails the run.
+        """
+        if self._progress is None:
+            return
+        try:
+            self._progress({"stage": stage, "percent": round(percent, 1), **fields})
+        except Exception as e:
+            logger.warning(f"progress callback failed — {e}")
+
+    def _column_done(self, col: str, done: int, total: int) -> None:
+        self._emit("process_column", 25 + 65 * done / total, column=col, done=done, total=total)
+
+    def _encoded(self, col: str) -> _DictEncoded:
+        """
+        Return the cached dictionary encoding of `col`, building it on first
+        use. remove_duplicates drops the cache; a row-count mismatch rebuilds it.
+        """
+        enc = self._encodings.get(col)
+        if enc is None or len(enc.codes) != len(self.df):
+            enc = _DictEncoded(self.df[col])
+            self._encodings[col] = enc
+        return enc
+
+    def _profile(self, col: str) -> ColumnProfile:
+        """Return the cached profile of `col`, profiling its current values on first use."""
+        profile = self._profiles.get(col)
+        if profile is None or profile.n_rows != len(self.df):
+            profile = ColumnProfile(self.df[col])
+            self._profiles[col] = profile
+        return profile
+
+    def _set_column(self, col: str, values) -> None:
+        """Write a column and invalidate its cached profile."""
+        self.df[col] = values
+        self._profiles.pop(col, None)
+
+    def _drop_columns(self, cols: list[str]) -> None:
+        self.df.drop(columns=cols, inplace=True)
+        for col in cols:
+            self._profiles.pop(col, None)
+
     # ──────────────────────────────────────────
     # Step 1 — Column header normalisation
     # ──────────────────────────────────────────
@@ -152,15 +354,27 @@ class EnterpriseDataEngine:
                (str(col).lower().startswith("unnamed") and self.df[col].isna().all())
         ]
         if empty_cols:
-            self.df.drop(columns=empty_cols, inplace=True)
+            self._drop_columns(empty_cols)
             self._log(
                 action="empty_column_drop",
                 columns_dropped=empty_cols,
                 count=len(empty_cols),
             )
 
+        rename_map = self._header_rename_map(list(self.df.columns))
+        if rename_map:
+            self.df.rename(columns=rename_map, inplace=True)
+            self._log(
+                action="header_normalisation",
+                renamed=rename_map,
+                count=len(rename_map),
+            )
+
+    @staticmethod
+    def _header_rename_map(columns: list) -> dict:
+        """{original: normalised} for every header that changes."""
         rename_map = {}
-        for col in self.df.columns:
+        for col in columns:
             clean = str(col)
             clean = unicodedata.normalize("NFKD", clean)
             clean = clean.lower().strip()
@@ -169,17 +383,10 @@ class EnterpriseDataEngine:
             clean = re.sub(r"_+", "_", clean).strip("_")
             clean = re.sub(r"^(\d)", r"col_\1", clean)  # cannot start with digit
             if not clean:
-                clean = f"col_{list(self.df.columns).index(col)}"
+                clean = f"col_{columns.index(col)}"
             if clean != col:
                 rename_map[col] = clean
-
-        if rename_map:
-            self.df.rename(columns=rename_map, inplace=True)
-            self._log(
-                action="header_normalisation",
-                renamed=rename_map,
-                count=len(rename_map),
-            )
+        return rename_map
 
     # ──────────────────────────────────────────
     # Step 2 — String normalisation
@@ -205,32 +412,39 @@ class EnterpriseDataEngine:
         """
         object_cols = self.df.select_dtypes(include="object").columns
         for col in object_cols:
-            before_nulls = int(self.df[col].isna().sum())
-            s = self.df[col].astype(str)
+            # Lowercase — preserve case for IDs, phones, names, titles
+            _is_pre_id = col in getattr(self, '_pre_identified_id_cols', set())
+            lowercase  = not self._PRESERVE_CASE.search(col) and not _is_pre_id
 
-            # Unicode noise
-            s = s.str.replace(u"\xa0", " ", regex=False)
-            s = s.str.replace(u"\u200b", "", regex=False)
-            s = s.str.replace(u"\ufeff", "", regex=False)
+            def _normalise(u: pd.Series) -> pd.Series:
+                s = u.astype(str)
 
-            # Control characters
-            s = s.str.replace(r"[\r\n\t\x00-\x1f\x7f]", " ", regex=True)
+                # Unicode noise
+                s = s.str.replace(u"\xa0", " ", regex=False)
+                s = s.str.replace(u"\u200b", "", regex=False)
+                s = s.str.replace(u"\ufeff", "", regex=False)
 
-            # Whitespace
-            s = s.str.strip()
-            s = s.str.replace(r"\s+", " ", regex=True)
+                # Control characters
+                s = s.str.replace(r"[\r\n\t\x00-\x1f\x7f]", " ", regex=True)
 
-            # Lowercase — preserve case for IDs, phones, names, titles
-            _is_pre_id = col in getattr(self, '_pre_identified_id_cols', set())
-            if not self._PRESERVE_CASE.search(col) and not _is_pre_id:
-                s = s.str.lower()
+                # Whitespace
+                s = s.str.strip()
+                s = s.str.replace(r"\s+", " ", regex=True)
+
+                if lowercase:
+                    s = s.str.lower()
+
+                # Placeholder -> NaN
+                return s.where(~s.str.lower().isin(PLACEHOLDER_VALUES))
 
-            # Placeholder -> NaN
-            s = s.apply(lambda x: np.nan if str(x).lower() in PLACEHOLDER_VALUES else x)
+            enc    = self._encoded(col)
+            before = enc.map(_normalise)
+            new_nulls = enc.cells(pd.isna(enc.uniques) & ~pd.isna(before))
 
-            self.df[col] = s
-            after_nulls = int(self.df[col].isna().sum())
-            new_nulls = after_nulls - before_nulls
+            # Untouched columns keep their profile — unless they hold raw
+            # None/pd.NA nulls, which later str casts would turn into "None"
+            if enc.cells(_changed(before, enc.uniques)) or _has_raw_nulls(self.df[col], enc.codes):
+                self._set_column(col, enc.decode())
             self._log(action="string_normalisation", column=col, placeholders_nulled=new_nulls)
 
     # ──────────────────────────────────────────
@@ -242,22 +456,25 @@ class EnterpriseDataEngine:
         Remove common measurement suffixes from object columns so that
         numeric parsing succeeds downstream.
         E.g. "142.5 sq.m." -> "142.5",  "4,500 kg" -> "4500"
-        Patterns live in utils.UNIT_PATTERNS so they are easy to extend.
+        Patterns live in utils.UNIT_PATTERNS so they are easy to extend;
+        utils.UNIT_STRIPPER runs them as one compiled alternation and
+        reports per-pattern hit counts in the audit entry.
         """
         object_cols = self.df.select_dtypes(include="object").columns
         for col in object_cols:
-            original = self.df[col].copy()
-            s = self.df[col].astype(str)
-            for pattern in UNIT_PATTERNS:
-                s = s.str.replace(pattern, "", regex=True)
-            s = s.str.strip()
-            changed = int((s != original.astype(str)).sum())
+            enc = self._encoded(col)
+            stripped, pattern_hits = UNIT_STRIPPER.strip(
+                pd.Series(enc.uniques, dtype=object), weights=enc.counts,
+            )
+            before  = enc.map(lambda _: stripped)
+            changed = enc.cells(_changed(before, enc.uniques))
             if changed:
-                self.df[col] = s
+                self._set_column(col, enc.decode())
                 self._log(
                     action="unit_stripping",
                     column=col,
                     cells_affected=changed,
+                    pattern_hits=pattern_hits,
                 )
 
     # ──────────────────────────────────────────
@@ -273,23 +490,23 @@ class EnterpriseDataEngine:
         Also applies user-supplied config.category_maps if provided:
           config.category_maps = {"house_type": {"det": "detached", ...}}
         """
+        user_maps: dict = getattr(self.config, "category_maps", {}) or {}
         for col in self.df.select_dtypes(include=["object", "category"]).columns:
-            s = self.df[col]
-            changed_total = 0
-
-            for abbrev_map in ABBREVIATION_MAPS:
-                before = s.copy()
-                s = s.replace(abbrev_map)
-                changed_total += int((s != before).sum())
+            enc      = self._encoded(col)
+            original = enc.uniques
 
-            user_maps: dict = getattr(self.config, "category_maps", {}) or {}
+            maps = list(ABBREVIATION_MAPS)
             if col in user_maps:
-                before = s.copy()
-                s = s.replace(user_maps[col])
-                changed_total += int((s != before).sum())
+                maps.append(user_maps[col])
+            for abbrev_map in maps:
+                enc.map(lambda u: u.replace(abbrev_map))
+            changed_total = enc.cells(_changed(original, enc.uniques))
 
             if changed_total:
-                self.df[col] = s
+                decoded = enc.decode()
+                if isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                    decoded = decoded.astype("category")
+                self._set_column(col, decoded)
                 self._log(
                     action="category_harmonisation",
                     column=col,
@@ -304,8 +521,10 @@ class EnterpriseDataEngine:
         before = len(self.df)
         self.df.drop_duplicates(inplace=True)
         self.df.reset_index(drop=True, inplace=True)
+        self._encodings.clear()
         removed = before - len(self.df)
         if removed:
+            self._profiles.clear()
             self._log(
                 action="duplicate_removal",
                 rows_removed=removed,
@@ -316,78 +535,143 @@ class EnterpriseDataEngine:
     # Step 6 — Type inference
     # ──────────────────────────────────────────
 
+    # Quick gate: passes numeric-separator dates AND month-name dates
+    _LOOKS_LIKE_DATE = re.compile(
+        r"(?:\d{2,4}[-/\s]\d{1,2}[-/\s]\d{2,4}"
+        r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2})",
+        re.IGNORECASE,
+    )
+    _DATE_GATE = 0.3
+
+    _BOOL_MAP = {
+        "true": True,  "false": False,
+        "yes":  True,  "no":    False,
+        "1":    True,  "0":     False,
+        "y":    True,  "n":     False,
+    }
+    _BOOL_CONFIDENCE = 0.95
+
+    def _date_gate_ratio(self, non_null: pd.Series) -> float:
+        return float(non_null.astype(str).str.contains(self._LOOKS_LIKE_DATE, regex=True).mean())
+
+    def _datetime_threshold(self) -> float:
+        # Use 0.75 threshold — mixed-format date columns rarely hit 0.85
+        return max(0.75, self.config.datetime_confidence * 0.88)
+
+    def _evaluate_datetime(self, series: pd.Series, n_non_null: int) -> tuple[float, pd.Series | None]:
+        """
+        Datetime conversion of `series` and its parse ratio over non-null values.
+        The column's format plan is chosen once (configured, remembered or
+        detected from a sample of distinct values — see dates.py). Each
+        distinct string is parsed once and mapped back through codes.
+        """
+        col = str(series.name)
+        strings = series.astype(str).where(series.notna())
+        codes, uniques = pd.factorize(strings, use_na_sentinel=True)
+        uniques = pd.Series(uniques, dtype=object)
+
+        plan = self._date_plans.get(col)
+        if plan is None:
+            size   = getattr(self.config, "date_detect_sample", 500)
+            sample = uniques if len(uniques) <= size else uniques.sample(size, random_state=42)
+            configured = (getattr(self.config, "date_formats", {}) or {}).get(col)
+            plan = choose_plan(self._feed, col, sample, configured, self._datetime_threshold())
+            self._date_plans[col] = plan
+
+        parsed = self._date_cache.parse(col, uniques, plan)
+        values = np.append(parsed, np.datetime64("NaT", "ns")).take(codes)   # -1 → NaT
+        date_try = pd.Series(values, index=series.index, name=series.name)
+        return date_try.notna().sum() / max(n_non_null, 1), date_try
+
+    def _evaluate_numeric(self, series: pd.Series, n_non_null: int) -> tuple[float, pd.Series]:
+        numeric_try = sanitize_numeric(series)
+        return numeric_try.notna().sum() / max(n_non_null, 1), numeric_try
+
+    def _evaluate_boolean(self, series: pd.Series, n_non_null: int) -> tuple[float, pd.Series]:
+        bool_try = series.astype(str).str.lower().map(self._BOOL_MAP)
+        return bool_try.notna().sum() / max(n_non_null, 1), bool_try
+
+    def _screen_sample(self, sample: pd.Series, thresholds: dict[str, float]) -> dict[str, bool | None]:
+        """
+        Phase one of type inference. Score every candidate type on a sample
+        of non-null values and compare a Wilson confidence interval of each
+        parse ratio against its threshold:
+          False → the full column would fail with high confidence (skip it)
+          True  → the full column would pass with high confidence
+          None  → ambiguous; evaluate on the full column
+        """
+        z = getattr(self.config, "inference_confidence_z", 2.576)
+        n = len(sample)
+
+        def _verdict(ratio: float, threshold: float) -> bool | None:
+            lo, hi = _wilson_interval(ratio, n, z)
+            if lo >= threshold:
+                return True
+            if hi < threshold:
+                return False
+            return None
+
+        plan: dict[str, bool | None] = {}
+        gate = _verdict(self._date_gate_ratio(sample), self._DATE_GATE)
+        if gate is False:
+            plan["datetime"] = False
+        else:
+            date_verdict = _verdict(self._evaluate_datetime(sample, n)[0], thresholds["datetime"])
+            if gate is None and date_verdict:
+                date_verdict = None   # the full-column gate still has to pass
+            plan["datetime"] = date_verdict
+        plan["numeric"] = _verdict(self._evaluate_numeric(sample, n)[0], thresholds["numeric"])
+        plan["boolean"] = _verdict(self._evaluate_boolean(sample, n)[0], thresholds["boolean"])
+        return plan
+
     def _infer_type(self, series: pd.Series) -> tuple[str, pd.Series, float | None]:
         """
         Returns (type_string, converted_series, confidence).
-        Priority: numeric -> datetime -> boolean -> categorical.
+        Priority: datetime -> numeric -> boolean -> categorical.
         Confidence = ratio of successfully converted non-null values.
+
+        Two phases on columns over twice config.inference_sample_size:
+          1. _screen_sample scores every candidate on a stratified sample
+          2. the full column is converted only for candidates the sample
+             did not confidently reject, in priority order — normally just
+             the winner. Ambiguous samples get the full evaluation, and the
+             full conversion always confirms the threshold before returning.
         """
         non_null = series.dropna()
         if non_null.empty:
             return "categorical", series, None
+        n_non_null = len(non_null)
 
-        # ── Datetime (check BEFORE numeric — date strings contain digits) ──
-        # Use a strict format list to avoid false positives and suppress warnings
-        DATE_FORMATS = [
-            "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y",
-            "%d-%m-%Y", "%Y/%m/%d", "%d %b %Y",
-            "%d %B %Y", "%b %d, %Y", "%B %d, %Y",
-            "%b %d %Y", "%B %d %Y",
-        ]
-        str_sample = non_null.astype(str)
-        # Quick gate: passes numeric-separator dates AND month-name dates
-        _numeric_date   = r"\d{2,4}[-/\s]\d{1,2}[-/\s]\d{2,4}"
-        _monthname_date = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2}"
-        looks_like_date = str_sample.str.contains(
-            rf"(?:{_numeric_date}|{_monthname_date})", regex=True, case=False
-        ).mean()
-
-        date_try   = None
-        date_ratio = 0.0
-
-        if looks_like_date >= 0.3:
-            # Use multi-format parser for maximum coverage
-            dt_multi = self._try_parse_dates(series)
-            multi_ratio = dt_multi.notna().sum() / max(len(non_null), 1)
-
-            # Also try single-format pass for confidence
-            for fmt in DATE_FORMATS:
-                try:
-                    dt = pd.to_datetime(series, format=fmt, errors="coerce")
-                    ratio = dt.notna().sum() / max(len(non_null), 1)
-                    if ratio > date_ratio:
-                        date_ratio = ratio
-                        date_try = dt
-                except Exception:
-                    continue
-
-            # Use whichever got more dates parsed
-            if multi_ratio > date_ratio:
-                date_ratio = multi_ratio
-                date_try   = dt_multi
+        thresholds = {
+            "datetime": self._datetime_threshold(),
+            "numeric":  self.config.numeric_confidence_weak,
+            "boolean":  self._BOOL_CONFIDENCE,
+        }
 
-        # Use 0.75 threshold — mixed-format date columns rarely hit 0.85
-        if date_ratio >= max(0.75, self.config.datetime_confidence * 0.88):
-            return "datetime", date_try, round(date_ratio, 4)
+        plan: dict[str, bool | None] = {}
+        sample_size = getattr(self.config, "inference_sample_size", 0)
+        if sample_size and n_non_null > 2 * sample_size:   # pays off only when the sample is small
+            plan = self._screen_sample(_stratified_sample(non_null, sample_size), thresholds)
+
+        # ── Datetime (check BEFORE numeric — date strings contain digits) ──
+        if plan.get("datetime") is not False and (
+            plan.get("datetime") or self._date_gate_ratio(non_null) >= self._DATE_GATE
+        ):
+            date_ratio, date_try = self._evaluate_datetime(series, n_non_null)
+            if date_ratio >= thresholds["datetime"]:
+                return "datetime", date_try, round(date_ratio, 4)
 
         # ── Numeric ──
-        numeric_try = sanitize_numeric(series)
-        numeric_ratio = numeric_try.notna().sum() / max(len(non_null), 1)
-        if numeric_ratio >= self.config.numeric_confidence_weak:
-            return "numeric", numeric_try, round(numeric_ratio, 4)
+        if plan.get("numeric") is not False:
+            numeric_ratio, numeric_try = self._evaluate_numeric(series, n_non_null)
+            if numeric_ratio >= thresholds["numeric"]:
+                return "numeric", numeric_try, round(numeric_ratio, 4)
 
         # ── Boolean ──
-        bool_map = {
-            "true": True,  "false": False,
-            "yes":  True,  "no":    False,
-            "1":    True,  "0":     False,
-            "y":    True,  "n":     False,
-        }
-        bool_try = non_null.astype(str).str.lower().map(bool_map)
-        bool_ratio = bool_try.notna().sum() / max(len(non_null), 1)
-        if bool_ratio >= 0.95:
-            full_bool = series.astype(str).str.lower().map(bool_map)
-            return "boolean", full_bool, round(bool_ratio, 4)
+        if plan.get("boolean") is not False:
+            bool_ratio, bool_try = self._evaluate_boolean(series, n_non_null)
+            if bool_ratio >= thresholds["boolean"]:
+                return "boolean", bool_try, round(bool_ratio, 4)
 
         return "categorical", series, None
 
@@ -427,15 +711,17 @@ class EnterpriseDataEngine:
         Outlier counts always appear in the audit log and quality scores
         regardless of action — only DataFrame mutation differs.
         """
-        series = self.df[col].dropna()
-        if series.empty:
+        stats = self._profile(col).numeric
+        if stats.count == 0:
             return 0.0
 
         method = getattr(self.config, "outlier_method", "iqr")
         if method == "zscore":
-            mask = detect_outliers_zscore(self.df[col], self.config.outlier_zscore_threshold)
+            mask = detect_outliers_zscore(self.df[col], self.config.outlier_zscore_threshold,
+                                          mean=stats.mean, std=stats.std)
         else:
-            mask = detect_outliers_iqr(self.df[col], self.config.outlier_iqr_multiplier)
+            mask = detect_outliers_iqr(self.df[col], self.config.outlier_iqr_multiplier,
+                                       q1=stats.q1, q3=stats.q3)
 
         count = int(mask.sum())
         if count == 0:
@@ -446,23 +732,22 @@ class EnterpriseDataEngine:
 
         if action == "flag":
             flag_col = f"{col}_is_outlier"
-            self.df[flag_col] = mask
+            self._set_column(flag_col, mask)
             self._log(action="outlier_flagged", column=col, count=count,
                       flag_column=flag_col, pct=_pct(count, len(self.df)))
 
         elif action == "cap":
-            q1 = self.df[col].quantile(0.25)
-            q3 = self.df[col].quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - self.config.outlier_iqr_multiplier * iqr
-            upper = q3 + self.config.outlier_iqr_multiplier * iqr
-            self.df[col] = self.df[col].clip(lower=lower, upper=upper)
+            iqr = stats.q3 - stats.q1
+            lower = stats.q1 - self.config.outlier_iqr_multiplier * iqr
+            upper = stats.q3 + self.config.outlier_iqr_multiplier * iqr
+            self._set_column(col, self.df[col].clip(lower=lower, upper=upper))
             self._log(action="outlier_capped", column=col, count=count,
                       lower=round(lower, 4), upper=round(upper, 4))
 
         elif action == "remove":
             before = len(self.df)
             self.df = self.df[~mask].reset_index(drop=True)
+            self._profiles.clear()
             self._log(action="outlier_rows_removed", column=col,
                       rows_dropped=before - len(self.df))
 
@@ -477,7 +762,7 @@ class EnterpriseDataEngine:
     # ──────────────────────────────────────────
 
     def _process_numeric(self, col: str, converted: pd.Series, confidence: float) -> None:
-        self.df[col] = converted
+        self._set_column(col, converted)
         missing_ratio = float(self.df[col].isna().mean())
 
         if missing_ratio > self.config.missing_drop_threshold:
@@ -487,32 +772,33 @@ class EnterpriseDataEngine:
                 "dropped": True, "drop_reason": "excessive_missing",
                 "missing_pct": round(missing_ratio * 100, 1),
             })
-            self.df.drop(columns=[col], inplace=True)
+            self._drop_columns([col])
             self._log(action="column_dropped", column=col,
                       reason="excessive_missing",
                       missing_pct=round(missing_ratio * 100, 1))
             return
 
         strategy = self.config.impute_numeric_strategy
+        stats    = self._profile(col).numeric
         # Detect if column contains only whole numbers — use integer imputation
         _non_null = self.df[col].dropna()
         _is_integer_col = len(_non_null) > 0 and (_non_null % 1 == 0).all()
 
         if strategy == "median":
-            _raw = float(self.df[col].median())
+            _raw = stats.median
             fill_value = int(round(_raw)) if _is_integer_col else round(_raw, 4)
         elif strategy == "mean":
-            _raw = float(self.df[col].mean())
+            _raw = stats.mean
             fill_value = int(round(_raw)) if _is_integer_col else round(_raw, 4)
         elif strategy == "zero":
             fill_value = 0 if _is_integer_col else 0.0
         else:
-            _raw = float(self.df[col].median())
+            _raw = stats.median
             fill_value = int(round(_raw)) if _is_integer_col else round(_raw, 4)
 
-        n_imputed = int(self.df[col].isna().sum())
-        self.df[col] = self.df[col].fillna(fill_value)
+        n_imputed = stats.null_count
         if n_imputed:
+            self._set_column(col, self.df[col].fillna(fill_value))
             self._log(action="numeric_imputation", column=col,
                       method=strategy, fill_value=fill_value,
                       cells_filled=n_imputed,
@@ -528,47 +814,14 @@ class EnterpriseDataEngine:
             "imputation_method": strategy,
         })
 
-    @staticmethod
-    def _try_parse_dates(series: pd.Series) -> pd.Series:
-        """
-        Try multiple date formats in sequence to maximise parse rate.
-        Returns a datetime series with NaT for unparseable values.
-        """
-        FORMATS = [
-            "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y",
-            "%Y/%m/%d", "%d %m %Y", "%m %d %Y", "%Y %m %d",
-            "%d-%b-%y", "%d-%b-%Y", "%b %d, %Y", "%B %d, %Y",
-            "%d/%m/%y", "%m/%d/%y", "%y-%m-%d",
-        ]
-        best = pd.Series(pd.NaT, index=series.index)
-        remaining = series.copy()
-
-        for fmt in FORMATS:
-            mask = remaining.notna()
-            if not mask.any():
-                break
-            try:
-                parsed = pd.to_datetime(remaining[mask], format=fmt, errors="coerce")
-                filled = parsed.notna()
-                best[remaining[mask][filled].index] = parsed[filled]
-                remaining[remaining[mask][filled].index] = np.nan
-            except Exception:
-                continue
-
-        # Final pass with inference for anything remaining
-        mask = remaining.notna()
-        if mask.any():
-            try:
-                parsed = pd.to_datetime(remaining[mask], infer_datetime_format=True, errors="coerce")
-                filled = parsed.notna()
-                best[remaining[mask][filled].index] = parsed[filled]
-            except Exception:
-                pass
-
-        return best
-
     def _process_datetime(self, col: str, converted: pd.Series, confidence: float) -> None:
-        self.df[col] = converted
+        self._set_column(col, converted)
+
+        plan = self._date_plans.get(col)
+        if plan is not None:
+            DATE_FORMAT_MEMO.remember(self._feed, col, plan.formats)
+            self._log(action="datetime_format_detected", column=col,
+                      formats=plan.formats, source=plan.source)
         missing_ratio = float(self.df[col].isna().mean())
 
         if missing_ratio > self.config.missing_drop_threshold:
@@ -577,7 +830,7 @@ class EnterpriseDataEngine:
                 "column": col, "type": "datetime", "quality_score": score,
                 "dropped": True, "drop_reason": "excessive_missing",
             })
-            self.df.drop(columns=[col], inplace=True)
+            self._drop_columns([col])
             self._log(action="column_dropped", column=col, reason="excessive_missing")
             return
 
@@ -594,7 +847,7 @@ class EnterpriseDataEngine:
             else:
                 fill_dt = pd.Timestamp(
                     getattr(self.config, "datetime_fill_value", "2000-01-01"))
-            self.df[col] = self.df[col].fillna(fill_dt)
+            self._set_column(col, self.df[col].fillna(fill_dt))
             self._log(action="datetime_imputation", column=col,
                       fill_value=str(fill_dt), cells_filled=n_missing)
 
@@ -605,11 +858,11 @@ class EnterpriseDataEngine:
         })
 
     def _process_boolean(self, col: str, converted: pd.Series, confidence: float) -> None:
-        self.df[col] = converted
+        self._set_column(col, converted)
         n_missing = int(self.df[col].isna().sum())
         if n_missing:
             fill = _safe_mode(self.df[col])
-            self.df[col] = self.df[col].fillna(fill)
+            self._set_column(col, self.df[col].fillna(fill))
             self._log(action="boolean_imputation", column=col,
                       fill_value=fill, cells_filled=n_missing)
         score = self._quality_score(self.df[col], confidence)
@@ -627,7 +880,7 @@ class EnterpriseDataEngine:
                 "quality_score": round(1 - missing_ratio, 4),
                 "dropped": True, "drop_reason": "excessive_missing",
             })
-            self.df.drop(columns=[col], inplace=True)
+            self._drop_columns([col])
             self._log(action="column_dropped", column=col,
                       reason="excessive_missing",
                       missing_pct=round(missing_ratio * 100, 1))
@@ -635,19 +888,23 @@ class EnterpriseDataEngine:
 
         # ── Fuzzy clustering — merge near-identical values ──
         # e.g. "Lagoss" → "Lagos", "Actve" → "Active", "port harcout" → "port harcourt"
-        # Only applied to low-cardinality columns (< 80 unique values)
+        # Only applied to columns with <= config.fuzzy_max_unique unique values
+        # and <= config.fuzzy_max_pairs candidate pairs
         # Threshold 0.82 catches typos without merging genuinely different values
         fuzz_threshold = getattr(self.config, "fuzzy_threshold", 0.82)
         if fuzz_threshold > 0:
             fuzzed, remap = fuzzy_cluster_series(
                 series.dropna().astype(str),
                 threshold=fuzz_threshold,
+                max_unique=getattr(self.config, "fuzzy_max_unique", 1000),
+                cache=FUZZY_CLUSTER_CACHE,
+                max_pairs=getattr(self.config, "fuzzy_max_pairs", 20000),
             )
             if remap:
                 # Apply remap to full series (including nulls)
-                self.df[col] = series.map(
+                self._set_column(col, series.map(
                     lambda x: remap.get(str(x), str(x)) if pd.notna(x) else x
-                )
+                ))
                 series = self.df[col]
                 self._log(
                     action="fuzzy_clustering",
@@ -656,20 +913,20 @@ class EnterpriseDataEngine:
                     remap=remap,
                 )
 
-        self.df[col] = series.astype("category")
+        self._set_column(col, series.astype("category"))
 
         n_missing = int(self.df[col].isna().sum())
         if n_missing and self.config.impute_categorical_strategy == "mode":
             fill = _safe_mode(self.df[col])
             if pd.notna(fill):
                 if fill not in self.df[col].cat.categories:
-                    self.df[col] = self.df[col].cat.add_categories([fill])
-                self.df[col] = self.df[col].fillna(fill)
+                    self._set_column(col, self.df[col].cat.add_categories([fill]))
+                self._set_column(col, self.df[col].fillna(fill))
                 self._log(action="categorical_imputation", column=col,
                           method="mode", fill_value=str(fill),
                           cells_filled=n_missing)
 
-        n_unique = self.df[col].nunique()
+        n_unique = self._profile(col).distinct_count
         cardinality_ratio = n_unique / max(len(self.df), 1)
 
         # Quality score accounts for fuzzy merges — more merges = lower initial consistency
@@ -699,8 +956,12 @@ class EnterpriseDataEngine:
         r"\b(phone|mobile|tel|telephone|gsm|whatsapp|contact_no|contact_num)\b",
         re.IGNORECASE,
     )
+    # Value-handling hints used by process_column
+    _PHONE_COL    = re.compile(r"\b(phone|mobile|tel|telephone|gsm|contact|whatsapp)\b", re.IGNORECASE)
+    _PCT_COL      = re.compile(r"\b(pct|percent|percentage|rate|ratio|share)\b", re.IGNORECASE)
+    _FREETEXT_COL = re.compile(r"\b(address|description|note|comment|remark|feedback|bio|summary|detail)\b", re.IGNORECASE)
 
-    def _is_id_column(self, col: str, series: pd.Series) -> bool:
+    def _is_id_column(self, col: str) -> bool:
         """
         Returns True if the column should be treated as an identifier object.
         Two signals, either is sufficient:
@@ -708,6 +969,17 @@ class EnterpriseDataEngine:
           2. Values are all unique integers with no analytical spread
              (pure row identifiers like FIFA's ID column: 158023, 20801...)
         """
+        if self._is_id_name(col):
+            return True
+
+        # Signal 4 — all-unique integer values in a large enough dataset
+        # (e.g. FIFA ID: 158023, 20801 — looks numeric but is a row key)
+        # Requires >= 50 rows to avoid misfiring on small datasets where
+        # legitimate columns like Age or Score happen to all be unique.
+        return self._profile(col).is_integer_row_key
+
+    def _is_id_name(self, col: str) -> bool:
+        """Name-only identifier signals (ID keywords, URL and phone columns)."""
         # Signal 1 — column name
         col_clean = col.replace("_", " ").replace("-", " ")
         if self._ID_COLUMN_NAME_PATTERN.search(col_clean):
@@ -721,35 +993,84 @@ class EnterpriseDataEngine:
         if self._PHONE_COLUMN_NAME_PATTERN.search(col_clean):
             return True
 
-        # Signal 3 — all-unique integer values in a large enough dataset
-        # (e.g. FIFA ID: 158023, 20801 — looks numeric but is a row key)
-        # Requires >= 50 rows to avoid misfiring on small datasets where
-        # legitimate columns like Age or Score happen to all be unique.
-        non_null = series.dropna()
-        if len(non_null) >= 50:
-            try:
-                as_num = pd.to_numeric(non_null, errors="coerce")
-                if as_num.notna().all():
-                    all_integers = (as_num == as_num.round()).all()
-                    all_unique   = as_num.nunique() == len(as_num)
-                    if all_integers and all_unique:
-                        return True
-            except Exception:
-                pass
-
         return False
 
-    def process_column(self, col: str) -> None:
+    def process_column(self, col: str, typing: _ColumnTyping | None = None) -> _ColumnTyping | None:
+        """
+        Infer and process one column. A `typing` from an earlier run over
+        the same rows is replayed instead of re-running inference.
+        Returns the typing used, or None if the column is already gone.
+        """
         if col not in self.df.columns:
-            return  # already dropped upstream
+            return None  # already dropped upstream
+        with self._timings.column(col, len(self.df)) as timing:
+            if typing is not None and typing.n_rows == len(self.df):
+                self._replay_typing(col, typing)
+                timing["typing_replayed"] = True
+            else:
+                typing = self._type_column(col)
+                timing["typing_replayed"] = False
+            timing["type"] = typing.kind
+            self._timings.split(timing, "inference")
+            self._finish_column(col, typing)
+        return typing
+
+    def _type_column(self, col: str) -> _ColumnTyping:
+        """ID / phone / percentage / free-text checks and type inference."""
         series = self.df[col]
+        n_rows = len(self.df)
+        mark   = len(self.audit_log)
 
         # ── ID / URL columns → force categorical, skip type inference ──
-        if self._is_id_column(col, series):
+        if self._is_id_column(col):
+            return _ColumnTyping(kind="id", n_rows=n_rows)
+
+        # ── Phone number detection ──
+        if self._PHONE_COL.search(col):
+            enc     = _DictEncoded(series)
+            before  = enc.map(normalise_phone)
+            changed = enc.cells(_changed(before, enc.uniques))
+            if changed:
+                self._set_column(col, enc.decode())
+                self._log(action="phone_normalisation", column=col,
+                          cells_affected=changed)
+            series = self.df[col]
+
+        # ── Percentage detection ──
+        pct_normalised, was_pct = normalise_percentage(series)
+        if was_pct:
+            self._set_column(col, pct_normalised.astype(float))
+            series = self.df[col]
+            self._log(action="percentage_normalisation", column=col,
+                      note="converted % values to 0-1 decimal")
+
+        # ── Free-text detection → skip imputation ──
+        if self._FREETEXT_COL.search(col) or self._profile(col).is_free_text:
+            return _ColumnTyping(kind="free_text", n_rows=n_rows, series=series,
+                                 audit=self.audit_log[mark:])
+
+        inferred_type, converted, confidence = self._infer_type(series)
+        return _ColumnTyping(
+            kind=inferred_type, n_rows=n_rows, series=series,
+            converted=converted, confidence=confidence,
+            date_plan=self._date_plans.get(col), audit=self.audit_log[mark:],
+        )
+
+    def _replay_typing(self, col: str, typing: _ColumnTyping) -> None:
+        """Restore the column state and audit entries _type_column produced."""
+        now = datetime.utcnow().isoformat()
+        self.audit_log.extend({**entry, "timestamp": now} for entry in typing.audit)
+        if typing.audit and typing.series is not None:   # phone / percentage rewrote it
+            self._set_column(col, typing.series)
+        if typing.date_plan is not None:
+            self._date_plans[col] = typing.date_plan
+
+    def _finish_column(self, col: str, typing: _ColumnTyping) -> None:
+        """Imputation, outliers and quality scoring for an inferred column."""
+        if typing.kind == "id":
             # Preserve original casing — IDs like C001, REF-999 must not be lowercased
-            self.df[col] = series.astype(str).str.strip()
-            self.df[col] = self.df[col].astype("category")
-            n_unique = self.df[col].nunique()
+            self._set_column(col, self.df[col].astype(str).str.strip().astype("category"))
+            n_unique = self._profile(col).distinct_count
             self.column_quality.append({
                 "column": col, "type": "categorical",
                 "quality_score": 1.0,
@@ -764,30 +1085,10 @@ class EnterpriseDataEngine:
                       unique_values=n_unique)
             return
 
-        # ── Phone number detection ──
-        _PHONE_COL = re.compile(r"\b(phone|mobile|tel|telephone|gsm|contact|whatsapp)\b", re.IGNORECASE)
-        if _PHONE_COL.search(col):
-            normalised = normalise_phone(series)
-            if (normalised != series).any():
-                self.df[col] = normalised
-                self._log(action="phone_normalisation", column=col,
-                          cells_affected=int((normalised != series).sum()))
-            series = self.df[col]
-
-        # ── Percentage detection ──
-        _PCT_COL = re.compile(r"\b(pct|percent|percentage|rate|ratio|share)\b", re.IGNORECASE)
-        pct_normalised, was_pct = normalise_percentage(series)
-        if was_pct:
-            self.df[col] = pct_normalised.astype(float)
-            series = self.df[col]
-            self._log(action="percentage_normalisation", column=col,
-                      note="converted % values to 0-1 decimal")
-
-        # ── Free-text detection → skip imputation ──
-        _FREETEXT_COL = re.compile(r"\b(address|description|note|comment|remark|feedback|bio|summary|detail)\b", re.IGNORECASE)
-        if _FREETEXT_COL.search(col) or is_free_text_column(series):
-            self.df[col] = series.astype("category")
-            n_unique = self.df[col].nunique()
+        series = typing.series
+        if typing.kind == "free_text":
+            self._set_column(col, series.astype("category"))
+            n_unique = self._profile(col).distinct_count
             self.column_quality.append({
                 "column": col, "type": "free_text",
                 "quality_score": round(1 - float(series.isna().mean()), 4),
@@ -801,15 +1102,52 @@ class EnterpriseDataEngine:
             self._log(action="free_text_detected", column=col, unique_values=n_unique)
             return
 
-        inferred_type, converted, confidence = self._infer_type(series)
-
+        converted, confidence = typing.converted, typing.confidence
         dispatch = {
             "numeric":     lambda: self._process_numeric(col, converted, confidence),
             "datetime":    lambda: self._process_datetime(col, converted, confidence),
             "boolean":     lambda: self._process_boolean(col, converted, confidence),
             "categorical": lambda: self._process_categorical(col, series),
         }
-        dispatch[inferred_type]()
+        dispatch[typing.kind]()
+
+    def _process_columns_parallel(self, columns: list[str], workers: int) -> None:
+        """
+        Fan process_column out over a worker pool. Each worker gets an
+        isolated single-column engine, so nothing is shared while running.
+        Results are merged back in `columns` order, which reproduces the
+        serial column order, audit_log and column_quality exactly.
+        """
+        backend  = getattr(self.config, "column_parallel_backend", "thread")
+        executor = ProcessPoolExecutor if backend == "process" else ThreadPoolExecutor
+        columns  = [col for col in columns if col in self.df.columns]
+
+        with executor(max_workers=workers) as pool:
+            results = pool.map(
+                _process_column_isolated,
+                columns,
+                [self.df[[col]] for col in columns],
+                [self.config] * len(columns),
+                [self._typings.get(col) for col in columns],
+                [self._feed] * len(columns),
+            )
+            for done, (col, (part, audit, quality, typing, timings)) in enumerate(zip(columns, results), 1):
+                if typing is not None:
+                    self._typings[col] = typing
+                if col in part.columns:
+                    self._set_column(col, part[col])
+                else:
+                    self._drop_columns([col])
+                for extra in part.columns:       # e.g. <col>_is_outlier
+                    if extra != col:
+                        self._set_column(extra, part[extra])
+                self.audit_log.extend(audit)
+                self.column_quality.extend(quality)
+                self._timings.columns.extend(timings)
+                for entry in audit:   # process workers can't update this process's memo
+                    if entry["action"] == "datetime_format_detected":
+                        DATE_FORMAT_MEMO.remember(self._feed, col, entry["formats"])
+                self._column_done(col, done, len(columns))
 
     # ──────────────────────────────────────────
     # Step 7 — Low variance flagging
@@ -825,16 +1163,13 @@ class EnterpriseDataEngine:
         for col in self.df.columns:
             if col.endswith("_is_outlier"):
                 continue
-            n_unique = self.df[col].nunique(dropna=True)
+            profile  = self._profile(col)
+            n_unique = profile.distinct_count
             if n_unique <= 1:
                 self._log(action="constant_column_flagged",
                           column=col, unique_values=n_unique)
                 continue
-            top_freq = (
-                self.df[col]
-                .value_counts(normalize=True, dropna=True)
-                .iloc[0]
-            )
+            top_freq = profile.top_freq
             if top_freq >= threshold:
                 self._log(action="near_constant_column_flagged",
                           column=col,
@@ -845,46 +1180,23 @@ class EnterpriseDataEngine:
     # ──────────────────────────────────────────
 
     def generate_eda(self) -> dict:
+        """Full EDA report, every section computed now (see LazyEDA for on-demand use)."""
+        eda = self._lazy_eda()
+        return {**eda.overview, **eda.sections(EDA_SECTIONS)}
+
+    def _lazy_eda(self) -> LazyEDA:
+        """
+        Cheap overview now, heavy sections deferred. Numeric stats the
+        pipeline already computed are handed over so they aren't redone.
+        """
         numeric_df = self.df.select_dtypes(include=np.number)
         cat_df     = self.df.select_dtypes(include="category")
-
-        # Shapiro-Wilk normality test + skew/kurtosis per numeric col
-        distributions: dict = {}
-        for col in numeric_df.columns:
-            s = numeric_df[col].dropna()
-            if len(s) < 3:
-                continue
-            skew = round(float(s.skew()), 4)
-            kurt = round(float(s.kurt()), 4)
-            sample = s.sample(min(len(s), 5000), random_state=42)
-            _, p_val = scipy_stats.shapiro(sample)
-            distributions[col] = {
-                "skewness":          skew,
-                "kurtosis":          kurt,
-                "normality_p_value": round(float(p_val), 6),
-                "is_normal":         bool(p_val > 0.05),
-            }
-
-        # Top-10 value counts per categorical col
-        value_counts: dict = {}
-        for col in cat_df.columns:
-            value_counts[col] = (
-                self.df[col]
-                .value_counts(dropna=False)
-                .head(10)
-                .to_dict()
-            )
-
-        return {
+        overview = {
             "shape":                list(self.df.shape),
-            "original_shape":       list(self.original_df.shape),
+            "original_shape":       list(self.original_shape),
             "rows_removed":         self._total_rows - len(self.df),
-            "summary_statistics":   numeric_df.describe().round(4).to_dict() if not numeric_df.empty else {},
             "missing_values":       self.df.isna().sum().to_dict(),
             "missing_pct":          (self.df.isna().mean() * 100).round(2).to_dict(),
-            "correlation_matrix":   numeric_df.corr().round(4).to_dict(),
-            "distributions":        distributions,
-            "value_counts":         value_counts,
             "dtypes":               {col: str(dt) for col, dt in self.df.dtypes.items()},
             "column_count_by_type": {
                 "numeric":   len(numeric_df.columns),
@@ -893,45 +1205,278 @@ class EnterpriseDataEngine:
                 "boolean":   len(self.df.select_dtypes(include="bool").columns),
             },
         }
+        known = {
+            col: self._profiles[col].numeric for col in numeric_df.columns
+            if col in self._profiles and self._profiles[col].has_numeric
+        }
+        return LazyEDA(self.df, _json_safe(overview), known)
 
     # ──────────────────────────────────────────
-    # Public runner
+    # Stage checkpoints (see checkpoints.py)
     # ──────────────────────────────────────────
 
-    def run(self) -> dict:
-        """Execute the full pipeline and return structured results."""
-        self._log(action="pipeline_started",
-                  input_shape=list(self.original_df.shape),
-                  config=self.config.__dict__)
-
+    def _prepare_headers(self) -> None:
+        """Step 1, plus the ID pre-scan normalise_strings relies on."""
         self.normalise_column_headers()
         # Pre-scan ID columns so normalise_strings can skip lowercasing them
         self._pre_identified_id_cols = {
             col for col in self.df.columns
-            if self._is_id_column(col, self.df[col])
+            if self._is_id_column(col)
+        }
+
+    def _run_prep_stages(self) -> None:
+        """
+        Steps 1-5, resuming after the deepest checkpointed stage whose
+        options are unchanged. State is captured after a stage when the
+        next one has options of its own (or it is the last), so a change
+        there can resume from it.
+        """
+        names = [name for name, _, _ in self._PREP_STAGES]
+        start = 0
+        if self._checkpoints is not None:
+            for i in reversed(range(len(names))):
+                state = self._checkpoints.get(stage_key(self.config, names[i]))
+                if state is not None:
+                    self._emit("checkpoint_restore", 0, stages_skipped=names[:i + 1])
+                    with self._timings.stage("checkpoint_restore", *state["df"].shape):
+                        self._restore_state(state)
+                    self._log(action="checkpoint_restored", stage=names[i],
+                              stages_skipped=names[:i + 1])
+                    start = i + 1
+                    break
+
+        mark = len(self.audit_log)
+        for i in range(start, len(names)):
+            self._emit(self._PREP_STAGES[i][2], 25 * i / len(names))
+            with self._timings.stage(names[i], *self.df.shape):
+                getattr(self, self._PREP_STAGES[i][1])()
+            last = i == len(names) - 1
+            if self._checkpoints is not None and (last or STAGE_FIELDS[names[i + 1]]):
+                self._checkpoints.put(stage_key(self.config, names[i]),
+                                      self._capture_state(self.audit_log[mark:]))
+
+    def _capture_state(self, audit: list[dict]) -> dict:
+        # Shallow copy: later stages replace columns, never write into them
+        state = getattr(self, "_restored_audit", [])
+        return {
+            "df":       self.df.copy(deep=False),
+            "audit":    [*state, *audit],
+            "profiles": dict(self._profiles),
+            "id_cols":  set(getattr(self, "_pre_identified_id_cols", set())),
         }
-        self.normalise_strings()
-        self.strip_units()
-        self.harmonise_categories()
-        self.remove_duplicates()
 
-        for col in list(self.df.columns):
-            self.process_column(col)
+    def _restore_state(self, state: dict) -> None:
+        self.df = state["df"].copy(deep=False)
+        self._profiles = dict(state["profiles"])
+        self._pre_identified_id_cols = set(state["id_cols"])
+        self._restored_audit = list(state["audit"])
+        now = datetime.utcnow().isoformat()
+        self.audit_log.extend({**entry, "timestamp": now} for entry in state["audit"])
+
+    def _restore_typings(self) -> None:
+        if self._checkpoints is None:
+            return
+        typings = self._checkpoints.get(stage_key(self.config, "typing"))
+        if typings:
+            self._typings = dict(typings)
+            self._log(action="checkpoint_restored", stage="typing",
+                      columns=len(typings))
+
+    def _save_typings(self) -> None:
+        # Only typings inferred on the full prepared frame (not after an
+        # outlier row removal) are valid for the next run
+        if self._checkpoints is None:
+            return
+        valid = {col: t for col, t in self._typings.items() if t.n_rows == self._prepared_rows}
+        if valid:
+            self._checkpoints.put(stage_key(self.config, "typing"), valid)
+
+    # ──────────────────────────────────────────
+    # Public runner
+    # ──────────────────────────────────────────
 
-        self.flag_low_variance_columns()
-        eda = self.generate_eda()
+    def run(self) -> dict:
+        """Execute the full pipeline and return structured results."""
+        self._log(action="pipeline_started",
+                  input_shape=list(self.original_shape),
+                  config=self.config.__dict__)
+        if self._bytes_not_copied:
+            # The two up-front deep copies (original_df + working frame) that lean mode skips
+            self._log(action="memory_lean_construction",
+                      bytes_saved=self._bytes_not_copied,
+                      mb_saved=round(self._bytes_not_copied / 2**20, 2))
+
+        self._run_prep_stages()
+        self._prepared_rows = len(self.df)
+        self._restore_typings()
+
+        workers = max(1, int(getattr(self.config, "column_workers", 1) or 1))
+        if workers > 1 and self.config.outlier_action == "remove":
+            logger.info("outlier_action='remove' couples columns — processing serially")
+            workers = 1
+        with self._timings.stage("columns", *self.df.shape):
+            if workers > 1:
+                self._process_columns_parallel(list(self.df.columns), workers)
+            else:
+                columns = list(self.df.columns)
+                for done, col in enumerate(columns, 1):
+                    typing = self.process_column(col, self._typings.get(col))
+                    if typing is not None:
+                        self._typings[col] = typing
+                    self._column_done(col, done, len(columns))
+        self._save_typings()
+
+        self._emit("flag_low_variance_columns", 90)
+        with self._timings.stage("low_variance", *self.df.shape):
+            self.flag_low_variance_columns()
+        self._emit("generate_eda", 95)
+        with self._timings.stage("eda_overview", *self.df.shape):
+            eda = self._lazy_eda()
 
         duration = (datetime.utcnow() - self._started_at).total_seconds()
         self._log(action="pipeline_complete",
                   output_shape=list(self.df.shape),
                   columns_dropped=(
-                      len(self.original_df.columns) - len(self.df.columns)
+                      len(self.original_columns) - len(self.df.columns)
                   ),
                   duration_seconds=round(duration, 3))
+        timings = self._timings.report()
+        RECENT_TIMINGS.record(timings)
+        observe_engine_run("memory", timings["wall_seconds"], *self.original_shape,
+                           stages=timings["stages"])
 
         return {
             "cleaned_dataframe":      self.df,
             "audit_log":              _json_safe(self.audit_log),
             "column_quality_summary": _json_safe(self.column_quality),
-            "eda_report":             _json_safe(eda),
+            "eda_report":             eda.overview,
+            "eda":                    eda,
+            "timings":                timings,
         }
+
+
+# ─────────────────────────────────────────────
+# Lazy EDA sections
+# ─────────────────────────────────────────────
+
+# Section name → key it fills in the eda_report dict
+EDA_SECTIONS: dict[str, str] = {
+    "summary":       "summary_statistics",
+    "correlation":   "correlation_matrix",
+    "distributions": "distributions",
+    "value_counts":  "value_counts",
+}
+
+
+class LazyEDA:
+    """
+    EDA of a cleaned DataFrame, split into independently computable
+    sections. The overview (shape, missing values, dtypes) is built
+    eagerly. Each section in EDA_SECTIONS is computed on first request
+    and cached, so clients that only download the CSV never pay for
+    Shapiro-Wilk, correlations or value counts.
+    """
+
+    def __init__(self, df: pd.DataFrame, overview: dict, stats: dict[str, NumericStats] | None = None):
+        self.df       = df
+        self.overview = overview
+        self._stats   = dict(stats or {})
+        self._done: dict[str, Any] = {}
+        self._lock    = threading.Lock()
+
+    @property
+    def computed(self) -> list[str]:
+        return list(self._done)
+
+    def __getstate__(self) -> dict:
+        # Picklable for the session store's compressed / spilled tiers
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def sections(self, names=None) -> dict:
+        """Return {report key: section} for `names` (default all), computing missing ones."""
+        names = list(EDA_SECTIONS) if names is None else list(names)
+        unknown = [n for n in names if n not in EDA_SECTIONS]
+        if unknown:
+            raise KeyError(f"Unknown EDA section(s): {', '.join(unknown)}")
+        with self._lock:
+            for name in names:
+                if name not in self._done:
+                    self._done[name] = _json_safe(getattr(self, f"_{name}")())
+            return {EDA_SECTIONS[n]: self._done[n] for n in names}
+
+    def _numeric_stats(self) -> dict[str, NumericStats]:
+        numeric_df = self.df.select_dtypes(include=np.number)
+        stale = [col for col in numeric_df.columns if col not in self._stats]
+        if stale:
+            block = numeric_df[stale].to_numpy(dtype="float64", na_value=np.nan)
+            self._stats.update(zip(stale, numeric_stats(block)))
+        return {col: self._stats[col] for col in numeric_df.columns}
+
+    def _summary(self) -> dict:
+        return {col: {k: round(v, 4) for k, v in st.describe().items()}
+                for col, st in self._numeric_stats().items()}
+
+    def _correlation(self) -> dict:
+        return self.df.select_dtypes(include=np.number).corr().round(4).to_dict()
+
+    def _distributions(self) -> dict:
+        # Shapiro-Wilk normality test + skew/kurtosis per numeric col
+        distributions: dict = {}
+        for col, st in self._numeric_stats().items():
+            if st.count < 3:
+                continue
+            s = self.df[col].dropna()
+            sample = s.sample(min(len(s), 5000), random_state=42)
+            _, p_val = scipy_stats.shapiro(sample)
+            distributions[col] = {
+                "skewness":          round(st.skew, 4),
+                "kurtosis":          round(st.kurt, 4),
+                "normality_p_value": round(float(p_val), 6),
+                "is_normal":         bool(p_val > 0.05),
+            }
+        return distributions
+
+    def _value_counts(self) -> dict:
+        # Top-10 value counts per categorical col
+        return {
+            col: self.df[col].value_counts(dropna=False).head(10).to_dict()
+            for col in self.df.select_dtypes(include="category").columns
+        }
+
+
+def materialise_eda(result: dict, sections=None) -> dict:
+    """
+    Make sure `sections` (default all) of a result's EDA exist and return
+    its eda_report. Computed sections are merged into result["eda_report"],
+    so a result cached in the session store only ever computes each once.
+    Results without a LazyEDA (e.g. shared reports) are returned as is.
+    """
+    eda = result.get("eda")
+    report = result.setdefault("eda_report", {})
+    if isinstance(eda, LazyEDA):
+        report.update(eda.sections(sections))
+    return report
+
+
+def _process_column_isolated(
+    col: str, frame: pd.DataFrame, config: CleaningConfig, typing: _ColumnTyping | None = None,
+    feed: str = "",
+) -> tuple[pd.DataFrame, list[dict], list[dict], _ColumnTyping | None, list[dict]]:
+    """
+    Run process_column on a single-column frame and return
+    (resulting frame, audit entries, quality entries, typing, column timings).
+    Module-level so process pools can pickle it. `feed` is the parent
+    engine's feed signature, so remembered date plans are looked up under
+    the whole feed rather than the single-column frame.
+    """
+    engine = EnterpriseDataEngine(frame, config)
+    if feed:
+        engine._feed = feed
+    typing = engine.process_column(col, typing)
+    return engine.df, engine.audit_log, engine.column_quality, typing, engine._timings.columns
@@ -0,0 +1,208 @@
+"""
+engine_pool.py
+==============
+Warm process pool for engine runs.
+
+clean_data is a sync endpoint, so EnterpriseDataEngine.run() used to hold
+the GIL on one of Starlette's threadpool threads; a big clean stalled
+/health, /upload and payment requests on the same worker. run_engine()
+hands frames of at least ENGINE_POOL_MIN_CELLS cells to a pool of
+ENGINE_POOL_WORKERS processes instead, and the request thread just waits.
+
+  - Workers are spawned once and kept warm: the initializer imports
+    pandas/NumPy/SciPy and the engine, and cleans a tiny frame so lazy
+    imports and compiled regexes are ready before the first request.
+  - Frames cross the process boundary as uncompressed Arrow IPC
+    (spill.pack), both ways — the input frame, and the cleaned frame and
+    LazyEDA in the result. Only the small payload around them is pickled.
+  - Every run, pooled or inline, is admitted first against the memory
+    and CPU budgets of admission.py, in the fast or bulk lane by frame
+    size and under its owner's run cap; the rest are queued or rejected.
+    Background jobs (jobs.py) are admitted before they take a job thread,
+    with run_admission()'s estimate, and run here already admitted.
+  - Engine progress events travel back through a multiprocessing manager
+    queue and are passed to the caller's callback on its own thread.
+
+Smaller frames run inline, where the session's StageCheckpoints can be
+used: checkpoints hold live frames and don't cross processes, so pooled
+re-cleans always run every stage. Run timings and metrics are recorded in
+this process. ENGINE_POOL_WORKERS=0 runs everything inline.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from typing import Callable, Optional
+
+import pandas as pd
+
+from app.admission import ADMISSION, estimate_run_bytes, lane_for, run_cpu_slots
+from app.checkpoints import StageCheckpoints
+from app.config import CleaningConfig
+from app.engine import EnterpriseDataEngine
+from app.metrics import Gauge, observe_engine_run
+from app.spill import Packed, pack, unpack
+from app.timings import RECENT_TIMINGS
+
+logger = logging.getLogger(__name__)
+
+# ── Config ──
+ENGINE_POOL_WORKERS   = int(os.getenv("ENGINE_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))   # 0 = inline
+ENGINE_POOL_MIN_CELLS = int(os.getenv("ENGINE_POOL_MIN_CELLS", "100000"))  # smaller frames run inline
+
+_TRANSFER_COMPRESSION = "uncompressed"   # pipe bandwidth is cheap, zstd CPU is not
+_PROGRESS_POLL_SECONDS = 0.1
+
+ENGINE_POOL_RUNS = Gauge(
+    "engine_pool_runs", "Engine runs in the process pool",
+)
+
+
+# ─────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────
+
+def _warm_worker() -> None:
+    """Pool initializer: pay import and first-run costs before a request does."""
+    try:
+        EnterpriseDataEngine(pd.DataFrame({"a": ["1", "2", None], "b": ["x", "y", "x"]})).run()
+    except Exception as e:
+        logger.warning(f"[engine-pool] warm-up run failed — {e}")
+
+
+def _run_packed(packed_df: Packed, config: CleaningConfig, events=None) -> Packed:
+    progress = events.put if events is not None else None
+    result = EnterpriseDataEngine(unpack(packed_df), config, progress=progress).run()
+    return pack(result, _TRANSFER_COMPRESSION)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ─────────────────────────────────────────────
+# Request side
+# ─────────────────────────────────────────────
+
+class EnginePool:
+    """Lazily started process pool of warm engine workers."""
+
+    def __init__(self, workers: int = ENGINE_POOL_WORKERS):
+        self.workers  = max(0, workers)
+        self._lock    = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None     # started on the first run that reports progress
+
+    def start(self) -> None:
+        """Spawn and warm every worker in the background rather than on the first run."""
+        if self.workers == 0:
+            return
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(_ping)
+
+    def run(self, df: pd.DataFrame, config: CleaningConfig,
+            progress: Callable[[dict], None] | None = None) -> dict:
+        """Clean `df` in a worker, relaying its progress events to `progress`."""
+        with ENGINE_POOL_RUNS.track():
+            executor = self._get_executor()
+            events   = self._get_manager().Queue() if progress is not None else None
+            try:
+                future = executor.submit(_run_packed, pack(df, _TRANSFER_COMPRESSION), config, events)
+                if events is not None:
+                    self._relay(future, events, progress)
+                packed = future.result()
+            except BrokenProcessPool:
+                self._reset(executor)
+                raise RuntimeError("An engine worker died; the pool was restarted.")
+        return unpack(packed)
+
+    @staticmethod
+    def _relay(future, events, progress: Callable[[dict], None]) -> None:
+        """Pass the worker's progress events to `progress` until its run ends."""
+        while True:
+            try:
+                progress(events.get(timeout=_PROGRESS_POLL_SECONDS))
+            except queue.Empty:
+                if future.done():
+                    break
+        while True:     # events put just before the run returned
+            try:
+                progress(events.get_nowait())
+            except queue.Empty:
+                return
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            manager, self._manager = self._manager, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),   # no forking a threaded server
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def _get_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a pool whose worker died (the next run spawns a new one)."""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide pool — started by main's lifespan, or on first use
+ENGINE_POOL = EnginePool()
+
+
+def _pooled(df: pd.DataFrame) -> bool:
+    return ENGINE_POOL.workers > 0 and df.size >= ENGINE_POOL_MIN_CELLS
+
+
+def run_admission(df: pd.DataFrame, config: CleaningConfig) -> dict:
+    """memory, cpu and lane of an engine run on `df`, as ADMISSION.admit takes them."""
+    return {
+        "memory": estimate_run_bytes(df, config, _pooled(df)),
+        "cpu":    run_cpu_slots(config),
+        "lane":   lane_for(len(df)),
+    }
+
+
+def run_engine(df: pd.DataFrame, config: CleaningConfig,
+               checkpoints: StageCheckpoints | None = None,
+               progress: Callable[[dict], None] | None = None,
+               owner: str = "", admitted: bool = False) -> dict:
+    """
+    Run the engine on `df` — in the pool for large frames, inline otherwise —
+    once admitted for `owner` (a user id or client address; "" is uncapped).
+    Raises AdmissionRejected if not admitted. `admitted` means the caller
+    already holds an admission for this run (a job, see JobStore.submit).
+    """
+    pooled = _pooled(df)
+    with (nullcontext() if admitted else ADMISSION.admit(**run_admission(df, config), owner=owner)):
+        if not pooled:
+            return EnterpriseDataEngine(df, config, checkpoints=checkpoints, progress=progress).run()
+        result = ENGINE_POOL.run(df, config, progress=progress)
+    timings = result["timings"]
+    RECENT_TIMINGS.record(timings)
+    observe_engine_run("memory", timings["wall_seconds"], *df.shape, stages=timings["stages"])
+    return result
@@ -0,0 +1,143 @@
+"""
+fuzzy_cache.py
+==============
+Cross-session cache of fuzzy clustering results.
+
+Weekly re-uploads of the same extract produce the same distinct values per
+column, so the pairwise similarity work in utils.fuzzy_cluster_series can
+be reused. Entries are keyed by a hash of the sorted unique values and the
+similarity threshold.
+
+What is cached is the set of clusters (which values belong together), not
+the final remap: the canonical value of a cluster depends on the current
+frequencies and is re-picked on every run, which is cheap.
+
+The cache is an in-memory LRU. Set FUZZY_CACHE_PATH to a SQLite file to
+also persist entries across restarts (and share them between workers).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Config ──
+FUZZY_CACHE_MAX_ENTRIES   = int(os.getenv("FUZZY_CACHE_MAX_ENTRIES", "512"))
+FUZZY_CACHE_PATH          = os.getenv("FUZZY_CACHE_PATH", "")   # "" = memory only
+FUZZY_CACHE_MAX_PERSISTED = 10_000                              # rows kept on disk
+
+
+def cluster_key(uniques: list[str], threshold: float) -> str:
+    """Stable key for a set of distinct values clustered at `threshold`."""
+    h = hashlib.sha256(repr(float(threshold)).encode())
+    for v in sorted(uniques):
+        h.update(b"\x1f")
+        h.update(v.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+class FuzzyClusterCache:
+    """Thread-safe LRU of key → clusters, optionally backed by SQLite."""
+
+    def __init__(self, max_entries: int = FUZZY_CACHE_MAX_ENTRIES, path: str = FUZZY_CACHE_PATH):
+        self._lock    = threading.Lock()
+        self._entries: OrderedDict[str, list[list[str]]] = OrderedDict()
+        self._max     = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits     = 0
+        self.misses   = 0
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fuzzy_clusters "
+                "(key TEXT PRIMARY KEY, clusters TEXT NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"[fuzzy-cache] persistence disabled — {e}")
+            self._db = None
+
+    def get(self, key: str) -> Optional[list[list[str]]]:
+        with self._lock:
+            clusters = self._entries.get(key)
+            if clusters is None and self._db is not None:
+                clusters = self._load(key)
+                if clusters is not None:
+                    self._remember(key, clusters)
+            if clusters is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return clusters
+
+    def put(self, key: str, clusters: list[list[str]]) -> None:
+        with self._lock:
+            self._remember(key, clusters)
+            if self._db is not None:
+                self._store(key, clusters)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits":       self.hits,
+                "misses":     self.misses,
+                "hit_rate":   round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries":    len(self._entries),
+                "persistent": self._db is not None,
+            }
+
+    # ── Internals (call while holding lock) ──
+
+    def _remember(self, key: str, clusters: list[list[str]]) -> None:
+        self._entries[key] = clusters
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[list[list[str]]]:
+        try:
+            row = self._db.execute(
+                "SELECT clusters FROM fuzzy_clusters WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE fuzzy_clusters SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"[fuzzy-cache] read failed — {e}")
+            return None
+
+    def _store(self, key: str, clusters: list[list[str]]) -> None:
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fuzzy_clusters (key, clusters, used_at) VALUES (?, ?, ?)",
+                (key, json.dumps(clusters), time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM fuzzy_clusters WHERE key NOT IN "
+                "(SELECT key FROM fuzzy_clusters ORDER BY used_at DESC LIMIT ?)",
+                (FUZZY_CACHE_MAX_PERSISTED,),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"[fuzzy-cache] write failed — {e}")
+
+
+# Singleton — shared by every engine in the process
+FUZZY_CLUSTER_CACHE = FuzzyClusterCache()
@@ -0,0 +1,193 @@
+"""
+jobs.py
+=======
+Background cleaning jobs (POST /clean/jobs).
+
+A clean used to finish inside one HTTP request, and Render's proxy
+timeouts killed large ones. A job runs on a thread pool instead; the
+request returns its id at once. Clients poll GET /clean/jobs/{id} or
+follow GET /clean/jobs/{id}/events (SSE).
+
+submit() queues the job with the admission controller (app.admission)
+and raises AdmissionRejected when its lane's queue is full, so the route
+answers 429 instead of piling jobs up. A job takes a thread only once it
+is admitted; the pool has a thread per admission slot, so admitted jobs
+never wait behind queued ones.
+
+Each job keeps every event it emitted, numbered from 0:
+
+  {"type": "status",   "status": "queued" | "running" | "done" | "failed"}
+  {"type": "progress", "stage": ..., "percent": ..., ...}   from the engine
+  {"type": "progress", "stage": "done", "percent": 100}     just before "done"
+
+so a reconnecting stream resumes after the last id it saw. Finished jobs
+are kept for JOB_TTL_SECONDS, at most MAX_JOBS of them.
+
+A job runs in the worker that accepted it. With SESSION_BACKEND=shared,
+jobs_shared.SharedJobStore also writes every job's state, events and
+result to a host-wide SQLite index, so any worker can answer
+GET /clean/jobs/{id} and its event stream; the memory backend keeps jobs
+in this process only, like its sessions.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.admission import ADMISSION, AdmissionController
+from app.metrics import Gauge
+from app.session import SESSION_BACKEND
+
+# ── Config ──
+JOB_TTL_SECONDS = 60 * 60
+MAX_JOBS        = 500
+
+JOBS_BY_STATUS = Gauge(
+    "clean_jobs", "Background cleaning jobs held, by status", ("status",),
+)
+
+
+@dataclass
+class Job:
+    id:          str
+    session_id:  str
+    status:      str = "queued"
+    created:     float = field(default_factory=time.time)
+    finished:    Optional[float] = None
+    progress:    dict[str, Any] = field(default_factory=dict)   # latest engine event
+    events:      list[dict[str, Any]] = field(default_factory=list)
+    result:      Any = None
+    error:       Optional[str] = None
+    error_code:  Optional[int] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id":     self.id,
+            "session_id": self.session_id,
+            "status":     self.status,
+            "progress":   dict(self.progress),
+            "created":    self.created,
+            "finished":   self.finished,
+            "error":      self.error,
+            "error_code": self.error_code,
+        }
+
+
+class JobStore:
+    """Thread-safe registry of jobs plus the pool that runs them, once admitted."""
+
+    def __init__(self, admission: AdmissionController = ADMISSION):
+        self._lock      = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._admission = admission
+        # every admitted run may be a job: at most one per shared CPU slot, plus the reserved ones
+        self._executor  = ThreadPoolExecutor(max_workers=admission.cpu_slots + admission.reserved_slots,
+                                             thread_name_prefix="clean-job")
+
+    def submit(self, session_id: str, work: Callable[[Callable[[dict], None]], Any],
+               memory: int = 0, cpu: int = 1, lane: str = "bulk", owner: str = "") -> Job:
+        """
+        Queue `work(progress)` for admission with `memory`, `cpu`, `lane` and
+        `owner` (see AdmissionController.admit); its return value becomes the
+        job's result. An HTTPException it raises keeps its status code and
+        detail. Raises AdmissionRejected, registering no job, if the queue is full.
+        """
+        job = Job(id=secrets.token_urlsafe(12), session_id=session_id)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            self._set_status(job, "queued")
+        try:
+            self._admission.admit_later(
+                lambda release: self._executor.submit(self._run, job, work, release),
+                memory, cpu, lane=lane, owner=owner,
+            )
+        except Exception:
+            with self._lock:
+                self._forget(job)
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def events(self, job: Job, after: int) -> tuple[list[tuple[int, dict]], bool]:
+        """(id, event) pairs after id `after`, and whether the job has finished."""
+        with self._lock:
+            start = max(0, after + 1)
+            return list(enumerate(job.events[start:], start)), job.finished is not None
+
+    def _run(self, job: Job, work: Callable, release: Callable[[], None]) -> None:
+        with self._lock:
+            self._set_status(job, "running")
+        try:
+            try:
+                result = work(lambda event: self._progress(job, event))
+            finally:
+                release()    # before the job reads as finished
+        except HTTPException as e:
+            self._finish(job, "failed", error=str(e.detail), error_code=e.status_code)
+        except Exception as e:
+            self._finish(job, "failed", error=f"Engine error: {e}", error_code=500)
+        else:
+            # A cached result emits no engine progress, and the engine stops at 95%
+            self._progress(job, {"stage": "done", "percent": 100})
+            self._finish(job, "done", result=result)
+
+    def _progress(self, job: Job, event: dict) -> None:
+        with self._lock:
+            job.progress = event
+            self._record(job, {"type": "progress", **event})
+
+    def _finish(self, job: Job, status: str, **fields) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.finished = time.time()
+            self._set_status(job, status)
+
+    # ── Internals (call while holding lock) ──
+
+    def _set_status(self, job: Job, status: str) -> None:
+        if job.events:      # not the initial "queued"
+            JOBS_BY_STATUS.dec(job.status)
+        JOBS_BY_STATUS.inc(status)
+        job.status = status
+        self._record(job, {"type": "status", "status": status})
+
+    def _record(self, job: Job, event: dict) -> None:
+        """Append an event once the job's fields reflect it."""
+        job.events.append(event)
+
+    def _forget(self, job: Job) -> None:
+        del self._jobs[job.id]
+        JOBS_BY_STATUS.dec(job.status)
+
+    def _prune(self) -> None:
+        """Drop finished jobs past their TTL, then the oldest finished ones beyond MAX_JOBS."""
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j.finished is not None]
+        excess = len(self._jobs) - MAX_JOBS + 1
+        for job in finished:
+            if now - job.finished > JOB_TTL_SECONDS or excess > 0:
+                excess -= 1
+                self._forget(job)
+
+
+def create_job_store(backend: str = SESSION_BACKEND) -> JobStore:
+    """Job store matching the session backend: jobs are visible wherever their sessions are."""
+    if backend == "shared":
+        from app.jobs_shared import SharedJobStore
+        return SharedJobStore()
+    return JobStore()
+
+
+# Process-wide job registry
+JOBS = create_job_store()
@@ -0,0 +1,144 @@
+"""
+jobs_shared.py
+==============
+Job store shared by every worker process on a host
+(SESSION_BACKEND=shared, alongside session_shared.SharedSessionStore).
+
+With several uvicorn workers, POST /clean/jobs handled by one worker
+404'd on GET /clean/jobs/{id} when the poll landed on another. A job
+still runs in the worker that accepted it (its thread, admission slot and
+progress callback are local), but SharedJobStore writes its state to
+
+  <SESSION_SHARED_DIR>/jobs.sqlite    jobs        one row per job: status,
+                                                  latest progress, error,
+                                                  JSON result once done
+                                      job_events  every event, numbered
+                                                  as in Job.events
+
+as it changes, and reads jobs other workers own from there. Finished
+jobs are pruned by JOB_TTL_SECONDS and MAX_JOBS across the host; so is a
+job left unfinished JOB_TTL_SECONDS after its creation, which is how
+jobs of a worker that died disappear.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.admission import ADMISSION, AdmissionController
+from app.jobs import JOB_TTL_SECONDS, MAX_JOBS, Job, JobStore
+from app.session_shared import SESSION_SHARED_DIR, SQLITE_BUSY_TIMEOUT_S
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id     TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    created    REAL NOT NULL,
+    finished   REAL,
+    progress   TEXT NOT NULL DEFAULT '{}',
+    error      TEXT,
+    error_code INTEGER,
+    result     TEXT
+);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT    NOT NULL,
+    seq    INTEGER NOT NULL,
+    event  TEXT    NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+
+class SharedJobStore(JobStore):
+    """Jobs run by this worker, with every job's state in a host-wide SQLite index."""
+
+    def __init__(self, root: str = SESSION_SHARED_DIR, admission: AdmissionController = ADMISSION):
+        super().__init__(admission)
+        os.makedirs(root, exist_ok=True)
+        # used only while holding self._lock
+        self._db = sqlite3.connect(os.path.join(root, "jobs.sqlite"), timeout=SQLITE_BUSY_TIMEOUT_S,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")    # one commit per progress event
+        self._db.executescript(_SCHEMA)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """This worker's job, or a snapshot of another worker's from the index."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row["job_id"], session_id=row["session_id"], status=row["status"],
+            created=row["created"], finished=row["finished"], progress=json.loads(row["progress"]),
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"], error_code=row["error_code"],
+        )
+
+    def events(self, job: Job, after: int) -> tuple[list[tuple[int, dict]], bool]:
+        with self._lock:
+            local = self._jobs.get(job.id) is job
+        if local:
+            return super().events(job, after)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job.id, after),
+            ).fetchall()
+            row = self._db.execute("SELECT finished FROM jobs WHERE job_id = ?", (job.id,)).fetchone()
+        # a job pruned meanwhile has finished too
+        return [(r["seq"], json.loads(r["event"])) for r in rows], row is None or row["finished"] is not None
+
+    # ── Internals (call while holding lock) ──
+
+    def _record(self, job: Job, event: dict) -> None:
+        super()._record(job, event)
+        result = json.dumps(jsonable_encoder(job.result), default=str) if job.result is not None else None
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(job_id, session_id, status, created, finished, progress, error, error_code, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.session_id, job.status, job.created, job.finished,
+                 json.dumps(job.progress, default=str), job.error, job.error_code, result),
+            )
+            self._db.execute("INSERT INTO job_events (job_id, seq, event) VALUES (?, ?, ?)",
+                             (job.id, len(job.events) - 1, json.dumps(event, default=str)))
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _forget(self, job: Job) -> None:
+        super()._forget(job)
+        self._delete("job_id = ?", (job.id,))
+
+    def _prune(self) -> None:
+        super()._prune()
+        cutoff = time.time() - JOB_TTL_SECONDS
+        self._delete(
+            "COALESCE(finished, created) < ? OR job_id IN (SELECT job_id FROM jobs "
+            "WHERE finished IS NOT NULL ORDER BY finished DESC LIMIT -1 OFFSET ?)",
+            (cutoff, MAX_JOBS - 1),
+        )
+
+    def _delete(self, where: str, params: tuple) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            doomed = [r["job_id"] for r in self._db.execute(f"SELECT job_id FROM jobs WHERE {where}", params)]
+            self._db.executemany("DELETE FROM job_events WHERE job_id = ?", [(j,) for j in doomed])
+            self._db.executemany("DELETE FROM jobs WHERE job_id = ?", [(j,) for j in doomed])
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
@@ -0,0 +1,361 @@
+"""
+metrics.py
+==========
+Prometheus metrics for the API, served as text by GET /metrics.
+
+A small dependency-free implementation of counters, gauges and
+histograms in the Prometheus text exposition format (0.0.4). Recording a
+sample is a dict lookup and an increment under a per-metric lock, so the
+hot path stays negligible. Values that are expensive to compute (session
+store size) are read by callbacks only when /metrics is scraped.
+
+What is exported:
+  - http_request_duration_seconds     per router / method / status class
+                                      (MetricsMiddleware)
+  - engine_run_duration_seconds       per mode (memory / stream)
+  - engine_stage_duration_seconds     per engine stage, from the run's timings
+  - engine_rows/columns_processed_total, engine_run_seconds_total
+                                      and the last run's rows/columns per second
+  - session_store_entries / _bytes    entry count and approximate bytes held
+  - supabase_request_duration_seconds / supabase_request_failures_total
+                                      every call made through supabase_http or
+                                      supabase_async_client()
+  - clean_jobs_in_flight              cleaning requests currently running
+  - result_cache_* / upload_parses_total
+                                      registered by app.result_cache
+
+Metrics are per process; with several workers, scrape each one.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import httpx
+
+# ── Config ──
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ENGINE_BUCKETS  = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name   = name
+        self.help   = help
+        self.labels = labels
+        self._lock  = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, values: tuple) -> tuple[str, ...]:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {values}")
+        return tuple(str(v) for v in values)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, *labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    @contextmanager
+    def track(self, *labels) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+    def samples(self) -> list[str]:
+        if self._callback is not None:
+            return [f"{self.name} {_number(self._callback())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations, with _sum and _count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values → [per-bucket counts (last = +Inf), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            running = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                running += n
+                le = _labels(self.labels, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+# Every metric registers itself here on construction
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text format."""
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+# ─────────────────────────────────────────────
+# HTTP requests
+# ─────────────────────────────────────────────
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by router",
+    ("router", "method", "status"),
+)
+
+
+def _router_label(scope: dict) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    tags = getattr(route, "tags", None)
+    if tags:
+        return str(tags[0])
+    return getattr(route, "path", "/").strip("/").split("/")[0] or "root"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request (no request/response copies)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start  = time.perf_counter()
+        status = [500]
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start, _router_label(scope),
+                                 scope.get("method", ""), f"{status[0] // 100}xx")
+
+
+# ─────────────────────────────────────────────
+# Engine runs
+# ─────────────────────────────────────────────
+
+ENGINE_RUN_SECONDS = Histogram(
+    "engine_run_duration_seconds", "Cleaning run duration", ("mode",), ENGINE_BUCKETS,
+)
+ENGINE_STAGE_SECONDS = Histogram(
+    "engine_stage_duration_seconds", "Engine stage duration", ("stage",), ENGINE_BUCKETS,
+)
+ENGINE_ROWS = Counter(
+    "engine_rows_processed_total", "Input rows processed by cleaning runs", ("mode",),
+)
+ENGINE_COLUMNS = Counter(
+    "engine_columns_processed_total", "Input columns processed by cleaning runs", ("mode",),
+)
+ENGINE_SECONDS = Counter(
+    "engine_run_seconds_total", "Wall time spent in cleaning runs", ("mode",),
+)
+ENGINE_ROWS_PER_SECOND = Gauge(
+    "engine_last_run_rows_per_second", "Rows per second of the last cleaning run", ("mode",),
+)
+ENGINE_COLUMNS_PER_SECOND = Gauge(
+    "engine_last_run_columns_per_second", "Columns per second of the last cleaning run", ("mode",),
+)
+CLEAN_IN_FLIGHT = Gauge(
+    "clean_jobs_in_flight", "Cleaning requests currently running", ("endpoint",),
+)
+
+
+def observe_engine_run(mode: str, seconds: float, rows: int, columns: int,
+                       stages: list[dict] = ()) -> None:
+    """Record one cleaning run; `stages` are the entries of its timings section."""
+    ENGINE_RUN_SECONDS.observe(seconds, mode)
+    ENGINE_ROWS.inc(mode, amount=rows)
+    ENGINE_COLUMNS.inc(mode, amount=columns)
+    ENGINE_SECONDS.inc(mode, amount=seconds)
+    if seconds > 0:
+        ENGINE_ROWS_PER_SECOND.set(rows / seconds, mode)
+        ENGINE_COLUMNS_PER_SECOND.set(columns / seconds, mode)
+    for stage in stages:
+        ENGINE_STAGE_SECONDS.observe(stage["wall_seconds"], stage["stage"])
+
+
+def observe_session_store(store) -> None:
+    """Export the size of `store` (a SessionStore), read at scrape time."""
+    Gauge("session_store_entries", "Sessions held in the session store",
+          callback=lambda: store.stats()["entries"])
+    Gauge("session_store_bytes", "Approximate bytes held by the session store",
+          callback=lambda: store.stats()["bytes"])
+
+
+# ─────────────────────────────────────────────
+# Supabase calls
+# ─────────────────────────────────────────────
+
+SUPABASE_LATENCY = Histogram(
+    "supabase_request_duration_seconds", "Supabase call latency", ("endpoint", "method"),
+)
+SUPABASE_FAILURES = Counter(
+    "supabase_request_failures_total", "Supabase calls that raised or returned an HTTP error",
+    ("endpoint", "reason"),
+)
+
+
+def _endpoint_label(url: httpx.URL) -> str:
+    # /rest/v1/reports → rest/reports, /auth/v1/user → auth/user
+    parts = [p for p in url.path.strip("/").split("/")[:3] if not re.fullmatch(r"v\d+", p)]
+    return "/".join(parts) or "root"
+
+
+def _record_supabase(request: httpx.Request, start: float,
+                     response: Optional[httpx.Response]) -> None:
+    endpoint = _endpoint_label(request.url)
+    SUPABASE_LATENCY.observe(time.perf_counter() - start, endpoint, request.method)
+    if response is None:
+        SUPABASE_FAILURES.inc(endpoint, "error")
+    elif response.status_code >= 400:
+        SUPABASE_FAILURES.inc(endpoint, f"http_{response.status_code // 100}xx")
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    def __init__(self):
+        self._inner = httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start, response = time.perf_counter(), None
+        try:
+            response = self._inner.handle_request(request)
+            return response
+        finally:
+            _record_supabase(request, start, response)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _MeteredAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start, response = time.perf_counter(), None
+        try:
+            response = await self._inner.handle_async_request(request)
+            return response
+        finally:
+            _record_supabase(request, start, response)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+# Shared, pooled client for synchronous Supabase calls (same defaults as httpx.get)
+supabase_http = httpx.Client(transport=_MeteredTransport())
+
+
+def supabase_async_client(**kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient whose calls are recorded as Supabase metrics."""
+    return httpx.AsyncClient(transport=_MeteredAsyncTransport(), **kwargs)
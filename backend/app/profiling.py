@@ -0,0 +1,229 @@
+"""
+profiling.py
+============
+Per-column profile shared by every engine stage.
+
+A ColumnProfile wraps one column snapshot and computes its statistics
+lazily, each at most once: null/distinct counts, top-k frequencies, a
+sample, and the pattern flags the engine keys decisions on (free text,
+integer row key). Almost everything derives from a single value_counts
+pass, so cost scales with cardinality after the first hash pass.
+
+Numeric columns also carry NumericStats (quantiles, moments, min/max,
+null count) from numeric_stats(), a kernel that reduces a whole 2D block
+of columns at once. Imputation, outlier detection, capping and the EDA
+summary all read these instead of calling pandas reductions one by one.
+
+The engine keeps one profile per column and drops it only when a stage
+actually mutates that column (or the row set), see
+EnterpriseDataEngine._set_column.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .utils import FREE_TEXT_UNIQUE_RATIO, FREE_TEXT_AVG_WORDS
+
+# A column needs at least this many non-null values before "all-unique
+# integers" is trusted as a row-key signal — small tables make Age or
+# Score look unique by chance.
+ROW_KEY_MIN_ROWS = 50
+
+
+@dataclass
+class NumericStats:
+    """Summary statistics of one numeric column, NaN-skipping like pandas."""
+    count:      int
+    null_count: int
+    mean:       float
+    std:        float     # ddof=1
+    min:        float
+    q1:         float
+    median:     float
+    q3:         float
+    max:        float
+    skew:       float     # bias-corrected, as Series.skew()
+    kurt:       float     # bias-corrected excess kurtosis, as Series.kurt()
+
+    def describe(self) -> dict:
+        """Same keys and values as Series.describe() on a numeric column."""
+        return {
+            "count": float(self.count), "mean": self.mean, "std": self.std,
+            "min": self.min, "25%": self.q1, "50%": self.median,
+            "75%": self.q3, "max": self.max,
+        }
+
+
+def _zero_fperr(values: np.ndarray) -> np.ndarray:
+    # pandas treats |x| < 1e-14 as zero in skew/kurt to absorb rounding noise
+    return np.where(np.abs(values) < 1e-14, 0.0, values)
+
+
+def numeric_stats(block: np.ndarray) -> list[NumericStats]:
+    """
+    Stats for every column of a 2D float64 block (rows x columns, NaN =
+    missing) in one vectorised pass. Formulas follow pandas' nanops so
+    results agree with describe(), skew() and kurt().
+    """
+    block = np.asarray(block, dtype="float64")
+    if block.ndim == 1:
+        block = block.reshape(-1, 1)
+    mask  = np.isnan(block)
+    count = (~mask).sum(axis=0).astype("float64")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean  = np.where(mask, 0.0, block).sum(axis=0) / count
+        dev   = np.where(mask, 0.0, block - mean)
+        dev2  = dev ** 2
+        m2    = dev2.sum(axis=0)
+        m3    = (dev2 * dev).sum(axis=0)
+        m4    = (dev2 ** 2).sum(axis=0)
+        std   = np.sqrt(m2 / (count - 1))
+        std[count < 2] = np.nan
+
+        m2z  = _zero_fperr(m2)
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (_zero_fperr(m3) / m2z ** 1.5)
+        skew = np.where(m2z == 0, 0.0, skew)
+        skew[count < 3] = np.nan
+
+        numer = _zero_fperr(count * (count + 1) * (count - 1) * m4)
+        denom = _zero_fperr((count - 2) * (count - 3) * m2 ** 2)
+        kurt  = numer / denom - 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        kurt  = np.where(denom == 0, 0.0, kurt)
+        kurt[count < 4] = np.nan
+
+    # All-NaN columns stay NaN without tripping numpy's empty-slice warnings
+    width  = block.shape[1]
+    quants = np.full((3, width), np.nan)
+    lo     = np.full(width, np.nan)
+    hi     = np.full(width, np.nan)
+    seen   = count > 0
+    if seen.any():
+        filled = block[:, seen]
+        quants[:, seen] = np.nanquantile(filled, [0.25, 0.5, 0.75], axis=0)
+        lo[seen] = np.nanmin(filled, axis=0)
+        hi[seen] = np.nanmax(filled, axis=0)
+
+    n_rows = block.shape[0]
+    return [
+        NumericStats(
+            count=int(count[k]), null_count=n_rows - int(count[k]),
+            mean=float(mean[k]), std=float(std[k]),
+            min=float(lo[k]), q1=float(quants[0, k]), median=float(quants[1, k]),
+            q3=float(quants[2, k]), max=float(hi[k]),
+            skew=float(skew[k]), kurt=float(kurt[k]),
+        )
+        for k in range(width)
+    ]
+
+
+class ColumnProfile:
+    """Lazily computed, cached statistics of one column snapshot."""
+
+    def __init__(self, series: pd.Series, sample_size: int = 1000):
+        self._series     = series
+        self.sample_size = sample_size
+
+    @cached_property
+    def value_counts(self) -> pd.Series:
+        """Full value_counts(dropna=False) — the one hash pass everything derives from."""
+        return self._series.value_counts(dropna=False)
+
+    @cached_property
+    def _non_null_counts(self) -> pd.Series:
+        # Categoricals list unused categories with a zero count — skip those
+        vc = self.value_counts
+        return vc[vc.index.notna() & (vc.to_numpy() > 0)]
+
+    @property
+    def n_rows(self) -> int:
+        return len(self._series)
+
+    @cached_property
+    def non_null_count(self) -> int:
+        return int(self._non_null_counts.sum())
+
+    @property
+    def null_count(self) -> int:
+        return self.n_rows - self.non_null_count
+
+    @cached_property
+    def distinct_count(self) -> int:
+        """Distinct non-null values (same as Series.nunique())."""
+        return len(self._non_null_counts)
+
+    def top_k(self, k: int = 10) -> pd.Series:
+        """Most frequent values including NaN, as value_counts(dropna=False).head(k)."""
+        return self.value_counts.head(k)
+
+    @cached_property
+    def top_freq(self) -> float:
+        """Share of non-null rows taken by the most frequent non-null value."""
+        if not self.non_null_count:
+            return 0.0
+        return float(self._non_null_counts.iloc[0]) / self.non_null_count
+
+    @cached_property
+    def numeric(self) -> NumericStats:
+        """NumericStats of a numeric column (the engine may prime this in batch)."""
+        return numeric_stats(self._series.to_numpy(dtype="float64", na_value=np.nan))[0]
+
+    @property
+    def has_numeric(self) -> bool:
+        return "numeric" in self.__dict__
+
+    @cached_property
+    def sample(self) -> pd.Series:
+        """Seeded random sample of up to sample_size non-null values."""
+        non_null = self._series.dropna()
+        if len(non_null) <= self.sample_size:
+            return non_null
+        return non_null.sample(self.sample_size, random_state=42)
+
+    # ── Pattern flags ──────────────────────────────────────────
+
+    @cached_property
+    def unique_ratio(self) -> float:
+        return self.distinct_count / self.non_null_count if self.non_null_count else 0.0
+
+    @cached_property
+    def avg_words(self) -> float:
+        """Mean whitespace-separated word count per non-null row."""
+        counts = self._non_null_counts
+        if counts.empty:
+            return 0.0
+        words = counts.index.astype(str).str.split().str.len().to_numpy()
+        return float((words * counts.to_numpy()).sum() / self.non_null_count)
+
+    @cached_property
+    def is_free_text(self) -> bool:
+        """Same rule as utils.is_free_text_column, from cached counts."""
+        return (
+            self.non_null_count > 0
+            and self.unique_ratio > FREE_TEXT_UNIQUE_RATIO
+            and self.avg_words > FREE_TEXT_AVG_WORDS
+        )
+
+    @cached_property
+    def is_integer_row_key(self) -> bool:
+        """
+        All non-null values are distinct integers (e.g. FIFA ID: 158023,
+        20801) in a column large enough for that to mean something.
+        """
+        if self.non_null_count < ROW_KEY_MIN_ROWS:
+            return False
+        # Any repeated raw value rules it out without parsing a single row
+        if self.distinct_count != self.non_null_count:
+            return False
+        try:
+            as_num = pd.to_numeric(self._series.dropna(), errors="coerce")
+            if not as_num.notna().all():
+                return False
+            all_integers = (as_num == as_num.round()).all()
+            all_unique   = as_num.nunique() == len(as_num)
+            return bool(all_integers and all_unique)
+        except Exception:
+            return False
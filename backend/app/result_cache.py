@@ -0,0 +1,229 @@
+"""
+result_cache.py
+===============
+Reuse of parsed uploads and engine results across sessions.
+
+The same bytes reach the API again and again — a re-upload in a new tab,
+a retry after a timeout, a teammate cleaning the same export — and each
+time they were parsed again and the whole engine ran again with the same
+options.
+
+Uploads are content-hashed (content_hash: SHA-256 of the bytes and the
+extension that picks the parser) and the hash is saved with the session:
+
+  PARSED_FRAMES  content hash → parsed DataFrame, held weakly while a
+                 session keeps it. An identical upload skips parsing and
+                 shares the frame; the engine never mutates its input.
+  RESULT_CACHE   (content hash, normalised CleaningConfig) → engine
+                 result, LRU bounded by RESULT_CACHE_MAX_ENTRIES and
+                 RESULT_CACHE_MAX_MB of cleaned frames. clean_data and
+                 report._get_result look here before running the engine;
+                 concurrent misses on one key run it once.
+
+Cached frames are held through session.FRAME_LEDGER, so they count
+against SESSION_MEMORY_BUDGET_MB once, together with the sessions that
+share them — RESULT_CACHE_MAX_MB caps the cache's share of that budget,
+it doesn't add to it. Inserting evicts the oldest entries while the
+ledger is over the budget. When the session store demotes a session, the
+cache drops the entry holding the same frame, so the frame is freed.
+
+config_key() ignores options that change how the engine runs but not
+what it returns (column workers, pool type, lean_memory). Cached results
+are shared by every session that hits them and are read-only. Hit rates
+are exported on /metrics and /health. Both caches are per process.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+from app.metrics import Counter, Gauge
+from app.session import FRAME_LEDGER, SESSION_MEMORY_BUDGET_BYTES, frame_bytes
+
+# ── Config ──
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "32"))   # 0 = disabled
+RESULT_CACHE_MAX_MB      = int(os.getenv("RESULT_CACHE_MAX_MB", "512"))
+RESULT_CACHE_MAX_BYTES   = RESULT_CACHE_MAX_MB * 1024 * 1024
+
+# CleaningConfig fields that don't change the engine's output
+_EXECUTION_FIELDS = ("column_workers", "column_parallel_backend", "lean_memory")
+
+UPLOAD_PARSES = Counter(
+    "upload_parses_total", "Uploads parsed, or served from an identical upload's frame",
+    ("outcome",),
+)
+RESULT_CACHE_LOOKUPS = Counter(
+    "result_cache_lookups_total", "Engine result cache lookups", ("outcome",),
+)
+
+
+def content_hash(contents: bytes, filename: str) -> str:
+    """Hash of an upload: its bytes and the extension that selects the parser."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    digest = hashlib.sha256(contents)
+    digest.update(b"\0" + ext.encode())
+    return digest.hexdigest()
+
+
+def config_key(config) -> str:
+    """Normalised CleaningConfig: every field that affects the output, hashed."""
+    fields = dataclasses.asdict(config)
+    for name in _EXECUTION_FIELDS:
+        fields.pop(name, None)
+    blob = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+class ParsedFrames:
+    """Content hash → parsed DataFrame, alive only while a session references it."""
+
+    def __init__(self):
+        self._lock   = threading.Lock()
+        self._frames: weakref.WeakValueDictionary[str, pd.DataFrame] = weakref.WeakValueDictionary()
+        self.shared  = 0
+        self.parsed  = 0
+
+    def get_or_parse(self, key: str, parse: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            df = self._frames.get(key)
+            if df is not None:
+                self.shared += 1
+        if df is not None:
+            UPLOAD_PARSES.inc("shared")
+            return df
+        df = parse()
+        with self._lock:
+            self.parsed += 1
+            self._frames[key] = df
+        UPLOAD_PARSES.inc("parsed")
+        return df
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"shared": self.shared, "parsed": self.parsed, "live": len(self._frames)}
+
+
+class ResultCache:
+    """Thread-safe LRU of (content hash, config key) → engine result, bounded in entries and bytes."""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 memory_budget: int = SESSION_MEMORY_BUDGET_BYTES):
+        self._lock      = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[dict, int]] = OrderedDict()
+        self._pending: dict[tuple[str, str], threading.Event] = {}   # keys being computed
+        self._by_frame: dict[int, tuple[str, str]] = {}               # id(cleaned frame) → key
+        self._max       = max_entries
+        self._max_bytes = max_bytes
+        self._budget    = memory_budget     # shared with the session store, via FRAME_LEDGER
+        self.bytes      = 0
+        self.hits       = 0
+        self.misses     = 0
+
+    def get_or_run(self, content_hash: str, config, run: Callable[[], dict]) -> dict:
+        """
+        Cached result for this upload and config, or run() stored under it.
+        While one caller runs a key, others asking for it wait for its result.
+        """
+        if not content_hash or self._max <= 0:
+            return run()
+        key = (content_hash, config_key(config))
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    break
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            pending.wait()   # then retry — a failed or uncacheable run leaves no entry
+        if entry is not None:
+            RESULT_CACHE_LOOKUPS.inc("hit")
+            return entry[0]
+
+        RESULT_CACHE_LOOKUPS.inc("miss")
+        try:
+            result = run()
+            self._put(key, result)
+            return result
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def _put(self, key: tuple[str, str], result: dict) -> None:
+        frame = result.get("cleaned_dataframe")
+        size  = frame_bytes(frame)
+        if size > self._max_bytes:
+            return
+        FRAME_LEDGER.hold(frame, size)
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                evicted.append(self._pop(key))
+            self._entries[key] = (result, size)
+            if frame is not None:
+                self._by_frame[id(frame)] = key
+            self.bytes += size
+            while len(self._entries) > self._max or self.bytes > self._max_bytes:
+                evicted.append(self._pop(next(iter(self._entries))))
+        for old in evicted:
+            FRAME_LEDGER.release(old)
+        while FRAME_LEDGER.bytes > self._budget:    # yield to sessions, oldest entries first
+            with self._lock:
+                if len(self._entries) <= 1:
+                    return
+                old = self._pop(next(iter(self._entries)))
+            FRAME_LEDGER.release(old)
+
+    def reclaim(self, frame) -> None:
+        """Drop the entry holding `frame` (FRAME_LEDGER reclaimer, called when a session is demoted)."""
+        with self._lock:
+            key = self._by_frame.get(id(frame))
+            if key is None:
+                return
+            frame = self._pop(key)
+        FRAME_LEDGER.release(frame)
+
+    def _pop(self, key: tuple[str, str]):
+        """Remove an entry; returns its frame for FRAME_LEDGER.release. Call while holding lock."""
+        result, size = self._entries.pop(key)
+        frame = result.get("cleaned_dataframe")
+        if frame is not None and self._by_frame.get(id(frame)) == key:
+            del self._by_frame[id(frame)]
+        self.bytes -= size
+        return frame
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits":     self.hits,
+                "misses":   self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries":  len(self._entries),
+                "bytes":    self.bytes,
+            }
+
+
+# Process-wide singletons
+PARSED_FRAMES = ParsedFrames()
+RESULT_CACHE  = ResultCache()
+FRAME_LEDGER.add_reclaimer(RESULT_CACHE.reclaim)
+
+Gauge("result_cache_entries", "Engine results held by the result cache",
+      callback=lambda: RESULT_CACHE.stats()["entries"])
+Gauge("result_cache_bytes", "Approximate bytes of cleaned frames held by the result cache",
+      callback=lambda: RESULT_CACHE.stats()["bytes"])
+Gauge("result_cache_hit_ratio", "Share of result cache lookups served from the cache",
+      callback=lambda: RESULT_CACHE.stats()["hit_rate"])
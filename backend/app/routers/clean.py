@@ -2,23 +2,61 @@
 routers/clean.py
 ================
 Runs the EnterpriseDataEngine on an uploaded file and returns
-the full cleaning result as JSON.
+the cleaning result as JSON.
+
+Large frames are cleaned in the engine process pool (app.engine_pool),
+so a long run doesn't hold the GIL of this worker. Runs are admitted
+against memory and CPU budgets (app.admission), small frames in a fast
+lane of their own and at most a few runs per user at once; when the
+server is saturated the endpoints answer 429 with Retry-After.
+
+POST /clean/jobs runs the same clean in the background (app.jobs) and
+returns a job id at once; GET /clean/jobs/{id} returns its status and,
+once done, the CleaningResponse. GET /clean/jobs/{id}/events streams its
+status and engine progress as server-sent events.
+
+Results are shared across sessions that uploaded the same bytes and
+clean with the same options (app.result_cache.RESULT_CACHE).
+
+Only the first `preview_rows` cleaned rows are serialised in the /clean
+response. Later windows are served on demand by GET /clean/rows from the
+result cached in the session store.
+
+Files uploaded through /upload/large are cleaned out of core by
+POST /clean/stream (app.streaming.StreamingCleaner), a job like
+/clean/jobs admitted with the cleaner's memory estimate; their cleaned
+CSV stays on disk and /clean/rows reads windows straight from it.
 """
 
 import os
 import math
+import time
 import secrets
 import io
+import json
+import asyncio
 import pandas as pd
-import httpx
-from fastapi import APIRouter, HTTPException, Query, Request
-from app.engine import EnterpriseDataEngine
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.admission import AdmissionRejected
+from app.engine_pool import run_admission, run_engine
+from app.jobs import JOBS
 from app.config import CleaningConfig
-from app.schemas import CleaningResponse
+from app.metrics import CLEAN_IN_FLIGHT, observe_engine_run, supabase_http
+from app.result_cache import RESULT_CACHE
+from app.schemas import CleaningResponse, CleanJobResponse, CleanedRowsResponse, StreamCleaningResponse
 from app.session import session_store
+from app.streaming import StreamingCleaner
 
 router = APIRouter(prefix="/clean", tags=["clean"])
 
+PREVIEW_ROWS   = 10     # cleaned rows returned inline by POST /clean
+MAX_PAGE_ROWS  = 1000   # largest window GET /clean/rows will serialise
+FREE_ROW_LIMIT = 500    # rows cleanable without a Pro subscription
+
+JOB_EVENTS_POLL_SECONDS = 0.25   # how often an SSE stream checks its job for new events
+JOB_EVENTS_KEEPALIVE    = 15.0   # seconds between comment lines on an idle stream
+
 SUPABASE_URL         = "https://lisyiprowqxybfttenud.supabase.co"
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
 
@@ -30,7 +68,7 @@ def _get_user(request: Request):
         return None
     token = auth.split(" ", 1)[1].strip()
     try:
-        r = httpx.get(
+        r = supabase_http.get(
             f"{SUPABASE_URL}/auth/v1/user",
             headers={"Authorization": f"Bearer {token}", "apikey": SUPABASE_SERVICE_KEY},
             timeout=8.0,
@@ -47,12 +85,67 @@ def _get_dataframe(session_id: str | None) -> pd.DataFrame:
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id is required.")
     df = session_store.get_df(session_id)
+    if df is None and session_store.get_file(session_id):
+        raise HTTPException(status_code=409,
+            detail="This is a large-file session. Clean it with /clean/stream.")
     if df is None:
         raise HTTPException(status_code=404,
             detail=f"Session '{session_id}' not found or expired. Please re-upload your file.")
     return df
 
 
+def _require_pro(request: Request) -> dict:
+    """Raise 403 unless the caller has an active Pro subscription; returns the user."""
+    user = _get_user(request)
+    if not user:
+        raise HTTPException(status_code=403,
+            detail=f"Free tier limit is {FREE_ROW_LIMIT} rows. Sign in and upgrade to Pro.")
+    user_id = user.get("sub", "")
+    r = supabase_http.get(
+        f"{SUPABASE_URL}/rest/v1/subscriptions",
+        params={"user_id": f"eq.{user_id}", "select": "status,current_period_end"},
+        headers={"apikey": SUPABASE_SERVICE_KEY,
+                 "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}"},
+    )
+    rows_data = r.json() if r.status_code == 200 else []
+    is_active = False
+    if rows_data:
+        from datetime import datetime, timezone
+        sub = rows_data[0]
+        if sub.get("status") == "active":
+            period_end = sub.get("current_period_end")
+            if period_end:
+                is_active = datetime.fromisoformat(period_end) > datetime.now(timezone.utc)
+            else:
+                is_active = True
+    if not is_active:
+        raise HTTPException(status_code=403,
+            detail=f"Free tier limit is {FREE_ROW_LIMIT} rows. Upgrade to Pro.")
+    return user
+
+
+def _owner(request: Request, user: dict | None) -> str:
+    """Who a run counts against for ADMISSION_USER_MAX_RUNS: the user, else the client address."""
+    if user and user.get("sub"):
+        return f"user:{user['sub']}"
+    return f"ip:{request.client.host}" if request.client else ""
+
+
+def _build_config(
+    outlier_method, outlier_action, outlier_iqr_multiplier, outlier_zscore_threshold,
+    impute_numeric_strategy, impute_categorical_strategy, missing_drop_threshold,
+) -> CleaningConfig:
+    config = CleaningConfig()
+    if outlier_method:              config.outlier_method = outlier_method
+    if outlier_action:              config.outlier_action = outlier_action
+    if outlier_iqr_multiplier:      config.outlier_iqr_multiplier = outlier_iqr_multiplier
+    if outlier_zscore_threshold:    config.outlier_zscore_threshold = outlier_zscore_threshold
+    if impute_numeric_strategy:     config.impute_numeric_strategy = impute_numeric_strategy
+    if impute_categorical_strategy: config.impute_categorical_strategy = impute_categorical_strategy
+    if missing_drop_threshold:      config.missing_drop_threshold = missing_drop_threshold
+    return config
+
+
 def _safe_val(v):
     """Convert a single value to JSON-serialisable type."""
     if v is None:
@@ -80,83 +173,29 @@ def _safe_rows(rows):
     return [{k: _safe_val(v) for k, v in row.items()} for row in rows]
 
 
-@router.post("/", response_model=CleaningResponse)
-def clean_data(
-    request: Request,
-    session_id: str | None = Query(default=None),
-    outlier_method:              str   | None = Query(default=None, enum=["iqr", "zscore"]),
-    outlier_action:              str   | None = Query(default=None, enum=["flag", "cap", "remove", "none"]),
-    outlier_iqr_multiplier:      float | None = Query(default=None, ge=0.5, le=10.0),
-    outlier_zscore_threshold:    float | None = Query(default=None, ge=1.0, le=10.0),
-    impute_numeric_strategy:     str   | None = Query(default=None, enum=["median", "mean", "zero"]),
-    impute_categorical_strategy: str   | None = Query(default=None, enum=["mode", "none"]),
-    missing_drop_threshold:      float | None = Query(default=None, ge=0.0, le=1.0),
-):
-    df = _get_dataframe(session_id)
-
-    # ── Row limit enforcement ──
-    FREE_ROW_LIMIT = 500
-    if len(df) > FREE_ROW_LIMIT:
-        user = _get_user(request)
-        if not user:
-            raise HTTPException(status_code=403,
-                detail=f"Free tier limit is {FREE_ROW_LIMIT} rows. Sign in and upgrade to Pro.")
-        user_id = user.get("sub", "")
-        r = httpx.get(
-            f"{SUPABASE_URL}/rest/v1/subscriptions",
-            params={"user_id": f"eq.{user_id}", "select": "status,current_period_end"},
-            headers={"apikey": SUPABASE_SERVICE_KEY,
-                     "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}"},
-        )
-        rows_data = r.json() if r.status_code == 200 else []
-        is_active = False
-        if rows_data:
-            from datetime import datetime, timezone
-            sub = rows_data[0]
-            if sub.get("status") == "active":
-                period_end = sub.get("current_period_end")
-                if period_end:
-                    is_active = datetime.fromisoformat(period_end) > datetime.now(timezone.utc)
-                else:
-                    is_active = True
-        if not is_active:
-            raise HTTPException(status_code=403,
-                detail=f"Free tier limit is {FREE_ROW_LIMIT} rows. Upgrade to Pro.")
-
-    # Snapshot raw data BEFORE engine modifies df
-    raw_preview = df.head(10).copy().to_dict(orient="records")
-
-    config = CleaningConfig()
-    if outlier_method:              config.outlier_method = outlier_method
-    if outlier_action:              config.outlier_action = outlier_action
-    if outlier_iqr_multiplier:      config.outlier_iqr_multiplier = outlier_iqr_multiplier
-    if outlier_zscore_threshold:    config.outlier_zscore_threshold = outlier_zscore_threshold
-    if impute_numeric_strategy:     config.impute_numeric_strategy = impute_numeric_strategy
-    if impute_categorical_strategy: config.impute_categorical_strategy = impute_categorical_strategy
-    if missing_drop_threshold:      config.missing_drop_threshold = missing_drop_threshold
-
-    try:
-        engine = EnterpriseDataEngine(df, config)
-        result = engine.run()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Engine error: {str(e)}")
+def _clean_in_memory(session_id: str, df: pd.DataFrame, config: CleaningConfig, endpoint: str,
+                     owner: str = "", progress=None, admitted: bool = False) -> dict:
+    """Engine result for a session's frame (from the result cache or a run), saved on the session."""
+    def _run() -> dict:
+        with CLEAN_IN_FLIGHT.track(endpoint):
+            return run_engine(df, config, checkpoints=session_store.get_checkpoints(session_id),
+                              progress=progress, owner=owner, admitted=admitted)
 
+    result = RESULT_CACHE.get_or_run(session_store.get_content_hash(session_id), config, _run)
     if session_id:
         session_store.save_result(session_id, result)
+    return result
 
-    cleaned_df = result["cleaned_dataframe"]
-    safe_cleaned = _safe_rows(cleaned_df.to_dict(orient="records"))
-    safe_raw     = _safe_rows(raw_preview)
 
-    # ── Auto-publish permanent report to Supabase ──
-    share_token = None
+def _publish_report(user: dict | None, session_id: str, result: dict) -> str | None:
+    """Auto-publish a permanent report to Supabase; returns its share token, or None."""
+    cleaned_df = result["cleaned_dataframe"]
     try:
-        user = _get_user(request)
         token  = "rpt_" + secrets.token_urlsafe(8)
         buf = io.StringIO()
         cleaned_df.to_csv(buf, index=False)
         csv_str = buf.getvalue()
-        resp = httpx.post(
+        resp = supabase_http.post(
             f"{SUPABASE_URL}/rest/v1/reports",
             json={
                 "token":          token,
@@ -165,6 +204,8 @@ def clean_data(
                 "column_quality": result.get("column_quality_summary", []),
                 "audit_log":      result.get("audit_log", []),
                 "cleaned_shape":  list(cleaned_df.shape),
+                # Overview plus whichever EDA sections exist yet — heavy
+                # sections are computed on demand, see /report/eda
                 "eda_report":     result.get("eda_report", {}),
                 "csv_data":       csv_str,
             },
@@ -177,10 +218,17 @@ def clean_data(
             timeout=8.0,
         )
         if resp.status_code in (200, 201):
-            share_token = token
+            return token
     except Exception:
         pass  # Never block clean result over publish failure
+    return None
 
+
+def _cleaning_response(session_id: str, df: pd.DataFrame, raw_preview: list[dict], result: dict,
+                       share_token: str | None, preview_rows: int) -> CleaningResponse:
+    cleaned_df = result["cleaned_dataframe"]
+    safe_cleaned = _safe_rows(cleaned_df.head(preview_rows).to_dict(orient="records"))
+    safe_raw     = _safe_rows(raw_preview)
     return CleaningResponse(
         session_id=session_id,
         raw_dataframe=safe_raw,
@@ -193,4 +241,240 @@ def clean_data(
         rows_removed=len(df) - len(cleaned_df),
         columns_dropped=len(df.columns) - len(cleaned_df.columns),
         share_token=share_token,
+        preview_rows=len(safe_cleaned),
+        timings=result.get("timings"),
+    )
+
+
+@router.post("/", response_model=CleaningResponse)
+def clean_data(
+    request: Request,
+    session_id: str | None = Query(default=None),
+    outlier_method:              str   | None = Query(default=None, enum=["iqr", "zscore"]),
+    outlier_action:              str   | None = Query(default=None, enum=["flag", "cap", "remove", "none"]),
+    outlier_iqr_multiplier:      float | None = Query(default=None, ge=0.5, le=10.0),
+    outlier_zscore_threshold:    float | None = Query(default=None, ge=1.0, le=10.0),
+    impute_numeric_strategy:     str   | None = Query(default=None, enum=["median", "mean", "zero"]),
+    impute_categorical_strategy: str   | None = Query(default=None, enum=["mode", "none"]),
+    missing_drop_threshold:      float | None = Query(default=None, ge=0.0, le=1.0),
+    preview_rows:                int          = Query(default=PREVIEW_ROWS, ge=0, le=MAX_PAGE_ROWS),
+):
+    df = _get_dataframe(session_id)
+
+    # ── Row limit enforcement ──
+    user = _require_pro(request) if len(df) > FREE_ROW_LIMIT else _get_user(request)
+
+    # Snapshot raw data BEFORE engine modifies df
+    raw_preview = df.head(10).copy().to_dict(orient="records")
+
+    config = _build_config(
+        outlier_method, outlier_action, outlier_iqr_multiplier, outlier_zscore_threshold,
+        impute_numeric_strategy, impute_categorical_strategy, missing_drop_threshold,
+    )
+
+    try:
+        result = _clean_in_memory(session_id, df, config, "clean", owner=_owner(request, user))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Engine error: {str(e)}")
+
+    share_token = _publish_report(user, session_id, result)
+    return _cleaning_response(session_id, df, raw_preview, result, share_token, preview_rows)
+
+
+@router.post("/jobs", response_model=CleanJobResponse, status_code=202)
+def create_clean_job(
+    request: Request,
+    session_id: str | None = Query(default=None),
+    outlier_method:              str   | None = Query(default=None, enum=["iqr", "zscore"]),
+    outlier_action:              str   | None = Query(default=None, enum=["flag", "cap", "remove", "none"]),
+    outlier_iqr_multiplier:      float | None = Query(default=None, ge=0.5, le=10.0),
+    outlier_zscore_threshold:    float | None = Query(default=None, ge=1.0, le=10.0),
+    impute_numeric_strategy:     str   | None = Query(default=None, enum=["median", "mean", "zero"]),
+    impute_categorical_strategy: str   | None = Query(default=None, enum=["mode", "none"]),
+    missing_drop_threshold:      float | None = Query(default=None, ge=0.0, le=1.0),
+    preview_rows:                int          = Query(default=PREVIEW_ROWS, ge=0, le=MAX_PAGE_ROWS),
+):
+    """
+    Same as POST /clean/, run in the background. Returns the job at once;
+    poll GET /clean/jobs/{job_id} or follow GET /clean/jobs/{job_id}/events.
+    Answers 429 with Retry-After when the admission queue is full.
+    """
+    df = _get_dataframe(session_id)
+    # the request is gone by the time the job runs and publishes
+    user  = _require_pro(request) if len(df) > FREE_ROW_LIMIT else _get_user(request)
+    owner = _owner(request, user)
+
+    raw_preview = df.head(10).copy().to_dict(orient="records")
+    config = _build_config(
+        outlier_method, outlier_action, outlier_iqr_multiplier, outlier_zscore_threshold,
+        impute_numeric_strategy, impute_categorical_strategy, missing_drop_threshold,
+    )
+
+    def work(progress) -> CleaningResponse:
+        result = _clean_in_memory(session_id, df, config, "job", owner, progress=progress, admitted=True)
+        share_token = _publish_report(user, session_id, result)
+        return _cleaning_response(session_id, df, raw_preview, result, share_token, preview_rows)
+
+    try:
+        job = JOBS.submit(session_id, work, **run_admission(df, config), owner=owner)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+    return CleanJobResponse(**job.snapshot())
+
+
+def _get_job(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired.")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=CleanJobResponse)
+def get_clean_job(job_id: str):
+    """Status and latest progress of a job; the CleaningResponse once it is done."""
+    job = _get_job(job_id)
+    return CleanJobResponse(**job.snapshot(), result=job.result if job.status == "done" else None)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_clean_job(job_id: str, last_event_id: str | None = Header(default=None)):
+    """
+    Server-sent events of a job: "status" (queued/running/done/failed) and
+    "progress" (engine stage, percent, column n/N). The stream ends once the
+    job has finished; reconnecting with Last-Event-ID resumes after that event.
+    """
+    job = _get_job(job_id)
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+
+    async def events():
+        nonlocal after
+        idle = 0.0
+        while True:
+            batch, finished = JOBS.events(job, after)
+            for event_id, event in batch:
+                yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                after = event_id
+            if finished:
+                return
+            idle = 0.0 if batch else idle + JOB_EVENTS_POLL_SECONDS
+            if idle >= JOB_EVENTS_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.post("/stream", response_model=CleanJobResponse, status_code=202)
+def clean_stream(
+    request: Request,
+    session_id: str | None = Query(default=None),
+    outlier_method:              str   | None = Query(default=None, enum=["iqr", "zscore"]),
+    outlier_action:              str   | None = Query(default=None, enum=["flag", "cap", "remove", "none"]),
+    outlier_iqr_multiplier:      float | None = Query(default=None, ge=0.5, le=10.0),
+    outlier_zscore_threshold:    float | None = Query(default=None, ge=1.0, le=10.0),
+    impute_numeric_strategy:     str   | None = Query(default=None, enum=["median", "mean", "zero"]),
+    impute_categorical_strategy: str   | None = Query(default=None, enum=["mode", "none"]),
+    missing_drop_threshold:      float | None = Query(default=None, ge=0.0, le=1.0),
+    preview_rows:                int          = Query(default=PREVIEW_ROWS, ge=0, le=MAX_PAGE_ROWS),
+):
+    """
+    Clean a file uploaded through /upload/large in two streaming passes
+    with bounded memory, as a background job like POST /clean/jobs; its
+    result is a StreamCleaningResponse. The cleaned CSV is written next to
+    the upload; page through it with GET /clean/rows or download it from
+    /report/csv. Answers 429 with Retry-After when the admission queue is full.
+    """
+    if not session_id:
+        raise HTTPException(status_code=400, detail="session_id is required.")
+    source = session_store.get_file(session_id)
+    if source is None:
+        raise HTTPException(status_code=404,
+            detail=f"Large-file session '{session_id}' not found or expired. Upload it via /upload/large.")
+    user = _require_pro(request)   # large files are always above the free row limit
+
+    config = _build_config(
+        outlier_method, outlier_action, outlier_iqr_multiplier, outlier_zscore_threshold,
+        impute_numeric_strategy, impute_categorical_strategy, missing_drop_threshold,
+    )
+    out_path = source["path"][:-len(".csv")] + ".cleaned.csv"
+    def cleaner(progress=None) -> StreamingCleaner:
+        return StreamingCleaner(source["path"], config, read_options=source["read_options"], progress=progress)
+
+    try:
+        memory = cleaner().estimate_bytes()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse CSV: {e}")
+
+    def work(progress) -> StreamCleaningResponse:
+        with CLEAN_IN_FLIGHT.track("stream"):
+            started = time.perf_counter()
+            result  = cleaner(progress).run(out_path)
+        observe_engine_run("stream", time.perf_counter() - started,
+                           *result["eda_report"]["original_shape"])
+
+        result["filename"] = session_store.get_filename(session_id)
+        session_store.save_result(session_id, result)
+
+        preview = pd.read_csv(out_path, nrows=preview_rows) if preview_rows else pd.DataFrame()
+        original_shape = result["eda_report"]["original_shape"]
+        cleaned_shape  = result["cleaned_shape"]
+        return StreamCleaningResponse(
+            session_id=session_id,
+            cleaned_dataframe=_safe_rows(preview.to_dict(orient="records")),
+            audit_log=result["audit_log"],
+            column_quality_summary=result["column_quality_summary"],
+            eda_report=result["eda_report"],
+            original_shape=original_shape,
+            cleaned_shape=cleaned_shape,
+            rows_removed=original_shape[0] - cleaned_shape[0],
+            columns_dropped=original_shape[1] - cleaned_shape[1],
+            preview_rows=len(preview),
+        )
+
+    try:
+        job = JOBS.submit(session_id, work, memory=memory, lane="bulk", owner=_owner(request, user))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+    return CleanJobResponse(**job.snapshot())
+
+
+@router.get("/rows", response_model=CleanedRowsResponse)
+def get_cleaned_rows(
+    session_id: str | None = Query(default=None),
+    offset:     int        = Query(default=0, ge=0),
+    limit:      int        = Query(default=100, ge=1, le=MAX_PAGE_ROWS),
+):
+    """
+    Page through the cleaned DataFrame of a session that has already
+    been through POST /clean. Only the requested window is serialised.
+    """
+    if not session_id:
+        raise HTTPException(status_code=400, detail="session_id is required.")
+    result = session_store.get_result(session_id)
+    if not result:
+        raise HTTPException(status_code=404,
+            detail=f"No cleaned result for session '{session_id}'. Run /clean first.")
+
+    if result.get("cleaned_path"):
+        # Streamed result — read just this window from the cleaned CSV
+        total_rows = result["cleaned_shape"][0]
+        window = pd.read_csv(result["cleaned_path"], skiprows=range(1, offset + 1), nrows=limit)
+    else:
+        cleaned_df = result["cleaned_dataframe"]
+        total_rows = len(cleaned_df)
+        window     = cleaned_df.iloc[offset:offset + limit]
+
+    return CleanedRowsResponse(
+        session_id=session_id,
+        offset=offset,
+        limit=limit,
+        total_rows=total_rows,
+        rows=_safe_rows(window.to_dict(orient="records")),
     )
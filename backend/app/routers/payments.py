@@ -17,6 +17,10 @@ import httpx
 from fastapi import APIRouter, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+
+from app.metrics import supabase_async_client
+
+
 def get_token(request: Request):
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
@@ -27,7 +31,7 @@ async def get_current_user(request: Request):
     token = get_token(request)
     if not token:
         return None
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/auth/v1/user",
             headers={
@@ -53,7 +57,7 @@ SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
 
 async def _supabase_upsert_subscription(user_id: str, data: dict):
     """Upsert subscription record in Supabase using service role key."""
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         # Check if subscription exists
         res = await client.get(
             f"{SUPABASE_URL}/rest/v1/subscriptions",
@@ -184,7 +188,7 @@ async def get_subscription(request: Request):
 
     user_id = user.get("sub", "")
 
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         res = await client.get(
             f"{SUPABASE_URL}/rest/v1/subscriptions",
             params={"user_id": f"eq.{user_id}", "select": "status,plan,current_period_end,workspace_id"},
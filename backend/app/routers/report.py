@@ -3,6 +3,14 @@ routers/report.py
 =================
 Serves HTML report, CSV download, PDF download,
 permanent shareable reports, and column explanations.
+
+EDA sections (summary, correlation, distributions, value counts) are
+computed on first use — by /report/html, /report/publish or GET /report/eda
+— and cached on the session result.
+
+Results of /clean/stream keep the cleaned data on disk: /report/csv serves
+that file directly, while the HTML report and publishing (which need the
+whole frame in memory) are refused with 409.
 """
 
 import io
@@ -11,14 +19,18 @@ import os
 import secrets
 import json
 
-import httpx
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
-from app.engine import EnterpriseDataEngine
+from app.engine import EDA_SECTIONS, materialise_eda
+from app.admission import AdmissionRejected
+from app.engine_pool import run_engine
+from app.metrics import supabase_async_client
 from app.config import CleaningConfig
 from app.reporting import build_report_context
+from app.result_cache import RESULT_CACHE
 from app.session import session_store
 from app.utils import explain_report
 
@@ -37,7 +49,7 @@ async def _get_user(request: Request):
     if not auth.startswith("Bearer "):
         return None
     token = auth.split(" ", 1)[1].strip()
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/auth/v1/user",
             headers={"Authorization": f"Bearer {token}", "apikey": SUPABASE_SERVICE_KEY},
@@ -67,16 +79,32 @@ def _get_result(session_id: str | None) -> dict:
     if result:
         return result
     df = session_store.get_df(session_id)
+    if df is None and session_store.get_file(session_id):
+        raise HTTPException(status_code=409, detail="Large-file session — run /clean/stream first.")
     if df is None:
         raise HTTPException(status_code=404, detail=f"Session not found or expired.")
+    config = CleaningConfig()
     try:
-        result = EnterpriseDataEngine(df, CleaningConfig()).run()
+        result = RESULT_CACHE.get_or_run(
+            session_store.get_content_hash(session_id), config,
+            lambda: run_engine(df, config, checkpoints=session_store.get_checkpoints(session_id)),
+        )
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Engine error: {str(e)}")
     session_store.save_result(session_id, result)
     return result
 
 
+def _require_frame(result: dict) -> None:
+    """Streamed results have no in-memory frame — refuse endpoints that need one."""
+    if result.get("cleaned_path"):
+        raise HTTPException(status_code=409,
+            detail="Not available for large-file results. Download the CSV from /report/csv.")
+
+
 # ─── CSV helper ──────────────────────────────────────────────
 
 def _df_to_csv_string(cleaned_df) -> str:
@@ -90,13 +118,44 @@ def _df_to_csv_string(cleaned_df) -> str:
 @router.get("/html", response_class=HTMLResponse)
 def get_html_report(request: Request, session_id: str | None = Query(default=None)):
     result  = _get_result(session_id)
+    _require_frame(result)
+    materialise_eda(result)
     context = build_report_context(request, result)
     return templates.TemplateResponse("report.html", context)
 
 
+@router.get("/eda")
+def get_eda_sections(
+    session_id: str | None = Query(default=None),
+    sections:   str | None = Query(default=None,
+                                   description="Comma-separated: summary,correlation,distributions,value_counts (default all)"),
+):
+    """
+    EDA overview plus the requested sections. Sections are computed the
+    first time any client asks for them and cached on the session result.
+    """
+    names = [s.strip() for s in sections.split(",") if s.strip()] if sections else None
+    unknown = [n for n in names or [] if n not in EDA_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400,
+            detail=f"Unknown EDA section(s): {', '.join(unknown)}. "
+                   f"Choose from: {', '.join(EDA_SECTIONS)}.")
+    result = _get_result(session_id)
+    report = materialise_eda(result, names)
+    keys   = {EDA_SECTIONS[n] for n in (names or EDA_SECTIONS)}
+    return JSONResponse({
+        "session_id": session_id,
+        "eda_report": {k: v for k, v in report.items()
+                       if k in keys or k not in EDA_SECTIONS.values()},
+    })
+
+
 @router.get("/csv")
 def download_csv(session_id: str | None = Query(default=None)):
     result     = _get_result(session_id)
+    filename   = f"cleaned_{session_id[:8]}.csv"
+    if result.get("cleaned_path"):
+        return FileResponse(result["cleaned_path"], media_type="text/csv", filename=filename)
     cleaned_df = result["cleaned_dataframe"]
 
     def csv_generator():
@@ -108,7 +167,6 @@ def download_csv(session_id: str | None = Query(default=None)):
             writer.writerow(row.tolist())
             yield buf.getvalue(); buf.seek(0); buf.truncate()
 
-    filename = f"cleaned_{session_id[:8]}.csv"
     return StreamingResponse(
         csv_generator(),
         media_type="text/csv",
@@ -134,6 +192,24 @@ def get_explanations(session_id: str | None = Query(default=None)):
 
 # ─── NEW: Publish permanent shareable report ─────────────────
 
+def _publish_payload(session_id: str | None) -> dict:
+    """
+    The stored report for a session, without token and owner. Blocking —
+    may run (and wait for admission of) the engine, compute the EDA and
+    serialise the frame — so publish_report runs it in the threadpool.
+    """
+    result = _get_result(session_id)
+    _require_frame(result)
+    return {
+        "filename":       result.get("filename", "cleaned_data.csv"),
+        "column_quality": result.get("column_quality_summary", []),
+        "audit_log":      result.get("audit_log", []),
+        "cleaned_shape":  list(result.get("cleaned_shape", [])),
+        "eda_report":     materialise_eda(result),
+        "csv_data":       _df_to_csv_string(result["cleaned_dataframe"]),
+    }
+
+
 @router.post("/publish")
 async def publish_report(request: Request, session_id: str | None = Query(default=None)):
     """
@@ -141,28 +217,20 @@ async def publish_report(request: Request, session_id: str | None = Query(defaul
     Returns a public token: GET /report/shared/{token}
     Works for both authed and anonymous users.
     """
-    result = _get_result(session_id)
+    report = await run_in_threadpool(_publish_payload, session_id)
     user   = await _get_user(request)
 
     # Generate short unique token e.g. "rpt_a3f9k2b1"
     token = "rpt_" + secrets.token_urlsafe(8)
 
-    # Serialise the cleaned CSV
-    csv_data = _df_to_csv_string(result["cleaned_dataframe"])
-
     # Store to Supabase
     payload = {
-        "token":          token,
-        "user_id":        user["id"] if user else None,
-        "filename":       result.get("filename", "cleaned_data.csv"),
-        "column_quality": result.get("column_quality_summary", []),
-        "audit_log":      result.get("audit_log", []),
-        "cleaned_shape":  list(result.get("cleaned_shape", [])),
-        "eda_report":     result.get("eda_report", {}),
-        "csv_data":       csv_data,
+        "token":   token,
+        "user_id": user["id"] if user else None,
+        **report,
     }
 
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.post(
             f"{SUPABASE_URL}/rest/v1/reports",
             json=payload,
@@ -184,7 +252,7 @@ async def view_shared_report(request: Request, token: str):
     Public endpoint — renders a report page from a saved token.
     No authentication required.
     """
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/rest/v1/reports",
             params={"token": f"eq.{token}", "select": "*"},
@@ -225,7 +293,7 @@ async def download_shared_csv(token: str):
     Re-download the cleaned CSV from a permanently saved report.
     No session required — works days or weeks after the original clean.
     """
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/rest/v1/reports",
             params={"token": f"eq.{token}", "select": "filename,csv_data"},
@@ -258,7 +326,7 @@ async def get_shared_report_data(token: str):
     Returns the saved report as JSON — used by the frontend
     SharedReportScreen to render the report without the backend template.
     """
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/rest/v1/reports",
             params={"token": f"eq.{token}", "select": "token,filename,created_at,cleaned_shape,column_quality,audit_log,eda_report"},
@@ -297,7 +365,7 @@ async def list_my_reports(request: Request):
         return {"reports": []}
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with supabase_async_client() as client:
             r = await client.get(
                 f"{SUPABASE_URL}/rest/v1/reports",
                 params={
@@ -4,16 +4,24 @@ routers/upload.py
 Handles file uploads. Validates format, size, and readability,
 then stores the raw DataFrame in the session store for downstream
 /clean and /report endpoints to consume.
+
+Uploads are content-hashed: identical bytes share one parsed DataFrame
+and, through the session's content hash, cached engine results
+(app.result_cache).
 """
 
 import io
+import csv
+import os
 import hashlib
+import tempfile
 import time
 import pandas as pd
 
 from fastapi import APIRouter, File, UploadFile, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from app.result_cache import PARSED_FRAMES, content_hash
 from app.session import session_store
 
 router = APIRouter(prefix="/upload", tags=["upload"])
@@ -44,6 +52,29 @@ MAX_FILE_SIZE_MB    = 50
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 ALLOWED_EXTENSIONS  = {".csv", ".xlsx", ".xls"}
 
+# Streamed uploads (/upload/large) go to disk and are cleaned out of core
+MAX_LARGE_FILE_SIZE_MB    = int(os.getenv("MAX_LARGE_FILE_SIZE_MB", "4096"))
+MAX_LARGE_FILE_SIZE_BYTES = MAX_LARGE_FILE_SIZE_MB * 1024 * 1024
+LARGE_UPLOAD_DIR          = os.getenv("LARGE_UPLOAD_DIR", tempfile.gettempdir())
+UPLOAD_READ_BYTES         = 1024 * 1024
+
+
+def _detect_delimiter(raw: bytes, encoding: str) -> str:
+    """
+    Sniff the delimiter from the first 4KB of the file.
+    Falls back to comma if sniffer fails.
+    Candidate delimiters: , ; | \t
+    """
+    sample = raw[:4096].decode(encoding, errors="replace")
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;|\t")
+        return dialect.delimiter
+    except csv.Error:
+        # Manual fallback: count occurrences per line
+        first_line = sample.split("\n")[0]
+        counts = {d: first_line.count(d) for d in [",", ";", "|", "\t"]}
+        return max(counts, key=counts.get)
+
 
 def _read_file(contents: bytes, filename: str) -> pd.DataFrame:
     """
@@ -60,24 +91,6 @@ def _read_file(contents: bytes, filename: str) -> pd.DataFrame:
     ext = ("." + filename.rsplit(".", 1)[-1].lower()) if "." in filename else ""
 
     if ext == ".csv":
-        import csv as _csv
-
-        def _detect_delimiter(raw: bytes, encoding: str) -> str:
-            """
-            Sniff the delimiter from the first 4KB of the file.
-            Falls back to comma if sniffer fails.
-            Candidate delimiters: , ; | \t
-            """
-            sample = raw[:4096].decode(encoding, errors="replace")
-            try:
-                dialect = _csv.Sniffer().sniff(sample, delimiters=",;|\t")
-                return dialect.delimiter
-            except _csv.Error:
-                # Manual fallback: count occurrences per line
-                first_line = sample.split("\n")[0]
-                counts = {d: first_line.count(d) for d in [",", ";", "|", "\t"]}
-                return max(counts, key=counts.get)
-
         for encoding in ("utf-8", "latin-1", "cp1252"):
             try:
                 sep = _detect_delimiter(contents, encoding)
@@ -156,15 +169,16 @@ async def upload_file(file: UploadFile = File(...)):
             detail=f"File too large ({len(contents)/1024/1024:.1f} MB). Max is {MAX_FILE_SIZE_MB} MB.",
         )
 
-    df = _read_file(contents, filename)
+    digest = content_hash(contents, filename)
+    df = PARSED_FRAMES.get_or_parse(digest, lambda: _read_file(contents, filename))
 
     if df.shape[0] == 0:
         raise HTTPException(status_code=400, detail="File has no data rows.")
     if df.shape[1] == 0:
         raise HTTPException(status_code=400, detail="File has no columns.")
 
-    session_id = hashlib.sha256(contents + str(time.time()).encode()).hexdigest()[:16]
-    session_store.save(session_id, df, filename=filename)
+    session_id = hashlib.sha256((digest + str(time.time())).encode()).hexdigest()[:16]
+    session_store.save(session_id, df, filename=filename, content_hash=digest)
 
     return JSONResponse(content={
         "session_id":   session_id,
@@ -177,6 +191,67 @@ async def upload_file(file: UploadFile = File(...)):
     })
 
 
+@router.post("/large")
+async def upload_large_file(file: UploadFile = File(...)):
+    """
+    Upload a CSV too large to clean in memory (up to MAX_LARGE_FILE_SIZE_MB).
+    The file is streamed to disk, never loaded whole; clean it with
+    POST /clean/stream using the returned session_id.
+    """
+    filename = file.filename or "upload.csv"
+    ext = ("." + filename.rsplit(".", 1)[-1].lower()) if "." in filename else ""
+    if ext != ".csv":
+        raise HTTPException(status_code=415, detail="Large uploads must be CSV files.")
+
+    fd, path = tempfile.mkstemp(suffix=".csv", prefix="upload_", dir=LARGE_UPLOAD_DIR)
+    size, head, digest = 0, b"", hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(UPLOAD_READ_BYTES):
+                size += len(chunk)
+                if size > MAX_LARGE_FILE_SIZE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Max is {MAX_LARGE_FILE_SIZE_MB} MB.",
+                    )
+                if len(head) < 65536:
+                    head += chunk[:65536 - len(head)]
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+
+        try:
+            head.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off at the end of the sample is still UTF-8
+            encoding = "utf-8" if e.start >= len(head) - 3 else "latin-1"
+        sep = _detect_delimiter(head, encoding)
+        try:
+            columns = list(pd.read_csv(path, sep=sep, encoding=encoding, nrows=0).columns)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not parse CSV: {e}")
+        if not columns:
+            raise HTTPException(status_code=400, detail="File has no columns.")
+    except BaseException:
+        os.remove(path)
+        raise
+
+    session_id = hashlib.sha256(digest.digest() + str(time.time()).encode()).hexdigest()[:16]
+    session_store.save_file(session_id, path, filename=filename,
+                            read_options={"sep": sep, "encoding": encoding})
+
+    return JSONResponse(content={
+        "session_id":   session_id,
+        "filename":     filename,
+        "columns":      len(columns),
+        "column_names": columns,
+        "size_kb":      round(size / 1024, 1),
+        "message":      "File uploaded. Clean it with /clean/stream.",
+    })
+
+
 @router.post("/sheets")
 async def upload_from_sheets(request: Request):
     """
@@ -212,8 +287,9 @@ async def upload_from_sheets(request: Request):
     contents = res.content
     filename = f"sheets_{sheet_id[:8]}.csv"
 
+    digest = content_hash(contents, filename)
     try:
-        df = _read_file(contents, filename)
+        df = PARSED_FRAMES.get_or_parse(digest, lambda: _read_file(contents, filename))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not parse sheet data: {e}")
 
@@ -222,8 +298,8 @@ async def upload_from_sheets(request: Request):
     if df.shape[1] == 0:
         raise HTTPException(status_code=400, detail="Sheet has no columns.")
 
-    session_id = hashlib.sha256(contents + str(time.time()).encode()).hexdigest()[:16]
-    session_store.save(session_id, df, filename=filename)
+    session_id = hashlib.sha256((digest + str(time.time())).encode()).hexdigest()[:16]
+    session_store.save(session_id, df, filename=filename, content_hash=digest)
 
     return JSONResponse(content={
         "session_id":   session_id,
@@ -15,11 +15,12 @@ Team workspace management.
 import os
 from datetime import datetime, timezone
 
-import httpx
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from app.metrics import supabase_async_client
+
 router = APIRouter(prefix="/workspace", tags=["workspace"])
 
 SUPABASE_URL         = "https://lisyiprowqxybfttenud.supabase.co"
@@ -44,7 +45,7 @@ async def get_current_user(request: Request):
     if not auth.startswith("Bearer "):
         return None
     token = auth.split(" ", 1)[1].strip()
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(
             f"{SUPABASE_URL}/auth/v1/user",
             headers={"Authorization": f"Bearer {token}", "apikey": SUPABASE_SERVICE_KEY},
@@ -58,13 +59,13 @@ async def get_current_user(request: Request):
 # ─── Supabase helpers ─────────────────────────────────────────
 
 async def _sb_get(path: str, params: dict = {}):
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.get(f"{SUPABASE_URL}/rest/v1/{path}", params=params, headers=_headers())
     return r.json()
 
 
 async def _sb_post(path: str, data: dict):
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.post(
             f"{SUPABASE_URL}/rest/v1/{path}",
             json=data,
@@ -74,7 +75,7 @@ async def _sb_post(path: str, data: dict):
 
 
 async def _sb_patch(path: str, params: dict, data: dict):
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.patch(
             f"{SUPABASE_URL}/rest/v1/{path}",
             params=params,
@@ -85,7 +86,7 @@ async def _sb_patch(path: str, params: dict, data: dict):
 
 
 async def _sb_delete(path: str, params: dict):
-    async with httpx.AsyncClient() as client:
+    async with supabase_async_client() as client:
         r = await client.delete(
             f"{SUPABASE_URL}/rest/v1/{path}",
             params=params,
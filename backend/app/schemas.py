@@ -11,14 +11,51 @@ from pydantic import BaseModel
 class CleaningResponse(BaseModel):
     session_id:             str
     raw_dataframe:          list[dict[str, Any]]   # first 10 rows of original
-    cleaned_dataframe:      list[dict[str, Any]]
+    cleaned_dataframe:      list[dict[str, Any]]   # first preview_rows rows of cleaned
     audit_log:              list[dict[str, Any]]
     column_quality_summary: list[dict[str, Any]]
-    eda_report:             dict[str, Any]
+    eda_report:             dict[str, Any]         # overview; heavy sections via GET /report/eda
     original_shape:         list[int]
     cleaned_shape:          list[int]
     rows_removed:           int
     columns_dropped:        int
     share_token:            str | None = None  # permanent shareable report token
+    preview_rows:           int = 0            # rows included in cleaned_dataframe
+    timings:                dict[str, Any] | None = None  # per-stage / per-column wall & CPU time
 
     model_config = {"arbitrary_types_allowed": True}
+
+
+class StreamCleaningResponse(BaseModel):
+    """POST /clean/stream — like CleaningResponse, without the raw preview or share token."""
+    session_id:             str
+    cleaned_dataframe:      list[dict[str, Any]]   # first preview_rows rows of cleaned
+    audit_log:              list[dict[str, Any]]
+    column_quality_summary: list[dict[str, Any]]
+    eda_report:             dict[str, Any]         # overview only
+    original_shape:         list[int]
+    cleaned_shape:          list[int]
+    rows_removed:           int
+    columns_dropped:        int
+    preview_rows:           int = 0
+
+
+class CleanJobResponse(BaseModel):
+    """POST /clean/jobs, POST /clean/stream and GET /clean/jobs/{job_id}."""
+    job_id:     str
+    session_id: str
+    status:     str                          # queued | running | done | failed
+    progress:   dict[str, Any] = {}          # latest engine event: stage, percent, ...
+    created:    float
+    finished:   float | None = None
+    error:      str | None = None
+    error_code: int | None = None            # HTTP status the synchronous /clean would have returned
+    result:     CleaningResponse | StreamCleaningResponse | None = None   # once done
+
+
+class CleanedRowsResponse(BaseModel):
+    session_id: str
+    offset:     int
+    limit:      int
+    total_rows: int
+    rows:       list[dict[str, Any]]
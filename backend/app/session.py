@@ -1,63 +1,288 @@
 """
 session.py
 ==========
-Simple in-memory session store that maps session_id → (DataFrame, engine result).
+Session store that maps session_id → (DataFrame, engine result).
 
-For the free tier this is sufficient. For production multi-worker deployments,
-swap the dict for Redis or a database-backed store.
+SessionBackend is the interface the routers use. Two backends ship:
+
+  memory  SessionStore below — one process only (the default)
+  shared  session_shared.SharedSessionStore — every worker on the host sees
+          the same sessions (Feather files + SQLite index)
+
+Pick one with SESSION_BACKEND; the rest of this docstring is about the
+memory backend.
 
 Entries expire after SESSION_TTL_SECONDS to prevent unbounded memory growth.
+Beyond MAX_SESSIONS the least recently used entry is evicted. Entries are
+kept in OrderedDicts (LRU per tier, and by TTL clock), so touch and evict
+are O(1); a demoted entry is slotted into its new tier by last use, so
+every list stays sorted. Expiry and idle demotion run on a background
+reaper thread every SESSION_REAP_INTERVAL_SECONDS instead of scanning on
+requests.
+
+Large CSVs uploaded through /upload/large are kept on disk instead
+(save_file); their files are deleted when the entry is evicted.
+
+Sessions keep the content hash of their upload (result_cache.content_hash),
+which keys the cross-session result cache.
+
+Each in-memory session also owns a StageCheckpoints, so repeated /clean
+calls with different options resume from memoised engine stages.
+
+Memory is accounted against SESSION_MEMORY_BUDGET_MB: packed entries by
+their packed size, live frames (memory_usage(deep=True) of the uploaded
+and cleaned frames) through FRAME_LEDGER. The ledger counts a frame once
+however many holders share it — sessions with identical uploads share
+one parsed frame (result_cache.PARSED_FRAMES) — and RESULT_CACHE holds its
+frames through it too, so cached results are charged to the same budget.
+Entries move down three tiers:
+
+  memory      live DataFrame and result
+  compressed  packed in memory (spill.pack: Feather/zstd per frame)
+  spilled     packed files under SESSION_SPILL_DIR
+
+The reaper demotes an entry after SESSION_COMPRESS_IDLE_SECONDS /
+SESSION_SPILL_IDLE_SECONDS without access; writes demote earlier, least
+recently used first, while resident bytes exceed the budget. get_df /
+get_result rehydrate it transparently. The store lock only guards index
+updates: packing, unpacking and file deletion run outside it (packing
+under a per-entry lock), so a slow save never blocks other sessions'
+reads. Stage checkpoints are a cache and are dropped on demotion.
+Demoting an entry also asks the ledger's reclaimers (RESULT_CACHE) to let
+go of its frames, so the memory is actually freed.
 """
 
+import os
 import time
+import logging
+import tempfile
 import threading
 import pandas as pd
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.checkpoints import StageCheckpoints
+from app.spill import pack, read_packed, remove_packed, unpack, write_packed
+
+logger = logging.getLogger(__name__)
 
 # ── Config ──
 SESSION_TTL_SECONDS = 60 * 60  # 1 hour
-MAX_SESSIONS = 200              # evict oldest when limit reached
+MAX_SESSIONS = 200              # evict least recently used when limit reached
+SESSION_REAP_INTERVAL_SECONDS = int(os.getenv("SESSION_REAP_INTERVAL_SECONDS", "30"))
+
+SESSION_MEMORY_BUDGET_MB      = int(os.getenv("SESSION_MEMORY_BUDGET_MB", "1024"))
+SESSION_MEMORY_BUDGET_BYTES   = SESSION_MEMORY_BUDGET_MB * 1024 * 1024
+SESSION_COMPRESS_IDLE_SECONDS = int(os.getenv("SESSION_COMPRESS_IDLE_SECONDS", "300"))
+SESSION_SPILL_IDLE_SECONDS    = int(os.getenv("SESSION_SPILL_IDLE_SECONDS", "900"))
+SESSION_SPILL_DIR             = os.getenv("SESSION_SPILL_DIR",
+                                          os.path.join(tempfile.gettempdir(), "oxdemi_sessions"))
+SESSION_BACKEND               = os.getenv("SESSION_BACKEND", "memory")   # "memory" | "shared"
+
+TIERS = ("memory", "compressed", "spilled")
 
 
-class SessionStore:
-    """Thread-safe in-memory store for uploaded DataFrames and engine results."""
+def frame_bytes(df) -> int:
+    """Bytes a DataFrame holds, memory_usage(deep=True) with its index; 0 for anything else."""
+    if not isinstance(df, pd.DataFrame):
+        return 0
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameLedger:
+    """
+    Bytes of the live DataFrames held by session stores and caches in this
+    process. A frame is counted once however many holders share it, until
+    the last one releases it.
+    """
 
     def __init__(self):
         self._lock   = threading.Lock()
-        self._frames: dict[str, dict] = {}   # session_id → {df, result, ts}
+        self._frames: dict[int, list] = {}    # id(frame) → [frame, bytes, holders]
+        self._reclaimers: list[Callable[[pd.DataFrame], None]] = []
+        self.bytes   = 0
+
+    def hold(self, frame, size: int | None = None) -> None:
+        """Count `frame` (a DataFrame; anything else is ignored) for one more holder."""
+        if not isinstance(frame, pd.DataFrame):
+            return
+        with self._lock:
+            held = self._frames.get(id(frame))
+            if held is not None:
+                held[2] += 1
+                return
+        size = frame_bytes(frame) if size is None else size
+        with self._lock:
+            held = self._frames.setdefault(id(frame), [frame, size, 0])
+            if held[2] == 0:
+                self.bytes += held[1]
+            held[2] += 1
+
+    def release(self, frame, reclaim: bool = False) -> None:
+        """
+        Drop one holder of `frame`. With `reclaim` (the holder is freeing
+        memory), reclaimers holding the same frame are asked to let go too.
+        """
+        if not isinstance(frame, pd.DataFrame):
+            return
+        with self._lock:
+            held = self._frames.get(id(frame))
+            if held is None:
+                return
+            held[2] -= 1
+            if held[2] == 0:
+                del self._frames[id(frame)]
+                self.bytes -= held[1]
+                return
+            reclaimers = list(self._reclaimers) if reclaim else []
+        for reclaimer in reclaimers:
+            reclaimer(frame)
+
+    def add_reclaimer(self, reclaimer: Callable[[pd.DataFrame], None]) -> None:
+        """Register a cache that drops its hold on a frame when asked (see release)."""
+        with self._lock:
+            self._reclaimers.append(reclaimer)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"frames": len(self._frames), "bytes": self.bytes}
+
+
+# Process-wide ledger — session stores and RESULT_CACHE hold their frames through it
+FRAME_LEDGER = FrameLedger()
+
+
+def _result_frame(result) -> Optional[pd.DataFrame]:
+    return result.get("cleaned_dataframe") if isinstance(result, dict) else None
+
+
+class SessionBackend:
+    """Interface of a session store. Methods return None for unknown or expired sessions."""
+
+    def save(self, session_id: str, df: pd.DataFrame, filename: str = "", content_hash: str = "") -> None:
+        raise NotImplementedError
+
+    def save_file(self, session_id: str, path: str, filename: str = "", read_options: dict | None = None) -> None:
+        raise NotImplementedError
+
+    def get_file(self, session_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_filename(self, session_id: str) -> str:
+        raise NotImplementedError
+
+    def get_content_hash(self, session_id: str) -> str:
+        """Content hash of the session's upload, or "" if unknown."""
+        raise NotImplementedError
+
+    def get_df(self, session_id: str) -> Optional[pd.DataFrame]:
+        raise NotImplementedError
+
+    def get_checkpoints(self, session_id: str) -> Optional[StageCheckpoints]:
+        raise NotImplementedError
+
+    def save_result(self, session_id: str, result: dict) -> None:
+        raise NotImplementedError
+
+    def get_result(self, session_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """At least {"entries", "bytes"} (bytes held in this process's memory)."""
+        raise NotImplementedError
+
+
+class SessionStore(SessionBackend):
+    """Thread-safe, memory-budgeted store for uploaded DataFrames and engine results."""
+
+    def __init__(self, budget_bytes: int = SESSION_MEMORY_BUDGET_BYTES, spill_dir: str = SESSION_SPILL_DIR,
+                 reap_interval: float = SESSION_REAP_INTERVAL_SECONDS):
+        self._lock   = threading.Lock()
+        self._frames: dict[str, dict] = {}   # session_id → {df, result, ts, tier, ...}
+        # Least recently used first — sorted by "used" — one list per tier (+ on-disk uploads)
+        self._lru: dict[str, OrderedDict[str, None]] = {g: OrderedDict() for g in (*TIERS, "files")}
+        # Oldest TTL clock first — ts only moves forward, so appending keeps it sorted
+        self._expiry: OrderedDict[str, None] = OrderedDict()
+        self._budget    = budget_bytes
+        self._spill_dir = spill_dir
+        self._packed    = 0                  # bytes of compressed entries (live frames: FRAME_LEDGER)
+        self._pending_files: list[str] = []  # of entries expired on access, deleted after unlock
+        self._stop      = threading.Event()
+        if reap_interval > 0:
+            threading.Thread(target=self._reap_loop, args=(reap_interval,),
+                             name="session-reaper", daemon=True).start()
+
+    @staticmethod
+    def _new_entry(**fields) -> dict:
+        now = time.time()
+        return {
+            "df":           None,
+            "result":       None,
+            "checkpoints":  None,
+            "filename":     "",
+            "content_hash": "",
+            "ts":           now,     # TTL clock, refreshed on save_result
+            "used":         now,     # last access, for idle demotion and LRU
+            "tier":         "memory",
+            "df_bytes":     0,       # live sizes, memory_usage(deep=True)
+            "result_bytes": 0,
+            "packed_bytes": 0,       # in-memory packed size while compressed
+            "packed":       None,    # spill.Packed while compressed
+            "spill_path":   None,    # directory while spilled
+            "version":      0,       # bumped on every write, so stale demotions are dropped
+            "lock":         threading.Lock(),
+            **fields,
+        }
 
     # ──────────────────────────────────────
     # DataFrame storage (set on upload)
     # ──────────────────────────────────────
 
-    def save(self, session_id: str, df: pd.DataFrame, filename: str = "") -> None:
+    def save(self, session_id: str, df: pd.DataFrame, filename: str = "", content_hash: str = "") -> None:
         """Store a raw DataFrame under session_id."""
+        size  = frame_bytes(df)
+        entry = self._new_entry(df=df, checkpoints=StageCheckpoints(), filename=filename,
+                                content_hash=content_hash, df_bytes=size)
+        FRAME_LEDGER.hold(df, size)
+        self._insert(session_id, entry)
+        self._enforce_budget(keep=session_id)
+
+    def save_file(self, session_id: str, path: str, filename: str = "", read_options: dict | None = None) -> None:
+        """Store an on-disk CSV (streamed upload) under session_id, with its read_csv options."""
+        self._insert(session_id, self._new_entry(
+            path=path, read_options=dict(read_options or {}), filename=filename,
+        ))
+
+    def get_file(self, session_id: str) -> Optional[dict]:
+        """{path, read_options} of an on-disk session, or None."""
         with self._lock:
-            self._evict_expired()
-            if len(self._frames) >= MAX_SESSIONS:
-                self._evict_oldest()
-            self._frames[session_id] = {
-                "df":       df,
-                "result":   None,
-                "filename": filename,
-                "ts":       time.time(),
-            }
+            entry = self._live(session_id)
+            doomed, self._pending_files = self._pending_files, []
+        _delete_paths(doomed)
+        if not entry or not entry.get("path"):
+            return None
+        return {"path": entry["path"], "read_options": dict(entry["read_options"])}
 
     def get_filename(self, session_id: str) -> str:
         with self._lock:
             entry = self._frames.get(session_id)
             return entry.get("filename", "") if entry else ""
 
+    def get_content_hash(self, session_id: str) -> str:
+        with self._lock:
+            entry = self._frames.get(session_id)
+            return entry.get("content_hash", "") if entry else ""
+
     def get_df(self, session_id: str) -> Optional[pd.DataFrame]:
         """Retrieve the raw DataFrame. Returns None if not found or expired."""
+        payload = self._payload(session_id, check_ttl=True)
+        return payload["df"] if payload else None
+
+    def get_checkpoints(self, session_id: str) -> Optional[StageCheckpoints]:
+        """Stage checkpoints of an in-memory session, or None."""
         with self._lock:
             entry = self._frames.get(session_id)
-            if not entry:
-                return None
-            if time.time() - entry["ts"] > SESSION_TTL_SECONDS:
-                del self._frames[session_id]
-                return None
-            return entry["df"]
+            return entry.get("checkpoints") if entry else None
 
     # ──────────────────────────────────────
     # Engine result cache (set on /clean)
@@ -65,43 +290,294 @@ class SessionStore:
 
     def save_result(self, session_id: str, result: dict) -> None:
         """Cache the engine result so /report doesn't re-run the pipeline."""
-        with self._lock:
-            entry = self._frames.get(session_id)
-            if entry:
-                entry["result"] = result
-                entry["ts"]     = time.time()  # refresh TTL
+        size = frame_bytes(result.get("cleaned_dataframe"))
+        while True:
+            # The frame and result share a tier — bring the entry back first
+            if self._payload(session_id, check_ttl=False) is None:
+                return
+            with self._lock:
+                entry = self._frames.get(session_id)
+                if not entry:
+                    return
+                if entry["tier"] != "memory":
+                    continue   # demoted again in between
+                previous = entry["result"]
+                entry["result"]       = result
+                entry["ts"]           = time.time()  # refresh TTL
+                entry["version"]     += 1
+                entry["result_bytes"] = size
+                self._expiry.move_to_end(session_id)
+                self._touch(session_id, entry)
+                FRAME_LEDGER.hold(_result_frame(result), size)
+                FRAME_LEDGER.release(_result_frame(previous))
+                break
+        self._enforce_budget(keep=session_id)
 
     def get_result(self, session_id: str) -> Optional[dict]:
-        """Retrieve a cached engine result. Returns None if not found."""
+        """Retrieve a cached engine result. Returns None if not found or expired."""
+        payload = self._payload(session_id, check_ttl=True)
+        return payload["result"] if payload else None
+
+    # ──────────────────────────────────────
+    # Index bookkeeping — call while holding lock
+    # ──────────────────────────────────────
+
+    @staticmethod
+    def _group(entry: dict) -> str:
+        return "files" if entry.get("path") else entry["tier"]
+
+    def _touch(self, session_id: str, entry: dict) -> None:
+        entry["used"] = time.time()
+        self._lru[self._group(entry)].move_to_end(session_id)
+
+    def _set_tier(self, session_id: str, entry: dict, tier: str) -> None:
+        """
+        Move an entry to `tier`'s list at its "used" position, not the tail:
+        a demoted entry can be older than entries already in that tier, and
+        the reaper and _least_recent rely on each list being sorted.
+        """
+        del self._lru[self._group(entry)][session_id]
+        entry["tier"] = tier
+        lru   = self._lru[self._group(entry)]
+        newer = []
+        for sid in reversed(lru):
+            if self._frames[sid]["used"] <= entry["used"]:
+                break
+            newer.append(sid)
+        lru[session_id] = None
+        for sid in reversed(newer):
+            lru.move_to_end(sid)
+
+    def _live(self, session_id: str) -> Optional[dict]:
+        """Entry of a session that hasn't expired, marked as used; expired ones are discarded."""
+        entry = self._frames.get(session_id)
+        if not entry:
+            return None
+        if time.time() - entry["ts"] > SESSION_TTL_SECONDS:
+            self._pending_files += self._discard(session_id)
+            return None
+        self._touch(session_id, entry)
+        return entry
+
+    def _least_recent(self, groups=(*TIERS, "files")) -> Optional[str]:
+        """Least recently used session across `groups` — O(1) per group."""
+        heads = [next(iter(self._lru[g])) for g in groups if self._lru[g]]
+        return min(heads, key=lambda sid: self._frames[sid]["used"], default=None)
+
+    # ──────────────────────────────────────
+    # Tiers
+    # ──────────────────────────────────────
+
+    def _insert(self, session_id: str, entry: dict) -> None:
+        with self._lock:
+            doomed = []
+            if session_id in self._frames:
+                doomed += self._discard(session_id)
+            if len(self._frames) >= MAX_SESSIONS:
+                doomed += self._discard(self._least_recent())
+            self._frames[session_id] = entry
+            self._lru[self._group(entry)][session_id] = None
+            self._expiry[session_id] = None
+        _delete_paths(doomed)
+
+    def _payload(self, session_id: str, check_ttl: bool) -> Optional[dict]:
+        """{df, result} of an entry, rehydrated into memory if it was demoted."""
+        with self._lock:
+            if check_ttl:
+                entry = self._live(session_id)
+            else:
+                entry = self._frames.get(session_id)
+                if entry:
+                    self._touch(session_id, entry)
+            doomed, self._pending_files = self._pending_files, []
+            if entry and entry["tier"] == "memory":
+                return {"df": entry["df"], "result": entry["result"]}
+        _delete_paths(doomed)
+        if not entry:
+            return None
+
+        spill_path = None
+        with entry["lock"]:
+            with self._lock:
+                if self._frames.get(session_id) is not entry:
+                    return None
+                if entry["tier"] == "memory":       # another request got here first
+                    return {"df": entry["df"], "result": entry["result"]}
+                packed, spill_path = entry["packed"], entry["spill_path"]
+            try:
+                payload = unpack(packed) if packed is not None else read_packed(spill_path)
+            except OSError:
+                return None                         # discarded while we were reading
+            with self._lock:
+                if self._frames.get(session_id) is not entry:
+                    return None
+                entry.update(df=payload["df"], result=payload["result"],
+                             packed=None, spill_path=None, checkpoints=StageCheckpoints())
+                self._set_tier(session_id, entry, "memory")
+                self._set_packed(entry, 0)
+                FRAME_LEDGER.hold(payload["df"], entry["df_bytes"])
+                FRAME_LEDGER.hold(_result_frame(payload["result"]), entry["result_bytes"])
+        if spill_path:
+            remove_packed(spill_path)
+        self._enforce_budget(keep=session_id)
+        return payload
+
+    def _demote(self, session_id: str, tier: str) -> bool:
+        """Pack an entry into `tier`. Skips entries busy in another thread."""
         with self._lock:
             entry = self._frames.get(session_id)
-            if not entry:
-                return None
-            return entry.get("result")
+        if entry is None or not entry["lock"].acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                if (self._frames.get(session_id) is not entry
+                        or TIERS.index(entry["tier"]) >= TIERS.index(tier)):
+                    return False
+                version, packed = entry["version"], entry["packed"]
+                live = {"df": entry["df"], "result": entry["result"]}
+            if packed is None:
+                packed = pack(live)
+            spill_path = None
+            if tier == "spilled":
+                spill_path = os.path.join(self._spill_dir, session_id)
+                write_packed(packed, spill_path)
+            with self._lock:
+                current = self._frames.get(session_id) is entry and entry["version"] == version
+                if current:
+                    entry.update(df=None, result=None, checkpoints=None,
+                                 packed=packed if tier == "compressed" else None,
+                                 spill_path=spill_path)
+                    self._set_tier(session_id, entry, tier)
+                    self._set_packed(entry, packed.nbytes if tier == "compressed" else 0)
+            if current:
+                # Caches sharing these frames let go too, or demotion frees nothing
+                FRAME_LEDGER.release(live["df"], reclaim=True)
+                FRAME_LEDGER.release(_result_frame(live["result"]), reclaim=True)
+            elif spill_path:
+                remove_packed(spill_path)
+            return current
+        finally:
+            entry["lock"].release()
+
+    def _enforce_budget(self, keep: str | None = None) -> None:
+        """Demote least recently used entries, memory tier first, while over budget."""
+        tried: set[str] = {keep}
+        while True:
+            with self._lock:
+                if self._resident() <= self._budget:
+                    return
+                victim = None
+                for tier, target in (("memory", "compressed"), ("compressed", "spilled")):
+                    victim = next((sid for sid in self._lru[tier] if sid not in tried), None)
+                    if victim is not None:
+                        break
+            if victim is None:
+                return
+            tried.add(victim)
+            self._demote(victim, target)
+
+    def _set_packed(self, entry: dict, size: int) -> None:
+        """Update an entry's packed bytes and the store total. Call while holding lock."""
+        self._packed += size - entry["packed_bytes"]
+        entry["packed_bytes"] = size
+
+    def _resident(self) -> int:
+        """Bytes charged to the budget: packed entries plus every live frame in FRAME_LEDGER."""
+        return self._packed + FRAME_LEDGER.bytes
 
     # ──────────────────────────────────────
-    # Eviction
+    # Eviction — background reaper
     # ──────────────────────────────────────
 
-    def _evict_expired(self) -> None:
-        """Remove entries older than SESSION_TTL_SECONDS. Call while holding lock."""
+    def reap(self) -> None:
+        """Expire entries past SESSION_TTL_SECONDS, demote idle ones, re-check the budget."""
         now = time.time()
-        expired = [sid for sid, e in self._frames.items()
-                   if now - e["ts"] > SESSION_TTL_SECONDS]
-        for sid in expired:
-            del self._frames[sid]
-
-    def _evict_oldest(self) -> None:
-        """Remove the oldest entry. Call while holding lock."""
-        if not self._frames:
-            return
-        oldest = min(self._frames, key=lambda sid: self._frames[sid]["ts"])
-        del self._frames[oldest]
+        with self._lock:
+            doomed, self._pending_files = self._pending_files, []
+            while self._expiry:
+                sid = next(iter(self._expiry))
+                if now - self._frames[sid]["ts"] <= SESSION_TTL_SECONDS:
+                    break
+                doomed += self._discard(sid)
+
+            idle = []
+            for sid in self._lru["memory"]:
+                age = now - self._frames[sid]["used"]
+                if age <= SESSION_COMPRESS_IDLE_SECONDS:
+                    break
+                idle.append((sid, "spilled" if age > SESSION_SPILL_IDLE_SECONDS else "compressed"))
+            for sid in self._lru["compressed"]:
+                if now - self._frames[sid]["used"] <= SESSION_SPILL_IDLE_SECONDS:
+                    break
+                idle.append((sid, "spilled"))
+        _delete_paths(doomed)
+        for sid, tier in idle:
+            self._demote(sid, tier)
+        self._enforce_budget()
+
+    def _reap_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.warning(f"[session-reaper] pass failed — {e}")
+
+    def close(self) -> None:
+        """Stop the reaper thread."""
+        self._stop.set()
+
+    def _discard(self, session_id: str) -> list[str]:
+        """
+        Drop an entry; returns the on-disk files and spill directory to
+        delete with _delete_paths once the lock is released. Call while
+        holding lock.
+        """
+        entry  = self._frames.pop(session_id)
+        del self._lru[self._group(entry)][session_id]
+        del self._expiry[session_id]
+        self._packed -= entry["packed_bytes"]
+        if entry["tier"] == "memory":
+            FRAME_LEDGER.release(entry["df"])
+            FRAME_LEDGER.release(_result_frame(entry["result"]))
+        result = entry.get("result") or {}
+        return [p for p in (entry.get("path"), result.get("cleaned_path"), entry["spill_path"]) if p]
+
+    def stats(self) -> dict:
+        """Entry count, resident bytes (shared and cached frames included) and entries per tier."""
+        with self._lock:
+            return {
+                "entries":      len(self._frames),
+                "bytes":        self._resident(),
+                "budget_bytes": self._budget,
+                "tiers":        {tier: len(self._lru[tier]) for tier in TIERS},
+            }
 
     def __len__(self) -> int:
         with self._lock:
             return len(self._frames)
 
 
+def _delete_paths(paths: list[str]) -> None:
+    """Delete files and spill directories of discarded entries (outside the store lock)."""
+    for path in paths:
+        if os.path.isdir(path):
+            remove_packed(path)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionBackend:
+    """Session backend named by SESSION_BACKEND."""
+    if backend == "shared":
+        from app.session_shared import SharedSessionStore
+        return SharedSessionStore()
+    if backend != "memory":
+        raise ValueError(f"Unknown SESSION_BACKEND '{backend}' — use 'memory' or 'shared'.")
+    return SessionStore()
+
+
 # Singleton — imported by all routers
-session_store = SessionStore()
+session_store = create_session_store()
@@ -0,0 +1,327 @@
+"""
+session_shared.py
+=================
+Session backend shared by every worker process on a host
+(SESSION_BACKEND=shared).
+
+With several uvicorn workers, an upload handled by one worker 404'd on
+/clean when the next request landed on another. SharedSessionStore keeps
+sessions where every worker can see them:
+
+  <SESSION_SHARED_DIR>/index.sqlite    one row per session: filename, TTL
+                                       clock, payload directories, files
+  <SESSION_SHARED_DIR>/<session_id>/   uploaded frame and engine result,
+                                       packed as Feather files
+                                       (spill.write_packed), one directory
+                                       per write
+
+An upload or result is packed once, when it is saved. Each worker keeps the
+payloads it has read in a local LRU, keyed by payload directory, and
+evicts from it while session.FRAME_LEDGER — its frames, counted once
+however many sessions share them, and RESULT_CACHE's — is over
+SESSION_MEMORY_BUDGET_MB. Every write gets a new directory, so a worker
+never serves a stale copy and never decodes an unchanged payload twice.
+Stage checkpoints stay per worker, and live as long as the cached frame.
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import pandas as pd
+
+from app.checkpoints import StageCheckpoints
+from app.session import (
+    MAX_SESSIONS, SESSION_MEMORY_BUDGET_BYTES, SESSION_SPILL_DIR, SESSION_TTL_SECONDS,
+    FRAME_LEDGER, SessionBackend, frame_bytes,
+)
+from app.spill import pack, read_packed, remove_packed, write_packed
+
+# ── Config ──
+SESSION_SHARED_DIR     = os.getenv("SESSION_SHARED_DIR", os.path.join(SESSION_SPILL_DIR, "shared"))
+SQLITE_BUSY_TIMEOUT_S  = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id   TEXT PRIMARY KEY,
+    filename     TEXT NOT NULL DEFAULT '',
+    ts           REAL NOT NULL,
+    df_dir       TEXT,
+    result_dir   TEXT,
+    path         TEXT,
+    read_options TEXT,
+    files        TEXT NOT NULL DEFAULT '[]',
+    content_hash TEXT NOT NULL DEFAULT ''
+)
+"""
+
+
+def _frame_of(payload) -> Optional[pd.DataFrame]:
+    """The live frame of a cached payload — the uploaded frame, or a result's cleaned frame."""
+    return payload if isinstance(payload, pd.DataFrame) else payload.get("cleaned_dataframe")
+
+
+class _LocalCache:
+    """Thread-safe LRU of (session_id, payload dir) → decoded payload, bounded by FRAME_LEDGER bytes."""
+
+    def __init__(self, budget_bytes: int, on_evict: Callable[[str], None]):
+        self._lock     = threading.Lock()
+        self._items: OrderedDict[tuple[str, str], tuple[object, int]] = OrderedDict()
+        self._budget   = budget_bytes
+        self._on_evict = on_evict
+        self.bytes     = 0
+
+    def get(self, key: tuple[str, str]):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: tuple[str, str], value, size: int) -> None:
+        FRAME_LEDGER.hold(_frame_of(value), size)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+        if old is not None:
+            FRAME_LEDGER.release(_frame_of(old[0]))
+        while FRAME_LEDGER.bytes > self._budget:
+            with self._lock:
+                if len(self._items) <= 1:
+                    return
+                (sid, _), (payload, freed) = self._items.popitem(last=False)
+                self.bytes -= freed
+            FRAME_LEDGER.release(_frame_of(payload), reclaim=True)
+            self._on_evict(sid)
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            dropped = [self._items.pop(k) for k in [k for k in self._items if k[0] == session_id]]
+            for _, size in dropped:
+                self.bytes -= size
+        for payload, _ in dropped:
+            FRAME_LEDGER.release(_frame_of(payload))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+class SharedSessionStore(SessionBackend):
+    """Sessions in a host-wide directory with a SQLite index, cached per worker."""
+
+    def __init__(self, root: str = SESSION_SHARED_DIR, budget_bytes: int = SESSION_MEMORY_BUDGET_BYTES):
+        os.makedirs(root, exist_ok=True)
+        self._root = root
+        self._lock = threading.Lock()    # guards the connection within this process
+        self._db   = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=SQLITE_BUSY_TIMEOUT_S,
+                                     isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        try:   # index created before content hashes were recorded
+            self._db.execute("ALTER TABLE sessions ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''")
+        except sqlite3.OperationalError:
+            pass
+        self._cache = _LocalCache(budget_bytes, on_evict=self._forget_checkpoints)
+        self._checkpoints: dict[str, StageCheckpoints] = {}
+
+    # ──────────────────────────────────────
+    # DataFrame storage (set on upload)
+    # ──────────────────────────────────────
+
+    def save(self, session_id: str, df: pd.DataFrame, filename: str = "", content_hash: str = "") -> None:
+        """Store a raw DataFrame under session_id."""
+        directory = self._write_payload(session_id, "df", df)
+        self._insert(session_id, filename=filename, df_dir=directory, content_hash=content_hash)
+        self._cache.put((session_id, directory), df, frame_bytes(df))
+
+    def save_file(self, session_id: str, path: str, filename: str = "", read_options: dict | None = None) -> None:
+        """Store an on-disk CSV (streamed upload) under session_id, with its read_csv options."""
+        self._insert(session_id, filename=filename, path=path,
+                     read_options=json.dumps(dict(read_options or {})))
+
+    def get_file(self, session_id: str) -> Optional[dict]:
+        """{path, read_options} of an on-disk session, or None."""
+        row = self._live_row(session_id)
+        if row is None or not row["path"]:
+            return None
+        return {"path": row["path"], "read_options": json.loads(row["read_options"] or "{}")}
+
+    def get_filename(self, session_id: str) -> str:
+        row = self._row(session_id)
+        return row["filename"] if row else ""
+
+    def get_content_hash(self, session_id: str) -> str:
+        row = self._row(session_id)
+        return row["content_hash"] if row else ""
+
+    def get_df(self, session_id: str) -> Optional[pd.DataFrame]:
+        """Retrieve the raw DataFrame. Returns None if not found or expired."""
+        return self._load(session_id, "df_dir", check_ttl=True, size=frame_bytes)
+
+    def get_checkpoints(self, session_id: str) -> Optional[StageCheckpoints]:
+        """This worker's stage checkpoints for a session, or None."""
+        row = self._row(session_id)
+        if row is None or not row["df_dir"]:
+            return None
+        with self._lock:
+            return self._checkpoints.setdefault(session_id, StageCheckpoints())
+
+    # ──────────────────────────────────────
+    # Engine result cache (set on /clean)
+    # ──────────────────────────────────────
+
+    def save_result(self, session_id: str, result: dict) -> None:
+        """Cache the engine result so /report doesn't re-run the pipeline (on any worker)."""
+        directory = self._write_payload(session_id, "result", result)
+        files = [result["cleaned_path"]] if result.get("cleaned_path") else []
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT result_dir FROM sessions WHERE session_id = ?",
+                                       (session_id,)).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE sessions SET result_dir = ?, ts = ?, files = ? WHERE session_id = ?",
+                        (directory, time.time(), json.dumps(files), session_id),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            remove_packed(directory)
+            return
+        if row["result_dir"]:
+            remove_packed(row["result_dir"])
+        self._cache.put((session_id, directory), result,
+                        frame_bytes(result.get("cleaned_dataframe")))
+
+    def get_result(self, session_id: str) -> Optional[dict]:
+        """Retrieve a cached engine result. Returns None if not found or expired."""
+        return self._load(session_id, "result_dir", check_ttl=True,
+                          size=lambda r: frame_bytes(r.get("cleaned_dataframe")))
+
+    # ──────────────────────────────────────
+    # Index and payloads
+    # ──────────────────────────────────────
+
+    def _row(self, session_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute("SELECT * FROM sessions WHERE session_id = ?",
+                                    (session_id,)).fetchone()
+
+    def _live_row(self, session_id: str) -> Optional[sqlite3.Row]:
+        """The session's row, or None if it is missing or expired (and then discarded)."""
+        row = self._row(session_id)
+        if row is not None and time.time() - row["ts"] > SESSION_TTL_SECONDS:
+            with self._lock:
+                doomed = self._delete(["session_id = ?"], (session_id,))
+            self._remove(doomed)
+            return None
+        return row
+
+    def _load(self, session_id: str, column: str, check_ttl: bool, size: Callable):
+        """Payload in `column` of a session, from this worker's cache or disk."""
+        for _ in range(2):   # a concurrent write may replace the directory under us
+            row = self._live_row(session_id) if check_ttl else self._row(session_id)
+            if row is None or not row[column]:
+                return None
+            key = (session_id, row[column])
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+            try:
+                value = read_packed(row[column])
+            except OSError:
+                continue
+            self._cache.put(key, value, size(value))
+            return value
+        return None
+
+    def _write_payload(self, session_id: str, kind: str, obj) -> str:
+        directory = os.path.join(self._root, session_id, f"{kind}-{secrets.token_hex(6)}")
+        write_packed(pack(obj), directory)
+        return directory
+
+    def _insert(self, session_id: str, **fields) -> None:
+        """(Re)create a session row, evicting expired and excess sessions."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                doomed = self._delete(["ts < ?", "session_id = ?"], (now - SESSION_TTL_SECONDS, session_id))
+                (count,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+                if count >= MAX_SESSIONS:
+                    doomed += self._delete(
+                        ["session_id IN (SELECT session_id FROM sessions ORDER BY ts LIMIT ?)"],
+                        (count - MAX_SESSIONS + 1,),
+                    )
+                self._db.execute(
+                    "INSERT INTO sessions (session_id, filename, ts, df_dir, path, read_options, content_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, fields.get("filename", ""), now, fields.get("df_dir"),
+                     fields.get("path"), fields.get("read_options"), fields.get("content_hash", "")),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        self._remove(doomed)
+
+    def _delete(self, conditions: list[str], params: tuple) -> list[tuple[str, str | None, list]]:
+        """Delete rows matching any condition; returns what to clean up. Call while holding lock."""
+        where = " OR ".join(f"({c})" for c in conditions)
+        rows = self._db.execute(f"SELECT session_id, df_dir, result_dir, path, files FROM sessions WHERE {where}",
+                                params).fetchall()
+        self._db.execute(f"DELETE FROM sessions WHERE {where}", params)
+        return [(r["session_id"], r["df_dir"], [r["result_dir"], r["path"], *json.loads(r["files"])])
+                for r in rows]
+
+    def _remove(self, doomed: list[tuple[str, str | None, list]]) -> None:
+        """Delete payload directories and files of discarded sessions, and forget them locally."""
+        for session_id, df_dir, others in doomed:
+            self._cache.drop(session_id)
+            self._forget_checkpoints(session_id)
+            for path in (df_dir, *others):
+                if not path:
+                    continue
+                if os.path.isdir(path):
+                    remove_packed(path)
+                else:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            try:
+                os.rmdir(os.path.join(self._root, session_id))   # only if now empty
+            except OSError:
+                pass
+
+    def _forget_checkpoints(self, session_id: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(session_id, None)
+
+    def stats(self) -> dict:
+        """Sessions in the shared index and bytes cached by this worker."""
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {
+            "entries": count,
+            "bytes":   self._cache.bytes,
+            "cached":  len(self._cache),
+            "backend": "shared",
+        }
+
+    def __len__(self) -> int:
+        return self.stats()["entries"]
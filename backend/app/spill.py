@@ -0,0 +1,151 @@
+"""
+spill.py
+========
+Compact encodings of session payloads for the tiered SessionStore.
+
+pack() pickles a payload (any picklable object — the store passes
+{"df", "result"}) but hands every DataFrame inside it to its own frame
+encoder, so the bulk of the bytes is stored columnar:
+
+  - "feather" — Arrow IPC with zstd compression (needs pyarrow)
+  - "pickle"  — pickle + zlib, for frames Arrow can't represent (mixed
+                object columns, non-string headers) or when pyarrow is
+                not installed
+
+A frame referenced twice (e.g. result["cleaned_dataframe"] and the
+LazyEDA built on it) is stored once and comes back as one object.
+
+A Packed lives in memory (the "compressed" tier) or is written to a
+directory with write_packed() (the "spilled" tier): one .feather / .pkl
+file per frame plus payload.pkl. Round trips keep dtypes, categories and
+the index; missing values in object columns come back as None.
+
+The engine process pool (engine_pool.py) ships frames to and from its
+workers with the same encoding, uncompressed.
+"""
+
+import io
+import os
+import pickle
+import shutil
+import zlib
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:    # optional — frames fall back to compressed pickle
+    pa = None
+    feather = None
+
+# ── Config ──
+FEATHER_COMPRESSION = "zstd"
+PICKLE_ZLIB_LEVEL   = 1          # speed over ratio — this runs on the request path
+
+_EXTENSIONS = {"feather": ".feather", "pickle": ".pkl"}
+
+
+@dataclass
+class Packed:
+    """A pickled payload plus its DataFrames, each encoded as (format, bytes)."""
+    payload: bytes
+    frames:  dict[int, tuple[str, bytes]] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.payload) + sum(len(data) for _, data in self.frames.values())
+
+
+def encode_frame(df: pd.DataFrame, compression: str = FEATHER_COMPRESSION) -> tuple[str, bytes]:
+    if feather is not None:
+        try:
+            buf = io.BytesIO()
+            table = pa.Table.from_pandas(df, preserve_index=None)   # RangeIndex as metadata
+            feather.write_feather(table, buf, compression=compression)
+            return "feather", buf.getvalue()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    raw = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    return "pickle", zlib.compress(raw, PICKLE_ZLIB_LEVEL)
+
+
+def decode_frame(fmt: str, data: bytes) -> pd.DataFrame:
+    if fmt == "feather":
+        return feather.read_table(pa.BufferReader(data)).to_pandas()
+    return pickle.loads(zlib.decompress(data))
+
+
+class _FramePickler(pickle.Pickler):
+    def __init__(self, file, frames: dict[int, tuple[str, bytes]], compression: str):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._frames = frames
+        self._compression = compression
+        self._ids: dict[int, int] = {}
+        self._keep: list = []    # keep frames alive so id() stays unique while pickling
+
+    def persistent_id(self, obj):
+        if type(obj) is not pd.DataFrame:
+            return None
+        key = self._ids.get(id(obj))
+        if key is None:
+            key = self._ids[id(obj)] = len(self._frames)
+            self._frames[key] = encode_frame(obj, self._compression)
+            self._keep.append(obj)
+        return ("frame", key)
+
+
+class _FrameUnpickler(pickle.Unpickler):
+    def __init__(self, file, load_frame):
+        super().__init__(file)
+        self._load = load_frame
+        self._loaded: dict[int, pd.DataFrame] = {}
+
+    def persistent_load(self, pid):
+        _, key = pid
+        if key not in self._loaded:
+            self._loaded[key] = self._load(key)
+        return self._loaded[key]
+
+
+def pack(obj, compression: str = FEATHER_COMPRESSION) -> Packed:
+    """Encode `obj`, storing each DataFrame in it columnar (Feather `compression`)."""
+    frames: dict[int, tuple[str, bytes]] = {}
+    buf = io.BytesIO()
+    _FramePickler(buf, frames, compression).dump(obj)
+    return Packed(payload=buf.getvalue(), frames=frames)
+
+
+def unpack(packed: Packed):
+    return _FrameUnpickler(io.BytesIO(packed.payload),
+                           lambda key: decode_frame(*packed.frames[key])).load()
+
+
+def write_packed(packed: Packed, directory: str) -> int:
+    """Write `packed` to `directory` (created); returns bytes written."""
+    os.makedirs(directory, exist_ok=True)
+    for key, (fmt, data) in packed.frames.items():
+        with open(os.path.join(directory, f"frame{key}{_EXTENSIONS[fmt]}"), "wb") as f:
+            f.write(data)
+    with open(os.path.join(directory, "payload.pkl"), "wb") as f:
+        f.write(packed.payload)
+    return packed.nbytes
+
+
+def read_packed(directory: str):
+    """Decode a payload written by write_packed()."""
+    def _load(key: int) -> pd.DataFrame:
+        for fmt, ext in _EXTENSIONS.items():
+            path = os.path.join(directory, f"frame{key}{ext}")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return decode_frame(fmt, f.read())
+        raise FileNotFoundError(f"frame {key} missing from {directory}")
+
+    with open(os.path.join(directory, "payload.pkl"), "rb") as f:
+        return _FrameUnpickler(f, _load).load()
+
+
+def remove_packed(directory: str) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,988 @@
+"""
+streaming.py
+============
+Out-of-core, two-pass cleaning for CSV files larger than memory.
+
+EnterpriseDataEngine needs the whole frame in memory. StreamingCleaner
+reads the file in chunks of `chunk_rows` rows instead, and holds one
+chunk, a set of bounded, mergeable sketches per column, and the row
+hashes of duplicate removal (RowHashSet: 8 bytes per distinct row, at
+most ROW_HASHES_IN_MEMORY of them in memory — the rest are written next
+to the input file and searched memory-mapped):
+
+  Pass 1 — profile
+    Every chunk goes through the engine's own header, string, unit and
+    category stages, then duplicate removal against the rows seen so far.
+    Per column it merges type evidence (date / numeric / boolean parse
+    counts), a capped value tally (ValueTally) and numeric sketches
+    (NumericSketch). From these it fixes one ColumnPlan per column: the
+    type, the drop decision, fill values, outlier bounds and fuzzy remap.
+
+  Pass 2 — transform
+    The file is read again, each chunk is prepared the same way and the
+    fixed plans are applied. Cleaned chunks are appended to the output
+    CSV as they are produced.
+
+Decisions follow the in-memory engine, with these differences:
+  - Columns are read as strings, so every column takes the string path
+    through type inference (native numeric dtypes do not exist here)
+  - Date format plans are chosen on the first chunk a column has dates in
+  - Quantiles (median fill, IQR bounds) are exact for columns with up to
+    TALLY_MAX_DISTINCT distinct numbers; above that they come from a
+    RESERVOIR_SIZE reservoir sample and are approximate
+  - Modes and unique counts are exact up to TALLY_MAX_DISTINCT distinct
+    values per column; beyond that the distinct count is a KMV estimate
+  - outlier_action="remove" uses bounds fixed in pass 1, so it does not
+    re-derive later columns' statistics after earlier removals
+  - Duplicate removal compares 64-bit row hashes, so two distinct rows
+    whose hashes collide (about one pair in 10^19) count as duplicates
+  - The EDA report is the overview only (no summary/correlation sections)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from .config import CleaningConfig
+from .dates import DATE_FORMAT_MEMO, DateParseCache, DatePlan, feed_signature
+from .engine import EnterpriseDataEngine, _DictEncoded, _changed, _json_safe, _pct
+from .fuzzy_cache import FUZZY_CLUSTER_CACHE
+from .profiling import ROW_KEY_MIN_ROWS
+from .utils import (
+    FREE_TEXT_AVG_WORDS,
+    FREE_TEXT_UNIQUE_RATIO,
+    fuzzy_remap,
+    normalise_percentage,
+    normalise_phone,
+    sanitize_numeric,
+)
+
+logger = logging.getLogger(__name__)
+
+# ── Config ──
+CHUNK_ROWS         = 100_000   # rows per chunk in both passes
+RESERVOIR_SIZE     = 100_000   # sampled values per numeric column for quantiles
+TALLY_MAX_DISTINCT = 20_000    # exact value counts kept per column
+KMV_K              = 4096      # hashes kept for distinct-count estimates
+ROW_HASHES_IN_MEMORY = 4_000_000   # duplicate-removal hashes held in memory before spilling (32 MB)
+
+# Memory estimate of a run (StreamingCleaner.estimate_bytes), for admission
+CELL_BYTES        = 64    # one cell of a chunk read as str: a short str object and its pointer
+CHUNK_COPIES      = 3     # raw chunk, the engine's working frame, the cleaned output
+TALLY_ENTRY_BYTES = 160   # one ValueTally / histogram entry: dict slot, key object, count
+
+# Audit fields summed when per-chunk entries are merged
+_SUMMED_FIELDS = {"placeholders_nulled", "cells_affected", "cells_remapped", "pattern_hits"}
+
+
+# ─────────────────────────────────────────────
+# Mergeable sketches
+# ─────────────────────────────────────────────
+
+class ValueTally:
+    """
+    Value counts of one column merged across chunks. Exact until the
+    column has more than `max_distinct` distinct values; after that only
+    already-seen values keep counting and distinct_count falls back to a
+    k-minimum-values estimate over 64-bit hashes.
+    """
+
+    def __init__(self, max_distinct: int = TALLY_MAX_DISTINCT, k: int = KMV_K):
+        self.counts: Counter = Counter()
+        self.overflow = False
+        self.non_null = 0
+        self.words    = 0
+        self._max     = max_distinct
+        self._k       = k
+        self._kmv     = np.empty(0, dtype="uint64")
+
+    def update(self, values: pd.Series) -> None:
+        """Add the non-null values of a chunk (compared as strings)."""
+        vc = values.dropna().astype(str).value_counts(sort=False)
+        if vc.empty:
+            return
+        keys, counts = vc.index, vc.to_numpy()
+        self.non_null += int(counts.sum())
+        self.words    += int((keys.str.split().str.len().to_numpy() * counts).sum())
+
+        hashes    = pd.util.hash_array(keys.to_numpy(dtype=object))
+        self._kmv = np.unique(np.concatenate([self._kmv, hashes]))[:self._k]
+
+        if self.overflow:
+            for key, n in zip(keys, counts.tolist()):
+                if key in self.counts:
+                    self.counts[key] += n
+            return
+        self.counts.update(dict(zip(keys, counts.tolist())))
+        if len(self.counts) > self._max:
+            self.overflow = True
+
+    @property
+    def distinct_count(self) -> int:
+        if not self.overflow:
+            return len(self.counts)
+        kth = float(self._kmv[-1]) / 2.0 ** 64
+        return int((self._k - 1) / kth) if kth > 0 else len(self.counts)
+
+    @property
+    def all_distinct(self) -> bool:
+        """No value repeats (within the KMV error once overflowed)."""
+        if any(n > 1 for n in self.counts.values()):
+            return False
+        if not self.overflow:
+            return True
+        return self.distinct_count >= self.non_null * (1 - 3 / math.sqrt(self._k))
+
+    @property
+    def top_freq(self) -> float:
+        if not self.non_null:
+            return 0.0
+        return max(self.counts.values(), default=0) / self.non_null
+
+    def mode(self, remap: dict | None = None) -> Any:
+        """Most frequent value after `remap`; ties go to the smallest, as Series.mode()."""
+        counts = self.counts
+        if remap:
+            counts = Counter()
+            for value, n in self.counts.items():
+                counts[remap.get(value, value)] += n
+        if not counts:
+            return np.nan
+        top = max(counts.values())
+        return min(v for v, n in counts.items() if n == top)
+
+
+class NumericSketch:
+    """
+    Count, mean and variance (Chan's parallel update), min/max, an exact
+    value histogram while the column has at most TALLY_MAX_DISTINCT
+    distinct values, and a bottom-k random-key reservoir sample of `size`
+    values. Quantiles are exact from the histogram (or from the sample
+    while it still holds every value), approximate otherwise.
+    """
+
+    def __init__(self, size: int = RESERVOIR_SIZE, seed: int = 42):
+        self.count    = 0
+        self.mean     = 0.0
+        self.m2       = 0.0
+        self.min      = math.inf
+        self.max      = -math.inf
+        self.integral = True
+        self._size    = size
+        self._rng     = np.random.default_rng(seed)
+        self._keys    = np.empty(0)
+        self._sample  = np.empty(0)
+        self._hist: Counter | None = Counter()
+
+    def update(self, values: np.ndarray) -> None:
+        """Add the non-null float values of a chunk."""
+        values = np.asarray(values, dtype="float64")
+        n = len(values)
+        if n == 0:
+            return
+        mean  = float(values.mean())
+        m2    = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2   += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min   = min(self.min, float(values.min()))
+        self.max   = max(self.max, float(values.max()))
+        self.integral = self.integral and bool((values % 1 == 0).all())
+
+        keys   = np.concatenate([self._keys, self._rng.random(n)])
+        sample = np.concatenate([self._sample, values])
+        if len(keys) > self._size:
+            keep   = np.argpartition(keys, self._size)[:self._size]
+            keys, sample = keys[keep], sample[keep]
+        self._keys, self._sample = keys, sample
+
+        if self._hist is not None:
+            distinct, counts = np.unique(values, return_counts=True)
+            self._hist.update(dict(zip(distinct.tolist(), counts.tolist())))
+            if len(self._hist) > TALLY_MAX_DISTINCT:
+                self._hist = None
+
+    def quantiles(self, qs: list[float], fill: float | None = None, fill_count: int = 0) -> list[float]:
+        """
+        Linear-interpolated quantiles (as Series.quantile) of the column
+        after `fill_count` missing values are filled with `fill`.
+        """
+        if not self.count:
+            return [np.nan] * len(qs)
+        if self._hist is not None:
+            weights = Counter(self._hist)
+        else:
+            weights = Counter(self._sample.tolist())
+            fill_count = int(round(fill_count * len(self._sample) / self.count))   # sample units
+        if fill is not None and fill_count:
+            weights[float(fill)] += fill_count
+
+        values = np.array(sorted(weights))
+        ranks  = np.cumsum([weights[v] for v in values])   # last rank (exclusive) of each value
+        size   = int(ranks[-1])
+
+        def _value(rank: int) -> float:
+            return float(values[np.searchsorted(ranks, rank, side="right")])
+
+        out = []
+        for q in qs:
+            h  = (size - 1) * q
+            lo = int(math.floor(h))
+            hi = min(lo + 1, size - 1)
+            out.append(_value(lo) + (h - lo) * (_value(hi) - _value(lo)))
+        return out
+
+    def moments(self, fill: float | None = None, fill_count: int = 0) -> tuple[float, float]:
+        """(mean, std with ddof=1) after `fill_count` missing values are filled with `fill`."""
+        count, mean, m2 = self.count, self.mean, self.m2
+        if fill is not None and fill_count:
+            total = count + fill_count
+            delta = fill - mean
+            mean += delta * fill_count / total
+            m2   += delta ** 2 * count * fill_count / total
+            count = total
+        std = math.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        return (mean if count else np.nan), std
+
+
+class RowHashSet:
+    """
+    The 64-bit row hashes seen so far, for duplicate removal across chunks.
+    Hashes are kept in sorted NumPy runs, 8 bytes each (a Python set of
+    ints costs ~70); runs of similar size are merged, so there are at most
+    log2(rows / chunk_rows) of them. With a `spill_dir`, once
+    `memory_hashes` hashes are held in memory they are merged into one run
+    written to a .npy file there and searched memory-mapped from then on:
+    resident memory stays under 16 bytes × memory_hashes (a merge briefly
+    holds two copies), and the spilled runs are page cache the OS can
+    reclaim. close() deletes the files.
+    """
+
+    def __init__(self, spill_dir: str | None = None, memory_hashes: int = ROW_HASHES_IN_MEMORY):
+        self.size     = 0
+        self._runs:    list[np.ndarray] = []   # in memory, largest first
+        self._spilled: list[np.ndarray] = []   # memory-mapped
+        self._spill_dir = spill_dir
+        self._tmp_dir: str | None = None
+        self._memory  = memory_hashes
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Mask of `hashes` seen neither before nor earlier in the array; those are added."""
+        hashes = np.asarray(hashes, dtype="uint64")
+        order  = np.argsort(hashes, kind="stable")   # sorted lookups walk each run once
+        ranked = hashes[order]
+        new    = np.ones(len(ranked), dtype=bool)
+        new[1:] = ranked[1:] != ranked[:-1]          # stable: the first occurrence is kept
+        for run in self._spilled + self._runs:
+            new &= ~_sorted_contains(run, ranked)
+        if new.any():
+            self._push(ranked[new])
+        keep = np.empty(len(hashes), dtype=bool)
+        keep[order] = new
+        return keep
+
+    def __enter__(self) -> "RowHashSet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._runs, self._spilled, self.size = [], [], 0
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def _push(self, run: np.ndarray) -> None:
+        self.size += len(run)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind="stable")   # merges two sorted runs
+        self._runs.append(run)
+        if self._spill_dir is not None and sum(len(r) for r in self._runs) >= self._memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        run = np.sort(np.concatenate(self._runs), kind="stable")
+        self._runs = []
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="row_hashes_", dir=self._spill_dir)
+        path = os.path.join(self._tmp_dir, f"{len(self._spilled)}.npy")
+        np.save(path, run)
+        self._spilled.append(np.load(path, mmap_mode="r"))
+
+
+def _sorted_contains(run: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Which of `values` are in the sorted array `run`."""
+    pos = np.searchsorted(run, values)
+    found = pos < len(run)
+    found[found] = run[pos[found]] == values[found]
+    return found
+
+
+# ─────────────────────────────────────────────
+# Per-column evidence and plans
+# ─────────────────────────────────────────────
+
+@dataclass
+class _Evidence:
+    """Everything pass 1 learns about one column."""
+    tally:       ValueTally    = field(default_factory=ValueTally)
+    numeric:     NumericSketch = field(default_factory=NumericSketch)
+    dates:       NumericSketch = field(default_factory=NumericSketch)
+    bools:       Counter       = field(default_factory=Counter)
+    gate_hits:   int  = 0
+    date_hits:   int  = 0
+    integer_key: bool = True
+    phone_cells: int  = 0
+    percentage:  bool = False
+
+
+@dataclass
+class ColumnPlan:
+    """The fixed transform pass 2 applies to one column."""
+    kind:       str                  # id | free_text | numeric | datetime | boolean | categorical
+    dropped:    bool  = False
+    confidence: float | None = None
+    missing:    float = 0.0          # missing ratio before imputation
+    fill:       Any   = None
+    n_filled:   int   = 0
+    remap:      dict  = field(default_factory=dict)
+    lower:      float | None = None  # outlier detection bounds (numeric only)
+    upper:      float | None = None
+    cap:        tuple[float, float] | None = None   # IQR winsorising bounds
+
+
+class StreamingCleaner:
+    """
+    Two-pass cleaner for a CSV on disk.
+
+    Parameters
+    ----------
+    path       : Input CSV
+    config     : CleaningConfig instance (same thresholds as the engine)
+    chunk_rows : Rows per chunk
+    read_options : Extra pd.read_csv options (sep, encoding, ...)
+    progress   : Optional callable receiving progress event dicts — pass 1
+                 ("profile") covers 0-45%, pass 2 ("transform") 45-90%, by
+                 bytes read, with the input rows read so far; the report 95%
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: CleaningConfig | None = None,
+        chunk_rows: int = CHUNK_ROWS,
+        read_options: dict | None = None,
+        progress: Callable[[dict], None] | None = None,
+    ):
+        self.path       = path
+        self.config     = config or CleaningConfig()
+        self.chunk_rows = chunk_rows
+        self._read_options = dict(read_options or {})
+        self._progress  = progress
+        self.audit_log: list[dict] = []
+        self.column_quality: list[dict] = []
+        self._started_at = datetime.utcnow()
+
+        self._raw_columns: list = []
+        self._feed = ""
+        self._rename: dict = {}
+        self._empty: list = []
+        self._name_ids: set[str] = set()
+        self._date_plans: dict[str, DatePlan] = {}
+        self._date_cache = DateParseCache()
+        self._raw_rows = 0
+        self._rows     = 0     # after duplicate removal
+        self._chunks   = 0
+        self._evidence: dict[str, _Evidence] = {}
+        self._plans:    dict[str, ColumnPlan] = {}
+        self._stage_log: list[dict] = []
+
+    # ──────────────────────────────────────────
+    # Shared chunk preparation (both passes)
+    # ──────────────────────────────────────────
+
+    def _chunks_of(self):
+        """(chunk, share of the file read so far) for every chunk of the input."""
+        size = os.path.getsize(self.path) or 1
+        with open(self.path, "rb") as fh:
+            for chunk in pd.read_csv(
+                fh,
+                chunksize=self.chunk_rows,
+                dtype=str,
+                skipinitialspace=True,
+                on_bad_lines="warn",
+                **self._read_options,
+            ):
+                yield chunk, min(1.0, fh.tell() / size)
+
+    def _emit(self, stage: str, percent: float, **fields) -> None:
+        """Report progress; a failing callback never fails the run."""
+        if self._progress is None:
+            return
+        try:
+            self._progress({"stage": stage, "percent": round(percent, 1), **fields})
+        except Exception as e:
+            logger.warning(f"progress callback failed — {e}")
+
+    def estimate_bytes(self) -> int:
+        """
+        Estimated peak memory of run(): CHUNK_COPIES of a chunk, every
+        column's sketches at their caps (both passes' tallies, a numeric and
+        a date sketch) and the row hashes RowHashSet holds in memory.
+        """
+        columns  = len(pd.read_csv(self.path, nrows=0, **self._read_options).columns)
+        chunk    = self.chunk_rows * columns * CELL_BYTES * CHUNK_COPIES
+        sketches = columns * (4 * TALLY_MAX_DISTINCT * TALLY_ENTRY_BYTES + 2 * RESERVOIR_SIZE * 16)
+        return chunk + sketches + 16 * ROW_HASHES_IN_MEMORY
+
+    def _row_hashes(self) -> RowHashSet:
+        """Duplicate-removal state of one pass; spilled runs go next to the input file."""
+        return RowHashSet(spill_dir=os.path.dirname(os.path.abspath(self.path)))
+
+    def _prepare(self, chunk: pd.DataFrame, seen: RowHashSet) -> tuple[pd.DataFrame, EnterpriseDataEngine]:
+        """
+        Headers, string normalisation, unit stripping and category
+        harmonisation through a chunk-sized engine, then duplicate removal
+        against every row hash in `seen`.
+        """
+        chunk  = chunk.rename(columns=self._rename)
+        engine = EnterpriseDataEngine(chunk, self.config)
+        engine._pre_identified_id_cols = self._name_ids
+        engine._feed       = self._feed
+        engine._date_plans = self._date_plans
+        engine._date_cache = self._date_cache
+        engine.normalise_strings()
+        engine.strip_units()
+        engine.harmonise_categories()
+
+        keep = seen.add(pd.util.hash_pandas_object(engine.df, index=False).to_numpy())
+        return engine.df[keep].reset_index(drop=True), engine
+
+    def _column_values(self, df: pd.DataFrame, col: str) -> tuple[pd.Series, int, bool]:
+        """Phone and percentage normalisation, as process_column does before typing."""
+        series, phone_cells = df[col], 0
+        if EnterpriseDataEngine._PHONE_COL.search(col):
+            enc    = _DictEncoded(series)
+            before = enc.map(normalise_phone)
+            phone_cells = enc.cells(_changed(before, enc.uniques))
+            if phone_cells:
+                series = enc.decode()
+        converted, was_pct = normalise_percentage(series)
+        if was_pct:
+            series = converted.astype(float)
+        return series, phone_cells, was_pct
+
+    # ──────────────────────────────────────────
+    # Pass 1 — profile
+    # ──────────────────────────────────────────
+
+    def profile(self) -> None:
+        raw_non_null: Counter = Counter()
+        with self._row_hashes() as seen:
+            for chunk, read in self._chunks_of():
+                if not self._raw_columns:
+                    self._raw_columns = list(chunk.columns)
+                    self._feed = feed_signature(self._raw_columns)
+                    self._rename = EnterpriseDataEngine._header_rename_map(self._raw_columns)
+                    probe = EnterpriseDataEngine(chunk.head(1), self.config)
+                    self._name_ids = {
+                        self._rename.get(col, col) for col in self._raw_columns
+                        if probe._is_id_name(self._rename.get(col, col))
+                    }
+                self._chunks   += 1
+                self._raw_rows += len(chunk)
+                raw_non_null.update(chunk.notna().sum().to_dict())
+
+                df, engine = self._prepare(chunk, seen)
+                self._stage_log.extend(engine.audit_log)
+                self._rows += len(df)
+                for col in df.columns:
+                    self._observe(engine, df, col)
+                self._emit("profile", 45 * read, rows=self._raw_rows)
+
+        if not self._raw_columns:
+            raise ValueError("Input file is empty")
+        self._empty = [col for col in self._raw_columns if not raw_non_null[col]]
+        self._plan_columns()
+
+    def _observe(self, engine: EnterpriseDataEngine, df: pd.DataFrame, col: str) -> None:
+        ev = self._evidence.setdefault(col, _Evidence())
+        if col in self._name_ids:
+            ev.tally.update(df[col])
+            return
+        series, phone_cells, was_pct = self._column_values(df, col)
+        ev.phone_cells += phone_cells
+        ev.percentage  |= was_pct
+
+        non_null = series.dropna()
+        if non_null.empty:
+            return
+        ev.tally.update(non_null)
+        as_num = pd.to_numeric(non_null, errors="coerce")
+        ev.integer_key = ev.integer_key and bool(as_num.notna().all() and (as_num == as_num.round()).all())
+
+        n = len(non_null)
+        gate_hits = int(round(engine._date_gate_ratio(non_null) * n))
+        ev.gate_hits += gate_hits
+        if gate_hits:
+            _, date_try = engine._evaluate_datetime(series.rename(col), n)
+            parsed = date_try.dropna()
+            ev.date_hits += len(parsed)
+            ev.dates.update(parsed.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64"))
+
+        numeric = sanitize_numeric(series).dropna()
+        ev.numeric.update(numeric.to_numpy(dtype="float64"))
+
+        ev.bools.update(series.astype(str).str.lower().map(engine._BOOL_MAP).dropna().tolist())
+
+    def _plan_columns(self) -> None:
+        probe = EnterpriseDataEngine(pd.DataFrame({"_": [0]}), self.config)
+        cfg   = self.config
+        rows  = max(self._rows, 1)
+        for col, ev in self._evidence.items():
+            if col in {self._rename.get(c, c) for c in self._empty}:
+                continue
+            tally = ev.tally
+            n     = tally.non_null
+
+            if col in self._name_ids or (
+                n >= ROW_KEY_MIN_ROWS and ev.integer_key and tally.all_distinct
+            ):
+                self._plans[col] = ColumnPlan(kind="id")
+                continue
+
+            if EnterpriseDataEngine._FREETEXT_COL.search(col) or (
+                n > 0 and tally.distinct_count / n > FREE_TEXT_UNIQUE_RATIO
+                and tally.words / n > FREE_TEXT_AVG_WORDS
+            ):
+                self._plans[col] = ColumnPlan(kind="free_text", missing=(rows - n) / rows)
+                continue
+
+            kind, hits = "categorical", n
+            if n:
+                if (ev.gate_hits / n >= probe._DATE_GATE
+                        and ev.date_hits / n >= probe._datetime_threshold()):
+                    kind, hits = "datetime", ev.date_hits
+                elif ev.numeric.count / n >= cfg.numeric_confidence_weak:
+                    kind, hits = "numeric", ev.numeric.count
+                elif sum(ev.bools.values()) / n >= probe._BOOL_CONFIDENCE:
+                    kind, hits = "boolean", sum(ev.bools.values())
+
+            plan = ColumnPlan(
+                kind=kind,
+                confidence=round(hits / n, 4) if n and kind != "categorical" else None,
+                missing=(rows - hits) / rows,
+                n_filled=rows - hits,
+            )
+            self._plans[col] = plan
+            if kind != "boolean" and plan.missing > cfg.missing_drop_threshold:
+                plan.dropped = True
+                continue
+            getattr(self, f"_plan_{kind}")(plan, ev)
+
+    def _plan_numeric(self, plan: ColumnPlan, ev: _Evidence) -> None:
+        sketch   = ev.numeric
+        strategy = self.config.impute_numeric_strategy
+        if strategy == "mean":
+            raw = sketch.mean
+        elif strategy == "zero":
+            raw = 0.0
+        else:
+            raw = sketch.quantiles([0.5])[0]
+        if sketch.count:
+            plan.fill = int(round(raw)) if sketch.integral else round(raw, 4)
+
+        if not sketch.count:
+            return
+        fill = plan.fill if plan.n_filled else None
+        # Capping always winsorises to the IQR bounds, whatever the detection method
+        q1, q3 = sketch.quantiles([0.25, 0.75], fill, plan.n_filled)
+        iqr = q3 - q1
+        plan.cap = (q1 - self.config.outlier_iqr_multiplier * iqr,
+                    q3 + self.config.outlier_iqr_multiplier * iqr)
+        if getattr(self.config, "outlier_method", "iqr") == "zscore":
+            mean, std = sketch.moments(fill, plan.n_filled)
+            if std and not math.isnan(std):
+                spread = self.config.outlier_zscore_threshold * std
+                plan.lower, plan.upper = mean - spread, mean + spread
+        else:
+            plan.lower, plan.upper = plan.cap
+
+        # min/max are exact, so bounds no value crosses mean no outliers
+        # (and no <col>_is_outlier column, as in the engine)
+        lo, hi = sketch.min, sketch.max
+        if fill is not None:
+            lo, hi = min(lo, fill), max(hi, fill)
+        if plan.lower is not None and plan.lower <= lo and hi <= plan.upper:
+            plan.lower = plan.upper = None
+
+    def _plan_datetime(self, plan: ColumnPlan, ev: _Evidence) -> None:
+        sketch   = ev.dates
+        strategy = getattr(self.config, "impute_datetime_strategy", "median")
+        if strategy == "median":
+            plan.fill = pd.Timestamp(int(sketch.quantiles([0.5])[0]))
+        elif strategy == "min":
+            plan.fill = pd.Timestamp(int(sketch.min))
+        elif strategy == "max":
+            plan.fill = pd.Timestamp(int(sketch.max))
+        else:
+            plan.fill = pd.Timestamp(getattr(self.config, "datetime_fill_value", "2000-01-01"))
+
+    def _plan_boolean(self, plan: ColumnPlan, ev: _Evidence) -> None:
+        if ev.bools:
+            top = max(ev.bools.values())
+            plan.fill = min(v for v, n in ev.bools.items() if n == top)
+
+    def _plan_categorical(self, plan: ColumnPlan, ev: _Evidence) -> None:
+        fuzz_threshold = getattr(self.config, "fuzzy_threshold", 0.82)
+        if fuzz_threshold > 0 and not ev.tally.overflow:
+            plan.remap = fuzzy_remap(
+                ev.tally.counts,
+                threshold=fuzz_threshold,
+                max_unique=getattr(self.config, "fuzzy_max_unique", 1000),
+                cache=FUZZY_CLUSTER_CACHE,
+                max_pairs=getattr(self.config, "fuzzy_max_pairs", 20000),
+            )
+        if self.config.impute_categorical_strategy == "mode":
+            plan.fill = ev.tally.mode(plan.remap)
+
+    # ──────────────────────────────────────────
+    # Pass 2 — transform and write
+    # ──────────────────────────────────────────
+
+    def write(self, out_path: str) -> None:
+        empty = [self._rename.get(c, c) for c in self._empty]
+        action = getattr(self.config, "outlier_action", "none")
+        self._outliers: Counter = Counter()
+        self._out_tallies: dict[str, ValueTally] = {}
+        self._out_rows = 0
+        self._out_columns: list[str] = []
+
+        header = True
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        rows_read = 0
+        with self._row_hashes() as seen:
+            for chunk, read in self._chunks_of():
+                rows_read += len(chunk)
+                df, engine = self._prepare(chunk, seen)
+                self._emit("transform", 45 + 45 * read, rows=rows_read)
+                if df.empty:
+                    continue
+                df = df.drop(columns=empty)
+                out: dict[str, pd.Series] = {}
+                flags: dict[str, pd.Series] = {}
+                removed = pd.Series(False, index=df.index)
+
+                for col in df.columns:
+                    plan = self._plans[col]
+                    if plan.dropped:
+                        continue
+                    values = self._apply(engine, df, col, plan)
+                    if plan.kind == "numeric" and plan.lower is not None:
+                        mask = (values < plan.lower) | (values > plan.upper)
+                        self._outliers[col] += int(mask.sum())
+                        if action == "flag":
+                            flags[f"{col}_is_outlier"] = mask
+                        elif action == "cap":
+                            values = values.clip(lower=plan.cap[0], upper=plan.cap[1])
+                        elif action == "remove":
+                            removed |= mask
+                    out[col] = values
+
+                frame = pd.DataFrame({**out, **flags}, index=df.index)
+                if action == "remove":
+                    frame = frame[~removed]
+                for col in frame.columns:
+                    self._out_tallies.setdefault(col, ValueTally()).update(frame[col])
+                self._out_rows += len(frame)
+                self._out_columns = list(frame.columns)
+                frame.to_csv(out_path, mode="w" if header else "a", header=header, index=False)
+                header = False
+
+        if header:   # every row was a duplicate of an earlier one — still write the header
+            pd.DataFrame(columns=self._out_columns).to_csv(out_path, index=False)
+
+    def _apply(self, engine: EnterpriseDataEngine, df: pd.DataFrame, col: str, plan: ColumnPlan) -> pd.Series:
+        if plan.kind == "id":
+            return df[col].astype(str).str.strip()
+        series, _, _ = self._column_values(df, col)
+        if plan.kind == "free_text":
+            return series
+        if plan.kind == "numeric":
+            values = sanitize_numeric(series)
+        elif plan.kind == "datetime":
+            values = engine._evaluate_datetime(series.rename(col), 1)[1]
+        elif plan.kind == "boolean":
+            values = series.astype(str).str.lower().map(engine._BOOL_MAP)
+        else:
+            values = series
+            if plan.remap:
+                values = values.map(lambda x: plan.remap.get(str(x), str(x)) if pd.notna(x) else x)
+        if plan.fill is not None and not (isinstance(plan.fill, float) and math.isnan(plan.fill)):
+            values = values.fillna(plan.fill)
+        return values
+
+    # ──────────────────────────────────────────
+    # Report
+    # ──────────────────────────────────────────
+
+    def _log(self, **kwargs) -> None:
+        self.audit_log.append({"timestamp": datetime.utcnow().isoformat(), **kwargs})
+
+    def _summarise(self) -> None:
+        """Audit log and column quality in the engine's shapes."""
+        cfg = self.config
+        self._log(action="pipeline_started",
+                  input_shape=[self._raw_rows, len(self._raw_columns)],
+                  config=cfg.__dict__)
+        self._log(action="streaming_passes", passes=2, chunks=self._chunks,
+                  chunk_rows=self.chunk_rows)
+        if self._empty:
+            self._log(action="empty_column_drop", columns_dropped=self._empty,
+                      count=len(self._empty))
+        if self._rename:
+            self._log(action="header_normalisation", renamed=self._rename,
+                      count=len(self._rename))
+        self.audit_log.extend(_merge_entries(self._stage_log))
+        if self._raw_rows > self._rows:
+            removed = self._raw_rows - self._rows
+            self._log(action="duplicate_removal", rows_removed=removed,
+                      pct_removed=_pct(removed, self._raw_rows))
+
+        rows = max(self._rows, 1)
+        for col, plan in self._plans.items():
+            ev    = self._evidence[col]
+            out   = self._out_tallies.get(col, ValueTally())
+            n_out = out.non_null
+            completeness = n_out / max(self._out_rows, 1)
+            if plan.kind not in ("id",):
+                if ev.phone_cells:
+                    self._log(action="phone_normalisation", column=col, cells_affected=ev.phone_cells)
+                if ev.percentage:
+                    self._log(action="percentage_normalisation", column=col,
+                              note="converted % values to 0-1 decimal")
+            getattr(self, f"_report_{plan.kind}")(col, plan, out, completeness, rows)
+
+        threshold = getattr(cfg, "low_variance_threshold", 0.98)
+        for col in self._out_columns:
+            if col.endswith("_is_outlier"):
+                continue
+            tally = self._out_tallies[col]
+            if tally.distinct_count <= 1:
+                self._log(action="constant_column_flagged", column=col,
+                          unique_values=tally.distinct_count)
+            elif tally.top_freq >= threshold:
+                self._log(action="near_constant_column_flagged", column=col,
+                          dominant_value_pct=round(tally.top_freq * 100, 1))
+
+        duration = (datetime.utcnow() - self._started_at).total_seconds()
+        self._log(action="pipeline_complete",
+                  output_shape=[self._out_rows, len(self._out_columns)],
+                  columns_dropped=len(self._raw_columns) - len(self._out_columns),
+                  duration_seconds=round(duration, 3))
+
+    def _score(self, completeness: float, confidence: float | None, outlier_ratio: float = 0.0) -> float:
+        consistency = confidence if confidence is not None else 1.0
+        return round(0.50 * completeness + 0.35 * consistency + 0.15 * (1.0 - outlier_ratio), 4)
+
+    def _report_id(self, col, plan, out, completeness, rows) -> None:
+        n_unique = out.distinct_count
+        self.column_quality.append({
+            "column": col, "type": "categorical", "quality_score": 1.0,
+            "dropped": False, "missing_pct": 0.0, "unique_values": n_unique,
+            "cardinality_ratio": round(n_unique / rows, 4),
+            "high_cardinality_warning": True, "imputation_method": None,
+        })
+        self._log(action="id_column_forced_categorical", column=col, unique_values=n_unique)
+
+    def _report_free_text(self, col, plan, out, completeness, rows) -> None:
+        n_unique = out.distinct_count
+        self.column_quality.append({
+            "column": col, "type": "free_text",
+            "quality_score": round(1 - plan.missing, 4), "dropped": False,
+            "missing_pct": round(plan.missing * 100, 1), "unique_values": n_unique,
+            "cardinality_ratio": round(n_unique / rows, 4),
+            "high_cardinality_warning": True, "free_text": True,
+        })
+        self._log(action="free_text_detected", column=col, unique_values=n_unique)
+
+    def _report_dropped(self, col, plan) -> None:
+        missing_pct = round(plan.missing * 100, 1)
+        entry = {"column": col, "type": plan.kind, "dropped": True, "drop_reason": "excessive_missing"}
+        if plan.kind == "categorical":
+            entry["quality_score"] = round(1 - plan.missing, 4)
+        else:
+            entry["quality_score"] = self._score(1 - plan.missing, plan.confidence)
+        if plan.kind == "numeric":
+            entry["missing_pct"] = missing_pct
+        self.column_quality.append(entry)
+        if plan.kind == "datetime":
+            self._log(action="column_dropped", column=col, reason="excessive_missing")
+        else:
+            self._log(action="column_dropped", column=col, reason="excessive_missing",
+                      missing_pct=missing_pct)
+
+    def _report_numeric(self, col, plan, out, completeness, rows) -> None:
+        if plan.dropped:
+            return self._report_dropped(col, plan)
+        strategy = self.config.impute_numeric_strategy
+        if plan.n_filled and plan.fill is not None:
+            self._log(action="numeric_imputation", column=col, method=strategy,
+                      fill_value=plan.fill, cells_filled=plan.n_filled,
+                      pct_filled=_pct(plan.n_filled, rows))
+        count = self._outliers[col]
+        if count:
+            action = getattr(self.config, "outlier_action", "none")
+            if action == "flag":
+                self._log(action="outlier_flagged", column=col, count=count,
+                          flag_column=f"{col}_is_outlier", pct=_pct(count, rows))
+            elif action == "cap":
+                self._log(action="outlier_capped", column=col, count=count,
+                          lower=round(plan.cap[0], 4), upper=round(plan.cap[1], 4))
+            elif action == "remove":
+                self._log(action="outlier_rows_removed", column=col, rows_dropped=count)
+            else:
+                self._log(action="outlier_detected", column=col, count=count, pct=_pct(count, rows))
+        outlier_ratio = count / rows
+        self.column_quality.append({
+            "column": col, "type": "numeric",
+            "quality_score": self._score(completeness, plan.confidence, outlier_ratio),
+            "dropped": False,
+            "missing_pct": round(plan.missing * 100, 1),
+            "outlier_pct": round(outlier_ratio * 100, 1),
+            "imputation_method": strategy,
+        })
+
+    def _report_datetime(self, col, plan, out, completeness, rows) -> None:
+        date_plan = self._date_plans.get(col)
+        if date_plan is not None:
+            DATE_FORMAT_MEMO.remember(self._feed, col, date_plan.formats)
+            self._log(action="datetime_format_detected", column=col,
+                      formats=date_plan.formats, source=date_plan.source)
+        if plan.dropped:
+            return self._report_dropped(col, plan)
+        if plan.n_filled:
+            self._log(action="datetime_imputation", column=col,
+                      fill_value=str(plan.fill), cells_filled=plan.n_filled)
+        self.column_quality.append({
+            "column": col, "type": "datetime",
+            "quality_score": self._score(completeness, plan.confidence),
+            "dropped": False, "missing_pct": round(plan.missing * 100, 1),
+        })
+
+    def _report_boolean(self, col, plan, out, completeness, rows) -> None:
+        if plan.n_filled and plan.fill is not None:
+            self._log(action="boolean_imputation", column=col,
+                      fill_value=plan.fill, cells_filled=plan.n_filled)
+        self.column_quality.append({
+            "column": col, "type": "boolean",
+            "quality_score": self._score(completeness, plan.confidence), "dropped": False,
+        })
+
+    def _report_categorical(self, col, plan, out, completeness, rows) -> None:
+        if plan.dropped:
+            return self._report_dropped(col, plan)
+        if plan.remap:
+            self._log(action="fuzzy_clustering", column=col,
+                      merges=len(plan.remap), remap=plan.remap)
+        if plan.n_filled and plan.fill is not None and pd.notna(plan.fill):
+            self._log(action="categorical_imputation", column=col, method="mode",
+                      fill_value=str(plan.fill), cells_filled=plan.n_filled)
+        n_unique = out.distinct_count
+        cardinality_ratio = n_unique / rows
+        fuzzy_penalty = min(len(plan.remap) / max(n_unique + len(plan.remap), 1), 0.15)
+        self.column_quality.append({
+            "column": col, "type": "categorical",
+            "quality_score": round(max(0, 1 - plan.missing - fuzzy_penalty), 4),
+            "dropped": False,
+            "missing_pct": round(plan.missing * 100, 1),
+            "unique_values": n_unique,
+            "cardinality_ratio": round(cardinality_ratio, 4),
+            "high_cardinality_warning": cardinality_ratio > 0.5,
+            "fuzzy_merges": len(plan.remap),
+        })
+
+    def _overview(self) -> dict:
+        dtypes = {}
+        for col in self._out_columns:
+            if col.endswith("_is_outlier"):
+                dtypes[col] = "bool"
+                continue
+            kind   = self._plans[col].kind
+            filled = self._out_tallies[col].non_null == self._out_rows
+            dtypes[col] = {
+                "numeric":  "float64",
+                "datetime": "datetime64[ns]",
+                "boolean":  "bool" if filled else "object",
+            }.get(kind, "category")
+        missing = {col: self._out_rows - self._out_tallies[col].non_null for col in self._out_columns}
+        by_type = Counter(dtypes.values())
+        return _json_safe({
+            "shape":          [self._out_rows, len(self._out_columns)],
+            "original_shape": [self._raw_rows, len(self._raw_columns)],
+            "rows_removed":   self._raw_rows - self._out_rows,
+            "missing_values": missing,
+            "missing_pct":    {col: round(n / max(self._out_rows, 1) * 100, 2) for col, n in missing.items()},
+            "dtypes":         dtypes,
+            "column_count_by_type": {
+                "numeric":     by_type["float64"],
+                "categorical": by_type["category"],
+                "datetime":    by_type["datetime64[ns]"],
+                "boolean":     by_type["bool"],
+            },
+        })
+
+    # ──────────────────────────────────────────
+    # Public runner
+    # ──────────────────────────────────────────
+
+    def run(self, out_path: str) -> dict:
+        """Profile, transform into `out_path` and return the engine-shaped result (minus the frame)."""
+        self.profile()
+        self.write(out_path)
+        self._emit("generate_eda", 95)
+        self._summarise()
+        return {
+            "cleaned_path":           out_path,
+            "cleaned_shape":          [self._out_rows, len(self._out_columns)],
+            "audit_log":              _json_safe(self.audit_log),
+            "column_quality_summary": _json_safe(self.column_quality),
+            "eda_report":             self._overview(),
+        }
+
+
+def _merge_entries(entries: list[dict]) -> list[dict]:
+    """
+    Collapse per-chunk stage entries into one per (action, column), in
+    first-seen order, summing the count fields.
+    """
+    merged: dict[tuple, dict] = {}
+    for entry in entries:
+        key = (entry.get("action"), entry.get("column"))
+        if key not in merged:
+            merged[key] = {k: (dict(v) if isinstance(v, dict) else v) for k, v in entry.items()}
+            continue
+        target = merged[key]
+        for name in _SUMMED_FIELDS & entry.keys():
+            value = entry[name]
+            if isinstance(value, dict):
+                for k, n in value.items():
+                    target[name][k] = target[name].get(k, 0) + n
+            else:
+                target[name] = target.get(name, 0) + value
+    return list(merged.values())
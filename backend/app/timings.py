@@ -0,0 +1,136 @@
+"""
+timings.py
+==========
+Wall/CPU timing of engine stages and per-column processing.
+
+The only timing the engine used to record was the total duration on
+pipeline_complete. RunTimings collects one entry per pipeline stage and
+one per process_column call — wall time, CPU time and rows/cells
+processed — and the engine returns them as the "timings" section of its
+result.
+
+CPU time is per thread (time.thread_time), so concurrent requests don't
+bleed into each other. With column workers, each column entry carries the
+CPU of the worker that processed it; the "columns" stage entry only covers
+the coordinating thread.
+
+RECENT_TIMINGS keeps the timings of the last TIMINGS_HISTORY_RUNS runs in
+memory and aggregates them per stage and per column type (GET /timings),
+to find hot stages in production. Set TIMINGS_HISTORY_RUNS=0 to disable.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+# ── Config ──
+TIMINGS_HISTORY_RUNS = int(os.getenv("TIMINGS_HISTORY_RUNS", "200"))   # 0 = no history
+
+
+def _rate(count: float, seconds: float) -> float | None:
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+class RunTimings:
+    """Stage and column timings of one engine run."""
+
+    def __init__(self):
+        self.stages:  list[dict] = []
+        self.columns: list[dict] = []
+        self._wall = time.perf_counter()
+        self._cpu  = time.thread_time()
+
+    @contextmanager
+    def stage(self, name: str, rows: int, columns: int) -> Iterator[dict]:
+        """Time a pipeline stage that starts on a rows x columns frame."""
+        entry = {"stage": name, "rows": rows, "cells": rows * columns}
+        with self._measure(entry):
+            yield entry
+        entry["rows_per_second"] = _rate(rows, entry["wall_seconds"])
+        self.stages.append(entry)
+
+    @contextmanager
+    def column(self, col: str, rows: int) -> Iterator[dict]:
+        """Time one process_column call; the caller may add "type" etc. to the entry."""
+        entry = {"column": col, "type": None, "rows": rows, "cells": rows}
+        with self._measure(entry):
+            yield entry
+        self.columns.append(entry)
+
+    @staticmethod
+    def split(entry: dict, name: str) -> None:
+        """Record the wall/CPU time elapsed so far inside an open entry as `name`_*."""
+        wall, cpu = entry["_started"]
+        entry[f"{name}_wall_seconds"] = round(time.perf_counter() - wall, 4)
+        entry[f"{name}_cpu_seconds"]  = round(time.thread_time() - cpu, 4)
+
+    @contextmanager
+    def _measure(self, entry: dict) -> Iterator[None]:
+        entry["_started"] = (time.perf_counter(), time.thread_time())
+        try:
+            yield
+        finally:
+            wall, cpu = entry.pop("_started")
+            entry["wall_seconds"] = round(time.perf_counter() - wall, 4)
+            entry["cpu_seconds"]  = round(time.thread_time() - cpu, 4)
+
+    def report(self) -> dict:
+        """The "timings" result section."""
+        return {
+            "wall_seconds": round(time.perf_counter() - self._wall, 4),
+            "cpu_seconds":  round(time.thread_time() - self._cpu, 4),
+            "stages":       list(self.stages),
+            "columns":      list(self.columns),
+        }
+
+
+def _aggregate(entries: list[dict], key: str) -> list[dict]:
+    """Per-`key` totals, mean and p95 wall time, slowest total first."""
+    groups: dict[str, list[dict]] = {}
+    for entry in entries:
+        groups.setdefault(entry.get(key) or "unknown", []).append(entry)
+
+    rows = []
+    for name, group in groups.items():
+        walls = sorted(e["wall_seconds"] for e in group)
+        total = sum(walls)
+        rows.append({
+            key:                  name,
+            "count":              len(group),
+            "wall_seconds_total": round(total, 4),
+            "wall_seconds_mean":  round(total / len(group), 4),
+            "wall_seconds_p95":   walls[min(len(walls) - 1, int(0.95 * len(walls)))],
+            "wall_seconds_max":   walls[-1],
+            "cpu_seconds_total":  round(sum(e["cpu_seconds"] for e in group), 4),
+            "rows_per_second":    _rate(sum(e["rows"] for e in group), total),
+        })
+    return sorted(rows, key=lambda r: r["wall_seconds_total"], reverse=True)
+
+
+class TimingHistory:
+    """Thread-safe ring buffer of recent run timings, with an aggregated view."""
+
+    def __init__(self, max_runs: int = TIMINGS_HISTORY_RUNS):
+        self._lock = threading.Lock()
+        self._runs: deque[dict] = deque(maxlen=max(0, max_runs))
+
+    def record(self, timings: dict) -> None:
+        with self._lock:
+            self._runs.append(timings)
+
+    def summary(self) -> dict:
+        with self._lock:
+            runs = list(self._runs)
+        return {
+            "runs":               len(runs),
+            "wall_seconds_total": round(sum(r["wall_seconds"] for r in runs), 4),
+            "stages":             _aggregate([s for r in runs for s in r["stages"]], "stage"),
+            "column_types":       _aggregate([c for r in runs for c in r["columns"]], "type"),
+        }
+
+
+# Process-wide history of engine runs (see GET /timings)
+RECENT_TIMINGS = TimingHistory()
@@ -7,6 +7,7 @@ the engine reads them automatically, no engine changes needed.
 """
 
 import re
+import threading
 import numpy as np
 import pandas as pd
 
@@ -37,7 +38,7 @@ PLACEHOLDER_VALUES: set[str] = {
 
 # ─────────────────────────────────────────────────────────────
 # Unit / suffix patterns to strip before numeric parsing
-# Each is a regex string applied via str.replace(..., regex=True)
+# Each is a regex string; UNIT_STRIPPER applies them in list order
 # ─────────────────────────────────────────────────────────────
 UNIT_PATTERNS: list[str] = [
     # Currency symbols (prefix or suffix)
@@ -68,6 +69,83 @@ UNIT_PATTERNS: list[str] = [
 ]
 
 
+class UnitStripper:
+    """
+    Strips every pattern in a unit list, one pattern after another in list
+    order — removing one unit can expose or break up another ("1€sqft"
+    loses "€" and then "sqft"), so the order is part of the result.
+
+    One alternation of every pattern is searched first: a value it doesn't
+    match is only whitespace-stripped, and most values never reach the
+    per-pattern passes. Each removal is attributed to its pattern. Per-call
+    counts feed the audit log. Process-wide totals (`totals()`) show which
+    units never fire in production and can be pruned.
+
+    The pattern list is read by reference: appending to UNIT_PATTERNS at
+    runtime triggers a recompile on the next call.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self._patterns = patterns
+        self._compiled_for: tuple[str, ...] = ()
+        self._any: re.Pattern | None = None
+        self._each: list[re.Pattern] = []
+        self._lock = threading.Lock()
+        self._totals: dict[str, int] = {}
+
+    def _compile(self) -> tuple[re.Pattern, list[re.Pattern]]:
+        snapshot = tuple(self._patterns)
+        if snapshot != self._compiled_for:
+            self._any  = re.compile("|".join(f"(?:{p})" for p in snapshot))
+            self._each = [re.compile(p) for p in snapshot]
+            self._compiled_for = snapshot
+        return self._any, self._each
+
+    def strip(self, values: pd.Series, weights=None) -> tuple[pd.Series, dict[str, int]]:
+        """
+        Remove all unit patterns from each value and strip whitespace.
+        Non-null values are converted with str() first; nulls become NaN.
+
+        weights: optional per-value multiplicity (e.g. dictionary-code
+                 frequencies) so hit counts are per cell, not per value.
+
+        Returns (stripped_values, {pattern: hits}) with zero-hit patterns omitted.
+        """
+        with self._lock:
+            any_unit, each = self._compile()
+            patterns = self._compiled_for
+
+        if weights is None:
+            weights = np.ones(len(values), dtype=np.int64)
+        hits = np.zeros(len(patterns), dtype=np.int64)
+
+        out = []
+        for value, weight, present in zip(values, weights, values.notna()):
+            if not present:
+                out.append(np.nan)
+                continue
+            value = str(value)
+            if any_unit.search(value):
+                for i, regex in enumerate(each):
+                    value, n = regex.subn("", value)
+                    hits[i] += n * weight
+            out.append(value.strip())
+
+        pattern_hits = {patterns[i]: int(n) for i, n in enumerate(hits) if n}
+        with self._lock:
+            for pattern, n in pattern_hits.items():
+                self._totals[pattern] = self._totals.get(pattern, 0) + n
+        return pd.Series(out, index=values.index, dtype=object), pattern_hits
+
+    def totals(self) -> dict[str, int]:
+        """Cumulative hits per pattern since process start (zero-hit patterns included)."""
+        with self._lock:
+            return {p: self._totals.get(p, 0) for p in self._patterns}
+
+
+UNIT_STRIPPER = UnitStripper(UNIT_PATTERNS)
+
+
 # ─────────────────────────────────────────────────────────────
 # Abbreviation / variant maps
 # Each dict maps lowercase variant -> canonical lowercase form.
@@ -238,24 +316,19 @@ _MULTIPLIER_MAP = {
 }
 
 
+def _expand_match(match: re.Match) -> str:
+    number = float(match.group(1))
+    suffix = match.group(2).lower()
+    return str(int(number * _MULTIPLIER_MAP[suffix]))
+
+
 def _expand_multipliers(s: pd.Series) -> pd.Series:
     """
     Convert shorthand like €103.5M → 103500000, €560K → 560000, €1.2B → 1200000000.
     Applied before generic stripping so the suffix is consumed correctly.
+    Only the first multiplier token in each value is expanded.
     """
-    def _expand(val) -> str:
-        if not isinstance(val, str):
-            return val
-        match = _MULTIPLIER_PATTERN.search(val)
-        if match:
-            number = float(match.group(1))
-            suffix = match.group(2).lower()
-            expanded = int(number * _MULTIPLIER_MAP[suffix])
-            # Replace the matched portion with the expanded integer
-            return val[:match.start()] + str(expanded) + val[match.end():]
-        return val
-
-    return s.apply(_expand)
+    return s.str.replace(_MULTIPLIER_PATTERN, _expand_match, n=1, regex=True)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -275,116 +348,143 @@ def strip_control_chars(s: pd.Series) -> pd.Series:
 # Numeric sanitisation
 # ─────────────────────────────────────────────────────────────
 
-def _is_european_thousands(val: str) -> bool:
-    """
-    Detect European dot-thousands format: 2.278.845, 1.572.674
-    Pattern: digits separated by exactly 3 digits after each dot, multiple times.
-    """
-    return bool(re.match(r"^\d{1,3}(?:\.\d{3})+$", val.strip()))
-
-
-def _fix_european_thousands(val: str) -> str:
-    """Convert European dot-thousands 2.278.845 → 2278845"""
-    return val.replace(".", "")
-
-
-def _fix_score_corruption(val: str) -> str:
-    """
-    Fix common score/rating corruptions:
-      8,9f  → 8.9    (comma decimal + trailing char)
-      8:8   → 8.8    (colon as decimal)
-      8..8  → 8.8    (double dot)
-      8,7e-0 → 8.7   (comma decimal + scientific suffix)
-      ++8.7 → 8.7    (leading junk)
-      8.7.  → 8.7    (trailing dot)
-      9,.0  → 9.0    (comma+dot mixed)
-    """
-    s = val.strip()
-    # Strip leading non-digit/minus chars
-    s = re.sub(r"^[^\d\-]+", "", s)
-    # Replace colon used as decimal: 8:8 -> 8.8
-    s = re.sub(r"(\d):(\d)", r"\1.\2", s)
-    # Replace double dot: 8..8 -> 8.8
-    s = re.sub(r"(\d)\.\.(\d)", r"\1.\2", s)
-    # Replace comma decimal: 8,9 -> 8.9 (only if followed by 1-2 digits then end/non-digit)
-    s = re.sub(r"(\d),(\d{1,2})([^\d]|$)", r"\1.\2\3", s)
-    # Remove trailing non-numeric chars (8.7., 8,9f)
-    s = re.sub(r"[^\d\.]+$", "", s)
-    # Remove comma+dot combos: 9,.0 -> 9.0
-    s = re.sub(r",\.", ".", s)
-    return s
+# Compiled once — each stage below is one vectorised .str pass
+_CURRENCY           = re.compile(r"[₦\$€£¥₹₩₪฿]\s*")
+_OCR_LETTER_O       = re.compile(r"(?<=\d)[oO](?=\d)")
+_EUROPEAN_THOUSANDS = re.compile(r"^\d{1,3}(?:\.\d{3})+$")
+_THOUSANDS_COMMA    = re.compile(r",(?=\d{3})")
+_NUMERIC_UNITS      = re.compile(r"\s*(sq\.?m\.?|sqm|cm|kg|lbs?|%|pcs?)\s*")
+_STAR_RATING        = re.compile(r"\s*★\s*")
+_FIRST_NUMBER       = r"(?:^|(?<=\s))([-]?\d+\.?\d*)"
+
+# Score/rating corruption fixes, applied in order:
+#   8,9f → 8.9 · 8:8 → 8.8 · 8..8 → 8.8 · 8,7e-0 → 8.7 · ++8.7 → 8.7 · 8.7. → 8.7 · 9,.0 → 9.0
+_SCORE_FIXES: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"^[^\d\-]+"),              ""),          # leading non-digit/minus junk
+    (re.compile(r"(\d):(\d)"),               r"\1.\2"),    # colon as decimal
+    (re.compile(r"(\d)\.\.(\d)"),            r"\1.\2"),    # double dot
+    (re.compile(r"(\d),(\d{1,2})([^\d]|$)"), r"\1.\2\3"),  # comma decimal (1-2 digits)
+    (re.compile(r"[^\d\.]+$"),               ""),          # trailing non-numeric chars
+    (re.compile(r",\."),                     "."),         # comma+dot combos
+]
 
 
-def sanitize_numeric(series: pd.Series) -> pd.Series:
+def _parse_numeric_strings(s: pd.Series) -> pd.Series:
     """
-    Strip currency symbols, thousands separators, unit suffixes, and
-    expand K/M/B multipliers, then extract the first valid numeric token.
-
-    Returns a float64 Series with NaN where no number was found.
-
-    Guards (applied to original string before any stripping):
-      - ID-style strings   (REF-1234, SKU_001)         → NaN
-      - Date-like strings  (2021-10-19, 22/03/2022)    → NaN
-      - Range strings      (2004 ~ 2021, 100 - 200)    → NaN
-      - Month-name dates   (Jul 1, 2004, Aug 30, 2015) → NaN
-
-    Special handling:
-      - European dot thousands: 2.278.845  → 2278845
-      - European comma decimal: 8,9        → 8.9
-      - Score corruptions:      8:8, 8..8, ++8.7 → 8.8, 8.8, 8.7
-      - OCR letter-o:           4o8,035    → 408035
-      - Multipliers:            €103.5M    → 103500000
+    The sanitize_numeric pipeline over already-stripped strings. Every stage
+    is a single vectorised .str call with a pre-compiled regex.
     """
-    s = series.astype(str).str.strip()
-
     # ── Guards ──
-    is_id         = s.str.match(_ID_PATTERN.pattern,         na=False)
-    is_date       = s.str.match(_DATE_PATTERN.pattern,       na=False)
-    is_range      = s.str.match(_RANGE_PATTERN.pattern,      na=False)
-    is_month_date = s.str.match(_MONTH_DATE_PATTERN.pattern, na=False, case=False)
-    guard = is_id | is_date | is_range | is_month_date
+    guard = (
+        s.str.match(_ID_PATTERN, na=False)
+        | s.str.match(_DATE_PATTERN, na=False)
+        | s.str.match(_RANGE_PATTERN, na=False)
+        | s.str.match(_MONTH_DATE_PATTERN, na=False)
+    )
 
     # ── Expand K / M / B multipliers ──
     s = _expand_multipliers(s)
 
     # ── Strip currency symbols + leading whitespace after symbol ──
-    s = s.str.replace(r"[₦\$€£¥₹₩₪฿]\s*", "", regex=True)
+    s = s.str.replace(_CURRENCY, "", regex=True)
 
     # ── OCR fix: letter o/O used as zero in numeric context ──
     # e.g. "4o8,035,783" → "408,035,783"
-    s = s.apply(lambda v: re.sub(r"(?<=\d)[oO](?=\d)", "0", v) if isinstance(v, str) else v)
+    s = s.str.replace(_OCR_LETTER_O, "0", regex=True)
 
     # ── European dot thousands: 2.278.845 → 2278845 ──
     # Must be done BEFORE general dot handling
-    s = s.apply(lambda v: _fix_european_thousands(v) if isinstance(v, str) and _is_european_thousands(v) else v)
+    european = s.str.strip().str.match(_EUROPEAN_THOUSANDS, na=False)
+    if european.any():
+        s = s.mask(european, s.str.replace(".", "", regex=False))
 
     # ── Thousands commas: 1,234,567 → 1234567 ──
-    s = s.str.replace(r",(?=\d{3})", "", regex=True)
+    s = s.str.replace(_THOUSANDS_COMMA, "", regex=True)
 
     # ── Score/rating corruption fixes ──
-    s = s.apply(lambda v: _fix_score_corruption(v) if isinstance(v, str) else v)
+    s = s.str.strip()
+    for pattern, repl in _SCORE_FIXES:
+        s = s.str.replace(pattern, repl, regex=True)
 
     # ── Common unit suffixes ──
-    s = s.str.replace(r"\s*(sq\.?m\.?|sqm|cm|kg|lbs?|%|pcs?)\s*", "", regex=True)
+    s = s.str.replace(_NUMERIC_UNITS, "", regex=True)
 
     # ── Star ratings ──
-    s = s.str.replace(r"\s*★\s*", "", regex=True)
+    s = s.str.replace(_STAR_RATING, "", regex=True)
 
     # ── Extract first valid numeric token ──
-    extracted = s.str.extract(r"(?:^|(?<=\s))([-]?\d+\.?\d*)", expand=False)
-    result = pd.to_numeric(extracted, errors="coerce")
+    extracted = s.str.extract(_FIRST_NUMBER, expand=False)
+    result = pd.to_numeric(extracted, errors="coerce")   # int64 when every token is an integer
 
     # ── Null out guarded patterns ──
-    result[guard] = np.nan
+    if guard.any():
+        result = result.astype("float64")
+        result[guard] = np.nan
 
     return result
 
 
+def sanitize_numeric(series: pd.Series) -> pd.Series:
+    """
+    Strip currency symbols, thousands separators, unit suffixes, and
+    expand K/M/B multipliers, then extract the first valid numeric token.
+
+    Returns a float64 Series with NaN where no number was found — or
+    int64 when every value parsed to an integer, including native integer
+    columns, which cannot contain NaN.
+
+    Fast path: native int/float columns are cast directly (±inf → NaN)
+    instead of round-tripping through strings. float32/float16 values are
+    widened through their shortest decimal form (1.1f → 1.1, as the string
+    round trip gave). Deliberate changes from that round trip:
+      - floats str() wrote in exponent notation (1e+20, 2.5e-05, float32
+        6.7e+06) parsed as their leading digits (1.0, 2.5, 6.7); they keep
+        their value now
+      - floats with exactly three decimals (594.469) were read as European
+        dot thousands (594469)
+      - float64 values are exact; parsing their repr dropped digits past
+        the 16th or so (relative error up to ~1e-13)
+    Everything else is parsed once per distinct string and mapped back
+    through factorize codes, so cost scales with cardinality.
+
+    Guards (applied to original string before any stripping):
+      - ID-style strings   (REF-1234, SKU_001)         → NaN
+      - Date-like strings  (2021-10-19, 22/03/2022)    → NaN
+      - Range strings      (2004 ~ 2021, 100 - 200)    → NaN
+      - Month-name dates   (Jul 1, 2004, Aug 30, 2015) → NaN
+
+    Special handling:
+      - European dot thousands: 2.278.845  → 2278845
+      - European comma decimal: 8,9        → 8.9
+      - Score corruptions:      8:8, 8..8, ++8.7 → 8.8, 8.8, 8.7
+      - OCR letter-o:           4o8,035    → 408035
+      - Multipliers:            €103.5M    → 103500000
+    """
+    if pd.api.types.is_integer_dtype(series) and not series.hasnans:
+        return series.astype("uint64" if series.dtype in (np.uint64, pd.UInt64Dtype()) else "int64")
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        if pd.api.types.is_float_dtype(series) and series.dtype.itemsize < 8:    # float32/float16
+            result = pd.to_numeric(series.astype(str), errors="coerce").astype("float64")
+        else:
+            result = series.astype("float64")
+        return result.mask(np.isinf(result))
+
+    s = series.astype(str).str.strip()
+    codes, uniques = pd.factorize(s)
+    parsed = _parse_numeric_strings(pd.Series(uniques, dtype=object))
+    return pd.Series(parsed.to_numpy().take(codes), index=series.index, name=series.name)
+
+
 # ─────────────────────────────────────────────────────────────
 # Outlier detection
 # ─────────────────────────────────────────────────────────────
 
-def detect_outliers_iqr(series: pd.Series, multiplier: float = 1.5) -> pd.Series:
+def detect_outliers_iqr(
+    series: pd.Series,
+    multiplier: float = 1.5,
+    q1: float | None = None,
+    q3: float | None = None,
+) -> pd.Series:
     """
     IQR method. Returns a boolean Series (True = outlier).
     NaN values are never marked as outliers.
@@ -393,23 +493,33 @@ def detect_outliers_iqr(series: pd.Series, multiplier: float = 1.5) -> pd.Series
       lower = Q1 - multiplier * IQR
       upper = Q3 + multiplier * IQR
     Standard multiplier is 1.5; use 3.0 for a more conservative threshold.
+    Pass precomputed q1/q3 (e.g. from profiling.NumericStats) to skip the
+    quantile pass.
     """
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
+    if q1 is None or q3 is None:
+        q1 = series.quantile(0.25)
+        q3 = series.quantile(0.75)
     iqr = q3 - q1
     lower = q1 - multiplier * iqr
     upper = q3 + multiplier * iqr
     return (series < lower) | (series > upper)
 
 
-def detect_outliers_zscore(series: pd.Series, threshold: float = 3.0) -> pd.Series:
+def detect_outliers_zscore(
+    series: pd.Series,
+    threshold: float = 3.0,
+    mean: float | None = None,
+    std: float | None = None,
+) -> pd.Series:
     """
     Z-score method. Returns a boolean Series (True = outlier).
     NaN values are excluded from mean/std calculation and never flagged.
     A threshold of 3.0 is standard (flags ~0.3% of a normal distribution).
+    Pass precomputed mean/std to skip recomputing them.
     """
-    mean = series.mean()
-    std  = series.std()
+    if mean is None or std is None:
+        mean = series.mean()
+        std  = series.std()
     if std == 0:
         return pd.Series(False, index=series.index)
     z_scores = (series - mean).abs() / std
@@ -487,6 +597,10 @@ def normalise_percentage(series: pd.Series) -> tuple[pd.Series, bool]:
 # High-cardinality / free-text detection
 # ─────────────────────────────────────────────────────────────
 
+FREE_TEXT_UNIQUE_RATIO = 0.7   # most values unique
+FREE_TEXT_AVG_WORDS    = 3     # sentence-like rather than labels
+
+
 def is_free_text_column(series: pd.Series) -> bool:
     """
     Detect if a column is free-text (address, description, notes)
@@ -502,17 +616,25 @@ def is_free_text_column(series: pd.Series) -> bool:
         return False
     unique_ratio = non_null.nunique() / len(non_null)
     avg_words    = non_null.str.split().str.len().mean()
-    return unique_ratio > 0.7 and avg_words > 3
+    return unique_ratio > FREE_TEXT_UNIQUE_RATIO and avg_words > FREE_TEXT_AVG_WORDS
 
 
 # ─────────────────────────────────────────────────────────────
 # Fuzzy categorical clustering
-# Uses difflib.SequenceMatcher — no extra dependencies needed
+# Uses difflib.SequenceMatcher — no extra dependencies needed.
+# A padded-trigram index picks the candidate pairs, so only pairs that
+# can still reach the threshold are ever scored.
 # ─────────────────────────────────────────────────────────────
 
 from difflib import SequenceMatcher
 from collections import Counter
 
+from scipy import sparse
+
+from .fuzzy_cache import FuzzyClusterCache, cluster_key
+
+_GRAM_PAD = "\x02\x02"   # q - 1 pad characters that never occur in cleaned text
+
 
 def _similarity(a: str, b: str) -> float:
     """
@@ -546,11 +668,107 @@ def _find_canonical(cluster: list[str], freq: Counter) -> str:
     return max(cluster, key=_score)
 
 
+def _gram_ids(value: str, vocab: dict[str, int]) -> list[int]:
+    """
+    Padded trigrams of `value` as vocabulary ids. Repeats are numbered
+    ("ana#0", "ana#1") so set overlap equals multiset overlap.
+    """
+    padded = _GRAM_PAD + value + _GRAM_PAD
+    seen: Counter = Counter()
+    ids = []
+    for k in range(len(padded) - 2):
+        gram = padded[k:k + 3]
+        ids.append(vocab.setdefault(f"{gram}#{seen[gram]}", len(vocab)))
+        seen[gram] += 1
+    return ids
+
+
+def _candidate_pairs(values: list[str], threshold: float) -> list[tuple[int, int]]:
+    """
+    All index pairs (i < j) whose SequenceMatcher ratio could reach `threshold`.
+
+    ratio >= t means at most (1 - t)(la + lb) unmatched characters, so the
+    edit distance k is bounded and, by the q-gram lemma, the padded strings
+    share at least max(la, lb) + 2 - 3k trigrams. Pairs are taken from the
+    sparse trigram co-occurrence product when that bound is positive, and
+    enumerated by length alone (rare — long strings) when it is not.
+    Survivors must then pass _shared_chars, the vectorised form of
+    SequenceMatcher.quick_ratio, which prunes most same-length pairs the
+    trigram bound lets through (at 0.82, strings of 15-25 characters need
+    to share only one or two trigrams). Both filters are exact: no pair
+    above the threshold is ever skipped.
+    """
+    n = len(values)
+    vocab: dict[str, int] = {}
+    rows, cols = [], []
+    for i, v in enumerate(values):
+        ids = _gram_ids(v, vocab)
+        rows.extend([i] * len(ids))
+        cols.extend(ids)
+    grams  = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, len(vocab)),
+    )
+    shared = sparse.triu(grams @ grams.T, k=1).tocoo()
+
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=n)
+    eps     = 1e-9
+
+    def _admissible(li: np.ndarray, lj: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        total     = li + lj
+        length_ok = 2 * np.minimum(li, lj) >= threshold * total - eps
+        max_edits = np.floor((1 - threshold) * total + eps)
+        return length_ok, np.maximum(li, lj) + 2 - 3 * max_edits
+
+    length_ok, min_shared = _admissible(lengths[shared.row], lengths[shared.col])
+    keep  = length_ok & (shared.data >= min_shared)
+    keys  = [shared.row[keep].astype(np.int64) * n + shared.col[keep]]
+
+    # Pairs whose bound is vacuous may share no trigram at all. That needs
+    # the longer string to be vacuous even against a partner of equal length.
+    _, self_bound = _admissible(lengths, lengths)
+    others = np.arange(n)
+    for i in np.flatnonzero(self_bound <= 0):
+        length_ok, min_shared = _admissible(np.full(n, lengths[i]), lengths)
+        hits = others[length_ok & (min_shared <= 0) & (others != i)]
+        keys.append(np.minimum(hits, i) * n + np.maximum(hits, i))
+
+    keys = np.unique(np.concatenate(keys))
+    left, right = keys // n, keys % n
+    shared_chars = _shared_chars(values, left, right)
+    keep = 2 * shared_chars >= threshold * (lengths[left] + lengths[right]) - eps
+    return list(zip(left[keep].tolist(), right[keep].tolist()))
+
+
+def _shared_chars(values: list[str], left: np.ndarray, right: np.ndarray,
+                  batch_cells: int = 4_000_000) -> np.ndarray:
+    """
+    Size of the character multiset intersection of each pair
+    (values[left[k]], values[right[k]]). SequenceMatcher can match at most
+    that many characters, so 2 * shared / (la + lb) bounds its ratio.
+    """
+    alphabet: dict[str, int] = {}
+    for v in values:
+        for ch in v:
+            alphabet.setdefault(ch, len(alphabet))
+    counts = np.zeros((len(values), max(len(alphabet), 1)), dtype=np.int32)
+    for i, v in enumerate(values):
+        np.add.at(counts[i], [alphabet[ch] for ch in v], 1)
+
+    shared = np.empty(len(left), dtype=np.int64)
+    step   = max(1, batch_cells // counts.shape[1])
+    for start in range(0, len(left), step):
+        a, b = left[start:start + step], right[start:start + step]
+        shared[start:start + step] = np.minimum(counts[a], counts[b]).sum(axis=1)
+    return shared
+
+
 def fuzzy_cluster_series(
     series: pd.Series,
     threshold: float = 0.88,
     min_cluster_size: int = 2,
-    max_unique: int = 80,
+    max_unique: int = 1000,
+    cache: "FuzzyClusterCache | None" = None,
+    max_pairs: int = 20_000,
 ) -> tuple[pd.Series, dict[str, str]]:
     """
     Cluster near-identical categorical values and map them to a canonical form.
@@ -560,8 +778,12 @@ def fuzzy_cluster_series(
         threshold:        Similarity threshold 0-1. 0.82 catches typos without
                           merging genuinely different values.
         min_cluster_size: Only merge clusters of 2+ values (avoid singletons)
-        max_unique:       Skip columns with too many unique values (e.g. names)
-                          to avoid expensive O(n²) comparisons.
+        max_unique:       Skip columns with more unique values than this
+                          (e.g. free-form names).
+        cache:            Optional FuzzyClusterCache — clusters for an already
+                          seen set of uniques are reused instead of recomputed.
+        max_pairs:        Skip columns with more candidate pairs than this —
+                          each costs a SequenceMatcher call (~50µs).
 
     Returns:
         (normalised_series, remap_dict)
@@ -569,19 +791,83 @@ def fuzzy_cluster_series(
 
     Algorithm:
         1. Get all unique non-null values
-        2. For each value, find all other values above similarity threshold
+        2. For each candidate pair from the trigram index (_candidate_pairs),
+           keep those above the similarity threshold
         3. Union-Find to group connected components
         4. Pick canonical form per cluster (most frequent / longest)
         5. Apply remapping
     """
-    non_null = series.dropna()
-    uniques  = list(non_null.unique())
+    remap = fuzzy_remap(
+        Counter(series.dropna().tolist()),
+        threshold=threshold,
+        min_cluster_size=min_cluster_size,
+        max_unique=max_unique,
+        cache=cache,
+        max_pairs=max_pairs,
+    )
+    if not remap:
+        return series, {}
+
+    return series.map(lambda x: remap.get(x, x) if pd.notna(x) else x), remap
+
+
+def fuzzy_remap(
+    freq: Counter,
+    threshold: float = 0.88,
+    min_cluster_size: int = 2,
+    max_unique: int = 1000,
+    cache: "FuzzyClusterCache | None" = None,
+    max_pairs: int = 20_000,
+) -> dict[str, str]:
+    """
+    fuzzy_cluster_series from value frequencies alone: value → count, in
+    first-seen order. Used directly when the values are only available as
+    merged counts (e.g. the streaming engine's per-column tallies).
+    Over-budget columns are not cached, so a raised max_pairs takes effect.
+    """
+    uniques = list(freq)
 
     if len(uniques) > max_unique or len(uniques) < 2:
-        return series, {}
+        return {}
+
+    if cache is not None and all(isinstance(v, str) for v in uniques):
+        key      = cluster_key(uniques, threshold)
+        clusters = cache.get(key)
+        if clusters is None:
+            clusters = _cluster_uniques(uniques, threshold, max_pairs)
+            if clusters is None:
+                return {}
+            cache.put(key, clusters)
+        else:
+            # Same values, possibly seen in a different order this time
+            pos      = {v: k for k, v in enumerate(uniques)}
+            clusters = sorted(
+                (sorted(c, key=pos.__getitem__) for c in clusters),
+                key=lambda c: pos[c[0]],
+            )
+    else:
+        clusters = _cluster_uniques(uniques, threshold, max_pairs)
+        if clusters is None:
+            return {}
+
+    # Build remap — only for clusters with 2+ values (actual merges)
+    remap: dict[str, str] = {}
+    for cluster in clusters:
+        if len(cluster) >= min_cluster_size:
+            canonical = _find_canonical(cluster, freq)
+            for v in cluster:
+                if v != canonical:
+                    remap[v] = canonical
+    return remap
 
-    freq = Counter(non_null.tolist())
 
+def _cluster_uniques(uniques: list, threshold: float, max_pairs: int = 20_000) -> list[list] | None:
+    """
+    Connected components of the "similarity >= threshold" graph over
+    `uniques`, multi-member ones only. Members keep `uniques` order and
+    clusters are ordered by their first member. None when more than
+    `max_pairs` candidate pairs would have to be scored.
+    """
     # Union-Find
     parent = {v: v for v in uniques}
 
@@ -594,12 +880,16 @@ def fuzzy_cluster_series(
     def union(x, y):
         parent[find(x)] = find(y)
 
-    # Compare all pairs
-    for i in range(len(uniques)):
-        for j in range(i + 1, len(uniques)):
-            a, b = uniques[i], uniques[j]
-            if _similarity(a, b) >= threshold:
-                union(a, b)
+    # Compare candidate pairs only — and skip pairs already in one cluster,
+    # since merging them again cannot change the components
+    lowered = [str(v).lower() for v in uniques]
+    pairs   = _candidate_pairs(lowered, threshold)
+    if len(pairs) > max_pairs:
+        return None
+    for i, j in pairs:
+        a, b = uniques[i], uniques[j]
+        if find(a) != find(b) and _similarity(a, b) >= threshold:
+            union(a, b)
 
     # Group into clusters
     clusters: dict[str, list[str]] = {}
@@ -607,19 +897,7 @@ def fuzzy_cluster_series(
         root = find(v)
         clusters.setdefault(root, []).append(v)
 
-    # Build remap — only for clusters with 2+ values (actual merges)
-    remap: dict[str, str] = {}
-    for cluster in clusters.values():
-        if len(cluster) >= min_cluster_size:
-            canonical = _find_canonical(cluster, freq)
-            for v in cluster:
-                if v != canonical:
-                    remap[v] = canonical
-
-    if not remap:
-        return series, {}
-
-    return series.map(lambda x: remap.get(x, x) if pd.notna(x) else x), remap
+    return [c for c in clusters.values() if len(c) > 1]
 
 # ─────────────────────────────────────────────────────────────
 # Human-readable column explanations
@@ -8,20 +8,38 @@ import threading
 import time
 import urllib.request
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.routers import upload, clean, report, payments, feedback, workspace
+from app.admission import ADMISSION
+from app.engine_pool import ENGINE_POOL
+from app.fuzzy_cache import FUZZY_CLUSTER_CACHE
+from app.result_cache import PARSED_FRAMES, RESULT_CACHE
+from app.timings import RECENT_TIMINGS
+from app.metrics import MetricsMiddleware, observe_session_store, render as render_metrics
+from app.session import session_store
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ENGINE_POOL.start()      # spawn and warm the engine workers before the first clean
+    yield
+    ENGINE_POOL.shutdown()
+
+
 app = FastAPI(
     title="Oxdemi API",
     description="Raw in. Clean out. Upload messy data, get a clean dataset and quality report instantly.",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -35,6 +53,8 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["Content-Disposition"],
 )
+app.add_middleware(MetricsMiddleware)
+observe_session_store(session_store)
 
 app.include_router(upload.router)
 app.include_router(clean.router)
@@ -74,7 +94,26 @@ _ka_thread.start()
 
 @app.get("/health", tags=["meta"])
 def health():
-    return {"status": "ok", "version": "1.0.0"}
+    return {
+        "status":        "ok",
+        "version":       "1.0.0",
+        "fuzzy_cache":   FUZZY_CLUSTER_CACHE.stats(),
+        "result_cache":  RESULT_CACHE.stats(),
+        "upload_frames": PARSED_FRAMES.stats(),
+        "admission":     ADMISSION.stats(),
+    }
+
+
+@app.get("/timings", tags=["meta"])
+def timings():
+    """Engine stage and column-type timings aggregated over recent runs."""
+    return RECENT_TIMINGS.summary()
+
+
+@app.get("/metrics", tags=["meta"], response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of this process's metrics."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/", tags=["meta"])
@@ -0,0 +1,246 @@
+"""Admission of engine runs: rejections, lanes, per-user caps, and jobs admitted before they take a thread."""
+
+import threading
+import time
+
+import pytest
+
+from app.admission import AdmissionController, AdmissionRejected
+from app.jobs import JobStore
+
+
+def _hold(controller: AdmissionController, gate: threading.Event, **admit) -> threading.Thread:
+    """A thread that is admitted with `admit` and holds its run until `gate` is set."""
+    admitted = threading.Event()
+
+    def run():
+        with controller.admit(**admit):
+            admitted.set()
+            gate.wait(5)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert admitted.wait(5)
+    return thread
+
+
+def _admit_once(controller: AdmissionController, **admit) -> None:
+    with controller.admit(**admit):
+        pass
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_rejects_when_the_lane_queue_is_full():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=0, queue_depth=1,
+                                     wait_seconds=5, user_max_runs=0)
+    gate = threading.Event()
+    holder = _hold(controller, gate, memory=10)
+    waiter = threading.Thread(target=_admit_once, args=(controller,), kwargs={"memory": 10}, daemon=True)
+    waiter.start()
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+
+    with pytest.raises(AdmissionRejected) as info:
+        with controller.admit(memory=10):
+            pass
+    assert info.value.retry_after > 0
+    gate.set()
+    holder.join(5)
+    waiter.join(5)
+    assert controller.stats()["running"] == 0
+
+
+def test_rejects_after_the_wait_deadline():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=0, queue_depth=4,
+                                     wait_seconds=0.1, user_max_runs=0)
+    gate = threading.Event()
+    holder = _hold(controller, gate, memory=10)
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected):
+        with controller.admit(memory=10):
+            pass
+    assert time.monotonic() - started >= 0.1
+    assert controller.stats()["queued"] == 0
+    gate.set()
+    holder.join(5)
+    assert controller.stats()["running"] == 0
+
+
+def test_memory_budget_queues_runs_that_do_not_fit():
+    controller = AdmissionController(memory_budget=100, cpu_slots=4, reserved_slots=0, queue_depth=4,
+                                     wait_seconds=5, user_max_runs=0)
+    gate = threading.Event()
+    holder = _hold(controller, gate, memory=80)
+    admitted = threading.Event()
+
+    def run():
+        with controller.admit(memory=40):
+            admitted.set()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert not admitted.wait(0.2)
+    gate.set()
+    assert admitted.wait(5)
+    holder.join(5)
+    thread.join(5)
+    assert controller.stats()["memory_in_use"] == 0
+
+
+def test_job_is_rejected_at_submit_when_the_queue_is_full():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=0, queue_depth=1,
+                                     wait_seconds=5, user_max_runs=0)
+    jobs = JobStore(controller)
+    gate = threading.Event()
+    running = jobs.submit("s1", lambda progress: gate.wait(5))
+    queued  = jobs.submit("s2", lambda progress: "second")
+    _wait_for(lambda: jobs.get(running.id).status == "running")
+    assert jobs.get(queued.id).status == "queued"
+
+    with pytest.raises(AdmissionRejected):
+        jobs.submit("s3", lambda progress: "third")
+    assert len(jobs._jobs) == 2    # the rejected job is not registered
+
+    gate.set()
+    _wait_for(lambda: jobs.get(queued.id).status == "done")
+    assert jobs.get(queued.id).result == "second"
+    assert controller.stats()["running"] == 0
+
+
+def test_clean_job_route_answers_429_when_the_queue_is_full(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+    from app.routers import clean
+
+    controller = AdmissionController(memory_budget=10**12, cpu_slots=1, reserved_slots=0, queue_depth=1,
+                                     wait_seconds=5, user_max_runs=0)
+    monkeypatch.setattr(clean, "JOBS", JobStore(controller))
+    client = TestClient(main.app)
+    upload = client.post("/upload/", files={"file": ("a.csv", b"a,b\n1,x\n2,y\n3,z\n", "text/csv")})
+    session_id = upload.json()["session_id"]
+
+    gate = threading.Event()
+    holder = _hold(controller, gate, memory=1, lane="fast")
+    waiter = threading.Thread(target=_admit_once, args=(controller,), kwargs={"memory": 1, "lane": "fast"},
+                              daemon=True)
+    waiter.start()
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+
+    response = client.post(f"/clean/jobs?session_id={session_id}")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    gate.set()
+    holder.join(5)
+    waiter.join(5)
+
+    response = client.post(f"/clean/jobs?session_id={session_id}")
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    _wait_for(lambda: client.get(f"/clean/jobs/{job_id}").json()["status"] == "done")
+
+
+def _admit_in_order(controller: AdmissionController, order: list, name: str, **admit) -> threading.Thread:
+    def run():
+        with controller.admit(**admit):
+            order.append(name)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_fast_lane_is_admitted_ahead_of_bulk():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=0, queue_depth=4,
+                                     wait_seconds=5, user_max_runs=0)
+    gate, order = threading.Event(), []
+    holder = _hold(controller, gate, memory=1, lane="bulk")
+    bulk = _admit_in_order(controller, order, "bulk", memory=1, lane="bulk")
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+    fast = _admit_in_order(controller, order, "fast", memory=1, lane="fast")
+    _wait_for(lambda: controller.stats()["queued"] == 2)
+
+    gate.set()
+    for thread in (holder, bulk, fast):
+        thread.join(5)
+    assert order == ["fast", "bulk"]
+
+
+def test_fast_lane_reserved_slot_runs_beside_a_busy_bulk_lane():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=1, queue_depth=4,
+                                     wait_seconds=5, user_max_runs=0)
+    gate = threading.Event()
+    holder = _hold(controller, gate, memory=1, lane="bulk")
+    with controller.admit(memory=1, lane="fast"):
+        assert controller.stats()["reserved_in_use"] == 1
+    gate.set()
+    holder.join(5)
+
+
+def test_per_user_cap_lets_other_users_go_first():
+    controller = AdmissionController(memory_budget=100, cpu_slots=4, reserved_slots=0, queue_depth=4,
+                                     wait_seconds=5, user_max_runs=1)
+    gate, order = threading.Event(), []
+    holder = _hold(controller, gate, memory=1, owner="a")
+    second_a = _admit_in_order(controller, order, "a", memory=1, owner="a")
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+    b = _admit_in_order(controller, order, "b", memory=1, owner="b")
+    b.join(5)
+    assert order == ["b"]                  # a's second run is still capped
+    assert controller.stats()["queued"] == 1
+
+    gate.set()
+    holder.join(5)
+    second_a.join(5)
+    assert order == ["b", "a"]
+
+
+def test_one_owner_flooding_jobs_does_not_block_another_owners_small_job():
+    controller = AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=1, queue_depth=8,
+                                     wait_seconds=5, user_max_runs=2, user_max_queued=3)
+    jobs = JobStore(controller)
+    gate = threading.Event()
+    flood = []
+    with pytest.raises(AdmissionRejected):
+        for _ in range(10):
+            flood.append(jobs.submit("big", lambda progress: gate.wait(10), memory=1, lane="bulk", owner="a"))
+    assert len(flood) == 4                 # one running, ADMISSION_USER_MAX_QUEUED waiting
+
+    small = jobs.submit("small", lambda progress: "cleaned", memory=1, lane="fast", owner="b")
+    _wait_for(lambda: jobs.get(small.id).status == "done")
+    assert jobs.get(small.id).result == "cleaned"
+    assert sum(jobs.get(job.id).status == "queued" for job in flood) == 3
+
+    gate.set()
+    _wait_for(lambda: all(jobs.get(job.id).status == "done" for job in flood))
+
+
+def test_publish_waits_for_the_engine_off_the_event_loop(monkeypatch):
+    import asyncio
+
+    from fastapi import HTTPException
+    from fastapi.testclient import TestClient
+
+    import main
+    from app.routers import report
+
+    on_loop = []
+
+    def get_result(session_id):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        raise HTTPException(status_code=429, detail="queued out")
+
+    monkeypatch.setattr(report, "_get_result", get_result)
+    response = TestClient(main.app).post("/report/publish?session_id=s1")
+    assert response.status_code == 429
+    assert on_loop == [False]
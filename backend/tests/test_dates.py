@@ -0,0 +1,34 @@
+"""DATE_FORMAT_MEMO: remembered plans are reused for the same feed only."""
+
+import warnings
+
+import pandas as pd
+
+from app.engine import EnterpriseDataEngine
+from app.streaming import StreamingCleaner
+
+
+def _date_sources(result: dict) -> list[str]:
+    return [entry["source"] for entry in result["audit_log"] if entry["action"] == "datetime_format_detected"]
+
+
+def _feed(columns: list[str]) -> pd.DataFrame:
+    days = [f"{day:02d}/03/2025" for day in range(1, 29)]
+    return pd.DataFrame({col: days if col == "Shipped" else range(len(days)) for col in columns})
+
+
+def test_plan_is_remembered_for_the_same_feed_only(tmp_path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        first  = EnterpriseDataEngine(_feed(["Parcel", "Shipped"])).run()
+        again  = EnterpriseDataEngine(_feed(["Parcel", "Shipped"])).run()
+        other  = EnterpriseDataEngine(_feed(["Shipped", "Weight"])).run()
+
+        source = str(tmp_path / "parcels.csv")
+        _feed(["Parcel", "Shipped"]).to_csv(source, index=False)
+        streamed = StreamingCleaner(source, chunk_rows=10).run(str(tmp_path / "out.csv"))
+
+    assert _date_sources(first) == ["detected"]
+    assert _date_sources(again) == ["memo"]
+    assert _date_sources(other) == ["detected"]     # same column name, different feed
+    assert _date_sources(streamed) == ["memo"]      # a streamed upload of the same feed
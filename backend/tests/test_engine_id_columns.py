@@ -0,0 +1,30 @@
+"""ID columns with null cells clean to the same categories as before the engine stages were profiled."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.engine import EnterpriseDataEngine
+
+
+def _clean(df: pd.DataFrame) -> pd.DataFrame:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return EnterpriseDataEngine(df).run()["cleaned_dataframe"]
+
+
+@pytest.mark.parametrize("null", [None, np.nan])
+def test_id_column_nulls_become_nan_category(null):
+    df = pd.DataFrame({
+        "customer_id": ["C1", null, "C3", "C4", "C5"] * 4,
+        "phone":       ["0803 123 4567", null, "0812 222 3333", "0901 555 0000", null] * 4,
+        "x":           list(range(20)),
+    })
+    out = _clean(df)
+    # Expected values are the output of the engine before ColumnProfile
+    assert out["customer_id"].astype(str).tolist()[:5] == ["C1", "nan", "C3", "C4", "C5"]
+    assert out["phone"].astype(str).tolist()[:5] == ["0803 123 4567", "nan", "0812 222 3333", "0901 555 0000", "nan"]
+    assert "None" not in out["customer_id"].cat.categories
+    assert "None" not in out["phone"].cat.categories
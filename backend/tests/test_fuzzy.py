@@ -0,0 +1,60 @@
+"""Fuzzy clustering: candidate filters stay exact, prune unrelated values, and respect the pair budget."""
+
+import random
+import string
+from itertools import combinations
+
+import pytest
+
+from app.fuzzy_cache import FuzzyClusterCache, cluster_key
+from app.utils import _candidate_pairs, _similarity, fuzzy_remap
+
+
+def _random_values(n: int, shortest: int, longest: int, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    values = {"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(shortest, longest)))
+              for _ in range(n)}
+    return sorted(values)
+
+
+def _typos(n: int, seed: int = 5) -> list[str]:
+    rng   = random.Random(seed)
+    words = ["lagos", "abuja", "port harcourt", "kano", "ibadan", "wholesale", "retail", "active"]
+    values = set(words)
+    while len(values) < n:
+        chars = list(rng.choice(words))
+        k = rng.randrange(len(chars))
+        op = rng.choice(["drop", "double", "swap", "replace"])
+        if op == "drop":
+            del chars[k]
+        elif op == "double":
+            chars.insert(k, chars[k])
+        elif op == "swap" and k + 1 < len(chars):
+            chars[k], chars[k + 1] = chars[k + 1], chars[k]
+        else:
+            chars[k] = rng.choice(string.ascii_lowercase)
+        values.add("".join(chars))
+    return sorted(values)
+
+
+@pytest.mark.parametrize("threshold", [0.7, 0.82, 0.88])
+def test_candidate_filter_never_drops_a_similar_pair(threshold):
+    values = _typos(120) + _random_values(80, 3, 20)
+    candidates = set(_candidate_pairs(values, threshold))
+    similar = {(i, j) for i, j in combinations(range(len(values)), 2)
+               if _similarity(values[i], values[j]) >= threshold}
+    assert similar <= candidates
+
+
+@pytest.mark.parametrize("n, shortest, longest", [(1500, 20, 20), (5000, 15, 25)])
+def test_unrelated_values_of_similar_length_are_not_scored(n, shortest, longest):
+    # The trigram bound alone let ~100k-180k of these pairs through at 0.82
+    assert len(_candidate_pairs(_random_values(n, shortest, longest), 0.82)) < 100
+
+
+def test_columns_over_the_pair_budget_are_skipped_and_not_cached():
+    freq  = {f"item number {i:04d}": 1 for i in range(400)}
+    cache = FuzzyClusterCache()
+    assert fuzzy_remap(freq, threshold=0.82, cache=cache, max_pairs=1000) == {}
+    assert cache.get(cluster_key(list(freq), 0.82)) is None
+    assert fuzzy_remap(freq, threshold=0.82, cache=cache, max_pairs=100_000)
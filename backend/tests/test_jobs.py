@@ -0,0 +1,74 @@
+"""JobStore: the event sequence of a job, and jobs visible from every worker under the shared backend."""
+
+import threading
+import time
+
+from app.admission import AdmissionController
+from app.jobs import JobStore
+from app.jobs_shared import SharedJobStore
+from app.schemas import CleanJobResponse
+
+
+def _controller() -> AdmissionController:
+    return AdmissionController(memory_budget=100, cpu_slots=1, reserved_slots=0, queue_depth=4,
+                               wait_seconds=5, user_max_runs=0)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _work(progress):
+    progress({"stage": "process_columns", "percent": 50.0, "column": "price"})
+    progress({"stage": "generate_eda", "percent": 95.0})
+    return {"rows_removed": 3}
+
+
+def test_a_finished_job_ends_with_a_100_percent_done_event():
+    jobs = JobStore(_controller())
+    job = jobs.submit("s1", _work)
+    _wait_for(lambda: jobs.get(job.id).finished is not None)
+
+    events, finished = jobs.events(job, -1)
+    assert finished
+    assert [event for _, event in events] == [
+        {"type": "status", "status": "queued"},
+        {"type": "status", "status": "running"},
+        {"type": "progress", "stage": "process_columns", "percent": 50.0, "column": "price"},
+        {"type": "progress", "stage": "generate_eda", "percent": 95.0},
+        {"type": "progress", "stage": "done", "percent": 100},
+        {"type": "status", "status": "done"},
+    ]
+    assert jobs.get(job.id).progress == {"stage": "done", "percent": 100}
+    assert jobs.events(job, 3)[0] == events[4:]     # resumes after Last-Event-ID
+
+
+def test_shared_jobs_are_visible_from_another_worker(tmp_path):
+    runner, other = SharedJobStore(str(tmp_path), _controller()), SharedJobStore(str(tmp_path), _controller())
+    gate = threading.Event()
+
+    def work(progress):
+        gate.wait(5)
+        return _work(progress)
+
+    job = runner.submit("s1", work)
+    seen = other.get(job.id)
+    assert seen is not None and seen is not job
+    assert seen.status in ("queued", "running") and not other.events(seen, -1)[1]
+
+    gate.set()
+    _wait_for(lambda: other.get(job.id).status == "done")
+    events, finished = other.events(other.get(job.id), -1)
+    assert finished
+    assert events == runner.events(job, -1)[0]
+    done = other.get(job.id)
+    assert done.result == {"rows_removed": 3}
+    assert CleanJobResponse(**done.snapshot()).progress == {"stage": "done", "percent": 100}
+
+    failed = runner.submit("s2", lambda progress: 1 / 0)
+    _wait_for(lambda: other.get(failed.id).status == "failed")
+    assert other.get(failed.id).error_code == 500
+    assert other.get("missing") is None
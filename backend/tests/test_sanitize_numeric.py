@@ -0,0 +1,171 @@
+"""sanitize_numeric must match the original per-row implementation, values and dtype."""
+
+import random
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import sanitize_numeric
+
+
+# ── The implementation sanitize_numeric replaced, frozen ──
+
+_ID_PATTERN = re.compile(r"^[A-Za-z#][A-Za-z0-9]*[\-_#:/\.][A-Za-z0-9\-_]+$")
+_DATE_PATTERN = re.compile(r"^\d{1,4}[-/]\d{1,2}[-/]\d{1,4}")
+_RANGE_PATTERN = re.compile(r".+\s[~\-–—to]\s.+")
+_MONTH_DATE_PATTERN = re.compile(r"^(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b", re.IGNORECASE)
+_MULTIPLIER_PATTERN = re.compile(r"([-+]?\d*\.?\d+)\s*([KkMmBb])\b")
+_MULTIPLIER_MAP = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+
+def _expand_multipliers(s):
+    def _expand(val):
+        if not isinstance(val, str):
+            return val
+        match = _MULTIPLIER_PATTERN.search(val)
+        if match:
+            expanded = int(float(match.group(1)) * _MULTIPLIER_MAP[match.group(2).lower()])
+            return val[:match.start()] + str(expanded) + val[match.end():]
+        return val
+    return s.apply(_expand)
+
+
+def _is_european_thousands(val):
+    return bool(re.match(r"^\d{1,3}(?:\.\d{3})+$", val.strip()))
+
+
+def _fix_score_corruption(val):
+    s = val.strip()
+    s = re.sub(r"^[^\d\-]+", "", s)
+    s = re.sub(r"(\d):(\d)", r"\1.\2", s)
+    s = re.sub(r"(\d)\.\.(\d)", r"\1.\2", s)
+    s = re.sub(r"(\d),(\d{1,2})([^\d]|$)", r"\1.\2\3", s)
+    s = re.sub(r"[^\d\.]+$", "", s)
+    s = re.sub(r",\.", ".", s)
+    return s
+
+
+def _legacy_sanitize_numeric(series):
+    s = series.astype(str).str.strip()
+    guard = (s.str.match(_ID_PATTERN.pattern, na=False)
+             | s.str.match(_DATE_PATTERN.pattern, na=False)
+             | s.str.match(_RANGE_PATTERN.pattern, na=False)
+             | s.str.match(_MONTH_DATE_PATTERN.pattern, na=False, case=False))
+    s = _expand_multipliers(s)
+    s = s.str.replace(r"[₦\$€£¥₹₩₪฿]\s*", "", regex=True)
+    s = s.apply(lambda v: re.sub(r"(?<=\d)[oO](?=\d)", "0", v) if isinstance(v, str) else v)
+    s = s.apply(lambda v: v.replace(".", "") if isinstance(v, str) and _is_european_thousands(v) else v)
+    s = s.str.replace(r",(?=\d{3})", "", regex=True)
+    s = s.apply(lambda v: _fix_score_corruption(v) if isinstance(v, str) else v)
+    s = s.str.replace(r"\s*(sq\.?m\.?|sqm|cm|kg|lbs?|%|pcs?)\s*", "", regex=True)
+    s = s.str.replace(r"\s*★\s*", "", regex=True)
+    extracted = s.str.extract(r"(?:^|(?<=\s))([-]?\d+\.?\d*)", expand=False)
+    result = pd.to_numeric(extracted, errors="coerce")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)   # int64 upcast when a guard fires
+        result[guard] = np.nan
+    return result
+
+
+# ── Corpus ──
+
+KNOWN = [
+    "1", "42", "-7", "007", "3.14", "1.", "1,234", "1,234,567", "2.278.845", "8,9", "8:8", "8..8",
+    "++8.7", "8.7.", "9,.0", "8,9f", "4o8,035", "€103.5M", "$560K", "₦1.2B", "12%", "142.5 sq.m.",
+    "4,500 kg", "10 pcs", "4.5 ★", "REF-1234", "SKU_001", "2021-10-19", "22/03/2022", "2004 ~ 2021",
+    "100 - 200", "Jul 1, 2004", "Aug 30, 2015", "abc", "", "  ", "nan", "None", "1e-05", "-0", "5 kg 6",
+]
+
+
+def _random_strings(n, seed=11):
+    rng = random.Random(seed)
+    pieces = ["1", "2", "34", "567", "8", "0", ".", ",", ":", "..", "-", "+", " ", "€", "$", "£", "%",
+              "K", "M", "b", "kg", "lbs", "sq.m.", "pcs", "★", "o", "O", "f", "e", "x", "~", "/"]
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 7))) for _ in range(n)]
+
+
+def _assert_same(series):
+    got, expected = sanitize_numeric(series), _legacy_sanitize_numeric(series)
+    assert got.dtype == expected.dtype
+    assert got.index.equals(expected.index)
+    np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("value", KNOWN)
+def test_known_values(value):
+    _assert_same(pd.Series([value], dtype=object))
+
+
+@pytest.mark.parametrize("values", [
+    ["1", "2", "3"],            # all integers → int64, not float64
+    ["1", "2", "3", "1"],
+    ["1", "2.5"],
+    ["1", "abc"],
+    ["1", "REF-1"],
+    ["10 pcs", "2K", "007"],
+    ["1", None, "3"],
+])
+def test_column_dtype(values):
+    _assert_same(pd.Series(values, dtype=object, index=range(10, 10 + len(values))))
+
+
+def test_fuzzed_corpus():
+    strings = _random_strings(20000)
+    for chunk in range(0, len(strings), 500):
+        _assert_same(pd.Series(strings[chunk:chunk + 500], dtype=object))
+    _assert_same(pd.Series(KNOWN + strings, dtype=object))
+
+
+@pytest.mark.parametrize("series", [
+    pd.Series([1, 2, 3], dtype="int64"),
+    pd.Series([1, -2], dtype="int8"),
+    pd.Series([1, 2**63], dtype="uint64"),
+    pd.Series([1, 2, 3], dtype="Int64"),
+    pd.Series([1, None, 3], dtype="Int64"),
+], ids=["int64", "int8", "uint64", "Int64", "Int64-na"])
+def test_native_integer_columns(series):
+    _assert_same(series)
+
+
+@pytest.mark.parametrize("series", [
+    pd.Series([1.5, -2.25, np.nan, np.inf, -np.inf, 3.0, 0.0001, 123456.789, 9.99e15]),
+    pd.Series([1.0, 2.0, 3.0]),
+    pd.Series([1.1, 2.5, np.nan, 0.3, np.inf, 123456.7], dtype="float32"),
+    pd.Series([1.1, 2.5], dtype="float16"),
+    pd.Series([1.1, None], dtype="Float32"),
+    pd.Series([1.5, None], dtype="Float64"),
+], ids=["float64", "float64-integral", "float32", "float16", "Float32", "Float64"])
+def test_native_float_columns(series):
+    _assert_same(series)
+
+
+def test_native_float_fuzzed():
+    rng = np.random.default_rng(5)
+    signs = rng.choice([-1, 1], 5000)
+    values = signs * rng.uniform(1, 10, 5000) * 10.0 ** rng.integers(-3, 15, 5000)
+    got, expected = sanitize_numeric(pd.Series(values)), _legacy_sanitize_numeric(pd.Series(values))
+    # Deliberate change: the cast is exact; pd.to_numeric on the repr dropped digits past ~16
+    np.testing.assert_array_equal(got.to_numpy(), values)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-13)
+
+    # float32 below 1e6 with at most two decimals: positional reprs no European-thousands rule matches
+    values32 = np.round(signs * rng.uniform(1, 10, 5000) * 10.0 ** rng.integers(-2, 6, 5000), 2).astype("float32")
+    _assert_same(pd.Series(values32))
+
+
+@pytest.mark.parametrize("value, legacy", [
+    (1e16, 1.0), (1e20, 1.0), (-3.2e-05, -3.2), (5e300, 5.0), (594.469, 594469.0), (1.25, 1.25),
+])
+def test_native_floats_keep_their_value(value, legacy):
+    # Deliberate change: the string round trip kept only the digits before "e",
+    # and read three decimals as European thousands
+    series = pd.Series([value, 1.5])
+    assert _legacy_sanitize_numeric(series)[0] == legacy
+    assert sanitize_numeric(series).tolist() == [value, 1.5]
+
+
+def test_float32_exponent_notation_keeps_its_value():
+    assert sanitize_numeric(pd.Series([1e20], dtype="float32"))[0] == 1e20
@@ -0,0 +1,57 @@
+"""SessionStore tiers: demotion and rehydration round-trip, and LRU order across tiers."""
+
+import os
+
+import pandas as pd
+
+from app.session import SessionStore
+
+
+def _store(tmp_path) -> SessionStore:
+    return SessionStore(budget_bytes=1 << 40, spill_dir=str(tmp_path), reap_interval=0)
+
+
+def _frame(seed: int) -> pd.DataFrame:
+    return pd.DataFrame({"city": ["Lagos", "Abuja", None] * 50, "price": [seed, 2.5, None] * 50})
+
+
+def test_demoted_sessions_rehydrate_unchanged(tmp_path):
+    store = _store(tmp_path)
+    df, cleaned = _frame(1), _frame(2).dropna()
+    store.save("s1", df, filename="orders.csv")
+    store.save_result("s1", {"cleaned_dataframe": cleaned, "rows_removed": 100})
+    resident = store.stats()["bytes"]
+
+    for tier in ("compressed", "spilled"):
+        assert store._demote("s1", tier)
+        assert store.stats()["tiers"][tier] == 1
+        assert store.stats()["bytes"] < resident
+        if tier == "spilled":
+            assert os.listdir(tmp_path)
+
+        pd.testing.assert_frame_equal(store.get_df("s1"), df)
+        result = store.get_result("s1")
+        pd.testing.assert_frame_equal(result["cleaned_dataframe"], cleaned)
+        assert result["rows_removed"] == 100
+        assert store.stats()["tiers"] == {"memory": 1, "compressed": 0, "spilled": 0}
+        assert store.get_checkpoints("s1") is not None
+    assert not os.listdir(tmp_path)                 # spill files go once rehydrated
+    assert store.get_filename("s1") == "orders.csv"
+
+
+def test_reaper_spills_an_old_entry_demoted_after_a_newer_one(tmp_path):
+    store = _store(tmp_path)
+    store.save("old", _frame(1))
+    store.save("new", _frame(2))
+    store._frames["old"]["used"] -= 2000            # idle past SESSION_SPILL_IDLE_SECONDS
+    store._frames["new"]["used"] -= 100
+
+    # Budget pressure can demote the newer entry first
+    assert store._demote("new", "compressed")
+    assert store._demote("old", "compressed")
+    assert list(store._lru["compressed"]) == ["old", "new"]
+    assert store._least_recent() == "old"
+
+    store.reap()
+    assert store._frames["old"]["tier"] == "spilled"
+    assert store._frames["new"]["tier"] == "compressed"
@@ -0,0 +1,84 @@
+"""StreamingCleaner: output equal to the in-memory engine, and duplicate removal across chunks."""
+
+import io
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import CleaningConfig
+from app.engine import EnterpriseDataEngine
+from app.streaming import RowHashSet, StreamingCleaner
+
+
+def _orders(n: int = 400) -> pd.DataFrame:
+    rng   = np.random.default_rng(3)
+    price = rng.normal(100, 15, n).round(2).astype(object)
+    price[::37]   = 900.0
+    price[5::41]  = None
+    qty = rng.integers(1, 20, n).astype(object)
+    qty[7::29] = None
+    df = pd.DataFrame({
+        "Order ID": [f"ORD-{i:05d}" for i in range(n)],
+        "City":     rng.choice(["Lagos", "lagos ", "Abuja", "Kano", "LAGOS"], n),
+        "Price":    price,
+        "Qty":      qty,
+        "Active":   rng.choice(["yes", "no", "Y", "N"], n),
+        "Segment":  rng.choice(["retail", "wholesale", None], n),
+    })
+    return pd.concat([df, df.iloc[:25]], ignore_index=True)     # duplicates across chunks
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore"])
+@pytest.mark.parametrize("action", ["flag", "cap", "remove", "none"])
+def test_streaming_output_equals_the_engine(tmp_path, action, method):
+    source, cleaned = str(tmp_path / "orders.csv"), str(tmp_path / "orders.cleaned.csv")
+    _orders().to_csv(source, index=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        engine = EnterpriseDataEngine(pd.read_csv(source, dtype=str, skipinitialspace=True),
+                                      CleaningConfig(outlier_action=action, outlier_method=method)).run()
+        streamed = StreamingCleaner(source, CleaningConfig(outlier_action=action, outlier_method=method),
+                                    chunk_rows=120).run(cleaned)
+
+    expected = pd.read_csv(io.StringIO(engine["cleaned_dataframe"].to_csv(index=False)))
+    pd.testing.assert_frame_equal(pd.read_csv(cleaned), expected)
+    assert streamed["cleaned_shape"] == list(expected.shape)
+
+
+def test_streaming_reports_progress_through_both_passes(tmp_path):
+    source = str(tmp_path / "orders.csv")
+    _orders().to_csv(source, index=False)
+    events = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        StreamingCleaner(source, chunk_rows=120, progress=events.append).run(str(tmp_path / "out.csv"))
+    stages = [event["stage"] for event in events]
+    assert stages == ["profile"] * 4 + ["transform"] * 4 + ["generate_eda"]
+    percents = [event["percent"] for event in events]
+    assert percents == sorted(percents) and percents[3] == 45 and percents[-2] == 90
+    assert events[3]["rows"] == events[-2]["rows"] == 425
+
+
+def _reference(batches):
+    seen, masks = set(), []
+    for batch in batches:
+        mask = []
+        for value in batch.tolist():
+            mask.append(value not in seen)
+            seen.add(value)
+        masks.append(mask)
+    return masks
+
+
+def test_row_hash_set_matches_a_python_set(tmp_path):
+    rng = np.random.default_rng(7)
+    batches = [rng.integers(0, 5_000, 700).astype("uint64") for _ in range(40)]
+    for memory_hashes in (10**9, 1_000):      # all in memory; spilled to disk every ~1k hashes
+        with RowHashSet(spill_dir=str(tmp_path), memory_hashes=memory_hashes) as seen:
+            masks = [seen.add(batch).tolist() for batch in batches]
+            assert seen.size == len(np.unique(np.concatenate(batches)))
+        assert masks == _reference(batches)
+    assert os.listdir(tmp_path) == []         # spilled runs are deleted on close
@@ -0,0 +1,48 @@
+"""UnitStripper must match the original one-str.replace-per-pattern loop."""
+
+import random
+
+import pandas as pd
+import pytest
+
+from app.utils import UNIT_PATTERNS, UnitStripper
+
+
+def _sequential(values: pd.Series) -> pd.Series:
+    """The stripping loop strip_units ran before UnitStripper, frozen."""
+    s = values.astype(str)
+    for pattern in UNIT_PATTERNS:
+        s = s.str.replace(pattern, "", regex=True)
+    return s.str.strip().where(values.notna())
+
+
+def _corpus(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    pieces = ["1", "23", "4,500", "1,234", ".", ",", " ", "€", "$", "£", "₦", "%", "kg", "lbs",
+              "sq.m.", "sq ft", "sqft", "sqm", "m²", "ml", "L", "units", "pcs", "hrs", "day",
+              "a", "x", "oz", "litre"]
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 6))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("value", [
+    "1€sqft", "sq.m.£1,234kg", "142.5 sq.m.", "4,500 kg", "12%", "$1,000,000", "  7 units ", "plain",
+])
+def test_known_values(value):
+    values = pd.Series([value], dtype=object)
+    stripped, _ = UnitStripper(UNIT_PATTERNS).strip(values)
+    assert stripped.tolist() == _sequential(values).tolist()
+
+
+def test_fuzzed_corpus_matches_sequential_passes():
+    values = pd.Series(_corpus(20000) + [None, 5, 2.5], dtype=object)
+    stripped, _ = UnitStripper(UNIT_PATTERNS).strip(values)
+    expected = _sequential(values)
+    mismatches = [(v, a, b) for v, a, b in zip(values, stripped, expected)
+                  if not (a == b or (pd.isna(a) and pd.isna(b)))]
+    assert mismatches == []
+
+
+def test_hits_count_each_removal_per_pattern():
+    values = pd.Series(["€5 kg", "€6", "7"], dtype=object)
+    _, hits = UnitStripper(UNIT_PATTERNS).strip(values, weights=[2, 1, 1])
+    assert hits == {UNIT_PATTERNS[0]: 3, r"\bkg\b": 2}
@@ -1,5 +1,5 @@
 import { useState, useCallback, useRef, useEffect } from 'react'
-import { uploadFile, cleanData, csvDownloadUrl, pdfDownloadUrl, reportHtmlUrl } from './api/client.js'
+import { uploadFile, cleanDataAsJob, csvDownloadUrl, pdfDownloadUrl, reportHtmlUrl } from './api/client.js'
 
 // Trigger download via hidden iframe — works cross-origin
 function triggerDownload(url) {
@@ -1766,6 +1766,13 @@ const actionCls  = a => {
   return ''
 }
 const STEPS = ['Headers','Strings','Units','Harmonise','Dupes','Types','Outliers','EDA']
+// Engine progress stage → STEPS index (process_column covers Types then Outliers)
+const STAGE_STEP = {
+  normalise_column_headers: 0, normalise_strings: 1, strip_units: 2,
+  harmonise_categories: 3, remove_duplicates: 4, flag_low_variance_columns: 6, generate_eda: 7,
+  done: STEPS.length,
+}
+const stepOf = (ev) => ev.stage === 'process_column' ? (ev.done * 2 > ev.total ? 6 : 5) : STAGE_STEP[ev.stage]
 
 // ─────────────────────────────────────────────────────────────
 // Topbar
@@ -2004,17 +2011,16 @@ function CleanScreen({ uploadData, onCleaned }) {
 
   const run = async () => {
     setLoading(true); setError('')
-    let i = 0
-    const iv = setInterval(() => {
-      setStepIdx(i)
-      setPct(Math.round(((i+1)/STEPS.length)*100))
-      i++; if (i >= STEPS.length) clearInterval(iv)
-    }, 320)
+    const onProgress = (ev) => {
+      const step = stepOf(ev)
+      if (step !== undefined) setStepIdx(step)
+      setPct(Math.round(ev.percent))
+    }
     try {
-      const result = await cleanData(uploadData.session_id, cfg)
-      clearInterval(iv); setStepIdx(STEPS.length); setPct(100); setDone(true)
+      const result = await cleanDataAsJob(uploadData.session_id, cfg, onProgress)
+      setDone(true)
       setTimeout(() => onCleaned(result), 600)
-    } catch(e) { clearInterval(iv); setError(e.message) }
+    } catch(e) { setError(e.message) }
     finally { setLoading(false) }
   }
 
@@ -47,6 +47,14 @@ export async function uploadFile(file) {
   return res.json()
 }
 
+// CSVs too large for the in-memory engine — cleaned with cleanLargeFile
+export async function uploadLargeFile(file) {
+  const form = new FormData()
+  form.append('file', file)
+  const res = await request('/upload/large', { method: 'POST', body: form })
+  return res.json()
+}
+
 export async function cleanData(sessionId, configOverrides = {}) {
   const params = new URLSearchParams({ session_id: sessionId })
   Object.entries(configOverrides).forEach(([k, v]) => {
@@ -56,6 +64,62 @@ export async function cleanData(sessionId, configOverrides = {}) {
   return res.json()
 }
 
+// Same result as cleanData, run as a background job (POST /clean/jobs) so
+// long cleans survive proxy timeouts. onProgress receives each engine event
+// ({ stage, percent, column, done, total }) from the job's SSE stream.
+export async function cleanDataAsJob(sessionId, configOverrides = {}, onProgress = () => {}) {
+  const params = new URLSearchParams({ session_id: sessionId })
+  Object.entries(configOverrides).forEach(([k, v]) => {
+    if (v !== undefined && v !== null && v !== '') params.append(k, v)
+  })
+  const job = await (await request(`/clean/jobs?${params}`, { method: 'POST' })).json()
+  return followJob(job, onProgress)
+}
+
+// Resolves with the job's result once it is done; SSE progress, then polling
+async function followJob(job, onProgress) {
+  await new Promise((resolve) => {
+    const events = new EventSource(`${BASE}/clean/jobs/${job.job_id}/events`)
+    events.addEventListener('progress', (e) => onProgress(JSON.parse(e.data)))
+    events.addEventListener('status', (e) => {
+      const { status } = JSON.parse(e.data)
+      if (status === 'done' || status === 'failed') { events.close(); resolve() }
+    })
+    events.onerror = () => { events.close(); resolve() }   // fall back to polling
+  })
+
+  for (;;) {
+    const body = await (await request(`/clean/jobs/${job.job_id}`)).json()
+    if (body.progress && body.progress.stage) onProgress(body.progress)   // latest event, ends at 100%
+    if (body.status === 'done') return body.result
+    if (body.status === 'failed') throw new Error(body.error || 'Cleaning failed.')
+    await new Promise((r) => setTimeout(r, 1000))
+  }
+}
+
+// Runs as a job too; onProgress receives { stage: 'profile' | 'transform' | ..., percent, rows }
+export async function cleanLargeFile(sessionId, configOverrides = {}, onProgress = () => {}) {
+  const params = new URLSearchParams({ session_id: sessionId })
+  Object.entries(configOverrides).forEach(([k, v]) => {
+    if (v !== undefined && v !== null && v !== '') params.append(k, v)
+  })
+  const job = await (await request(`/clean/stream?${params}`, { method: 'POST' })).json()
+  return followJob(job, onProgress)
+}
+
+export async function fetchCleanedRows(sessionId, offset = 0, limit = 100) {
+  const params = new URLSearchParams({ session_id: sessionId, offset, limit })
+  const res = await request(`/clean/rows?${params}`)
+  return res.json()
+}
+
+export async function fetchEdaSections(sessionId, sections = []) {
+  const params = new URLSearchParams({ session_id: sessionId })
+  if (sections.length) params.append('sections', sections.join(','))
+  const res = await request(`/report/eda?${params}`)
+  return res.json()
+}
+
 export const csvDownloadUrl  = (sid) => `${BASE}/report/csv?session_id=${sid}`
 export const pdfDownloadUrl  = (sid) => `${BASE}/report/pdf?session_id=${sid}`
 export const reportHtmlUrl   = (sid) => `${BASE}/report/html?session_id=${sid}`